@@ -0,0 +1,75 @@
+# benchmarks/bench_action_store.py
+"""
+Memory of the action records as a list of dicts (json.load of a snapshot, what the
+stages hold) versus an ActionStore built from the same records (what the dashboard API
+caches), plus the time to aggregate each. Memory is the tracemalloc peak while loading / building.
+The script checks both give the same records and counters before reporting.
+
+Usage (from the project root):
+    python -m benchmarks.bench_action_store [n_actions]
+"""
+import gc
+import sys
+import json
+import time
+import random
+import tracemalloc
+from datetime import datetime, timedelta, timezone
+
+from dashboard.action_store import ActionStore
+from dashboard.aggregation import aggregate
+
+THEMES = ["America First", "Economic", "National Security", "Celebratory", "Foreign Policy",
+          "Immigration", "Energy", "Healthcare"]
+WORDS = ["Executive", "Order", "Protecting", "American", "Energy", "Restoring", "Memorandum",
+         "Security", "Workforce", "Federal", "Proclamation", "National", "Day", "Reform"]
+
+def make_snapshot(n):
+    """JSON text of n scraped-and-themed actions."""
+    random.seed(0)
+    start = datetime(2017, 1, 20, tzinfo=timezone(timedelta(hours=-5)))
+    return json.dumps([{
+        "title": " ".join(random.choices(WORDS, k=random.randint(4, 12))),
+        "date": (start + timedelta(seconds=random.randrange(8 * 365 * 86400))).isoformat(),
+        "themes": random.sample(THEMES, random.randint(1, 3)),
+    } for _ in range(n)])
+
+def measure(func, *args):
+    """(result, peak traced MB, seconds)."""
+    gc.collect()
+    tracemalloc.start()
+    started = time.perf_counter()
+    result = func(*args)
+    seconds = time.perf_counter() - started
+    _, peak = tracemalloc.get_traced_memory()
+    tracemalloc.stop()
+    return result, peak / 1e6, seconds
+
+def main(n_actions=1000000):
+    text = make_snapshot(n_actions)
+    records, dicts_mb, _ = measure(json.loads, text)
+    del text
+    store, store_mb, build_s = measure(ActionStore.from_records, records)
+    # The store's own footprint: held once the records it was built from are released.
+    retained_mb = store.nbytes / 1e6
+
+    # Themes come back in the store's theme-dictionary order.
+    normalized = lambda rs: [dict(r, themes=sorted(r["themes"])) for r in rs]
+    assert normalized(store.take(range(1000))) == normalized(records[:1000])
+    started = time.perf_counter()
+    expected = aggregate(records)
+    dicts_s = time.perf_counter() - started
+    started = time.perf_counter()
+    counts = aggregate(store)
+    store_s = time.perf_counter() - started
+    for name in ("days", "hours_of_day", "hours_of_week", "hourly", "themes"):
+        assert getattr(counts, name) == getattr(expected, name), name
+
+    print(f"{n_actions} actions")
+    print(f"  list of dicts   {dicts_mb:8.1f} MB")
+    print(f"  ActionStore     {retained_mb:8.1f} MB  ({dicts_mb / retained_mb:.0f}x smaller; "
+          f"build peak {store_mb:.1f} MB, {build_s:.1f} s)")
+    print(f"  aggregate       dicts {dicts_s * 1000:7.0f} ms   store {store_s * 1000:7.0f} ms")
+
+if __name__ == "__main__":
+    main(int(sys.argv[1]) if len(sys.argv) > 1 else 1000000)
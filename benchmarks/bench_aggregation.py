@@ -0,0 +1,112 @@
+# benchmarks/bench_aggregation.py
+"""
+Passes over the records and wall time: the previous per-chart aggregation functions
+(day, hour of day, theme, hourly timeline; each its own pass) versus the single-pass
+dashboard.aggregation.aggregate(). The old hourly timeline was a dense OrderedDict; the
+new one is sparse and is checked against it through its dense() view.
+
+Usage (from the project root):
+    python -m benchmarks.bench_aggregation [n_actions]
+"""
+import sys
+import time
+from datetime import datetime, timedelta, timezone
+from collections import Counter, OrderedDict
+
+from dashboard.aggregation import aggregate
+
+class CountingList(list):
+    """A list that counts how many times it is iterated."""
+    passes = 0
+
+    def __iter__(self):
+        CountingList.passes += 1
+        return super().__iter__()
+
+# --- The previous implementations, kept here as the baseline. ---
+
+def old_by_day(actions):
+    dates = [action["date"].split("T")[0] for action in actions if action.get("date")]
+    return sorted(Counter(dates).items())
+
+def old_by_hour_of_day(actions):
+    hours = []
+    for action in actions:
+        dt_str = action.get("date")
+        if dt_str:
+            try:
+                hours.append(datetime.fromisoformat(dt_str).hour)
+            except Exception as e:
+                print(f"Error parsing date '{dt_str}': {e}")
+    counts = Counter(hours)
+    return {hour: counts.get(hour, 0) for hour in range(24)}
+
+def old_by_theme(actions):
+    theme_counter = Counter()
+    for action in actions:
+        for theme in action.get("themes", []):
+            theme_counter[theme] += 1
+    return sorted(theme_counter.items(), key=lambda x: x[1], reverse=True)
+
+def old_per_hour(actions):
+    hours = []
+    for action in actions:
+        dt_str = action.get("date")
+        if dt_str:
+            try:
+                hours.append(datetime.fromisoformat(dt_str).replace(minute=0, second=0, microsecond=0))
+            except Exception as e:
+                print(f"Error parsing date '{dt_str}': {e}")
+    if not hours:
+        return OrderedDict()
+    counts = Counter(hours)
+    hourly_counts = OrderedDict()
+    current_hour, max_hour = min(hours), max(hours)
+    while current_hour <= max_hour:
+        hourly_counts[current_hour] = counts.get(current_hour, 0)
+        current_hour += timedelta(hours=1)
+    return hourly_counts
+
+def baseline(actions):
+    return old_by_day(actions), old_by_hour_of_day(actions), old_by_theme(actions), old_per_hour(actions)
+
+def single_pass(actions):
+    counts = aggregate(actions)
+    return counts.daily(), counts.hour_of_day_counts(), counts.theme_counts(), counts.hourly_timeline()
+
+def as_ordered_dict(timeline):
+    """The dense OrderedDict the old per-hour function returned, built from dense()."""
+    first, counts = timeline.dense()
+    return OrderedDict((first + timedelta(hours=i), count) for i, count in enumerate(counts))
+
+def measure(func, actions, repeat=3):
+    """(best wall time in ms, passes over the records per call)."""
+    timings = []
+    for _ in range(repeat):
+        CountingList.passes = 0
+        start = time.perf_counter()
+        func(actions)
+        timings.append((time.perf_counter() - start) * 1000)
+    return min(timings), CountingList.passes
+
+def main(n_actions=200000):
+    themes = ["America First", "Economic", "National Security", "Celebratory"]
+    start = datetime(2017, 1, 20, tzinfo=timezone(timedelta(hours=-5)))
+    actions = CountingList({
+        "date": (start + timedelta(minutes=37 * i)).isoformat(),
+        "themes": [themes[i % len(themes)]],
+    } for i in range(n_actions))
+
+    old, new = baseline(actions), single_pass(actions)
+    assert old[:3] == new[:3] and old[3] == as_ordered_dict(new[3])
+    old_ms, old_passes = measure(baseline, actions)
+    new_ms, new_passes = measure(single_pass, actions)
+    print(f"Day, hour-of-day, theme and hourly-timeline counts over {n_actions} actions")
+    print(f"  per-chart functions: {old_passes} passes, {old_ms:8.1f} ms")
+    print(f"  aggregate():         {new_passes} pass,   {new_ms:8.1f} ms  ({old_ms / new_ms:.1f}x faster)")
+    timeline = new[3]
+    print(f"  hourly timeline: {len(timeline)} non-empty hours stored, "
+          f"{len(timeline.dense()[1])} in the dense view")
+
+if __name__ == "__main__":
+    main(int(sys.argv[1]) if len(sys.argv) > 1 else 200000)
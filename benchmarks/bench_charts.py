@@ -0,0 +1,46 @@
+# benchmarks/bench_charts.py
+"""
+Chart generation time: go.Figure + pio.to_json versus the cached chart-spec builder.
+
+Usage (from the project root):
+    python -m benchmarks.bench_charts [n_days]
+"""
+import sys
+import time
+from datetime import date, timedelta
+
+import plotly.graph_objs as go
+import plotly.io as pio
+
+from dashboard import charts
+
+def figure_daily_chart(aggregated_data):
+    """The previous implementation, kept here as the baseline."""
+    dates, counts = zip(*aggregated_data)
+    fig = go.Figure(data=[go.Bar(x=dates, y=counts, marker_color='#00704A')])
+    fig.update_layout(title="Number of Presidential Actions per Day", xaxis_title="Date",
+                      yaxis_title="Number of Actions", template="plotly_dark")
+    return pio.to_json(fig)
+
+def best_of(func, arg, repeat=5):
+    """Best wall time in milliseconds over `repeat` runs."""
+    timings = []
+    for _ in range(repeat):
+        start = time.perf_counter()
+        func(arg)
+        timings.append((time.perf_counter() - start) * 1000)
+    return min(timings)
+
+def main(n_days=10000):
+    start = date(1990, 1, 1)
+    daily = [((start + timedelta(days=i)).isoformat(), i % 17) for i in range(n_days)]
+    charts.chart_skeleton("daily")  # Warm the one-off skeleton build, as a running server would.
+
+    baseline = best_of(figure_daily_chart, daily)
+    spec = best_of(charts.daily_chart_json, daily)
+    print(f"Daily chart, {n_days} bars")
+    print(f"  go.Figure + pio.to_json: {baseline:8.2f} ms")
+    print(f"  chart-spec builder:      {spec:8.2f} ms  ({baseline / spec:.1f}x faster)")
+
+if __name__ == "__main__":
+    main(int(sys.argv[1]) if len(sys.argv) > 1 else 10000)
@@ -0,0 +1,73 @@
+# benchmarks/bench_cube.py
+"""
+Cross-cut queries: filtering and re-aggregating the records per request (what a new
+view needed before) versus slicing the precomputed day x hour x theme cube.
+Queries: one theme's hour-of-day profile in a date range, and weekday x hour over all
+actions. The script checks both give the same counts before timing them.
+
+Usage (from the project root):
+    python -m benchmarks.bench_cube [n_actions]
+"""
+import sys
+import time
+import random
+from datetime import datetime, timedelta, timezone
+
+from dashboard.app import matches_filters
+from dashboard.aggregation import aggregate
+from dashboard.cube import CountCube
+
+THEMES = ["America First", "Economic", "National Security", "Celebratory", "Foreign Policy"]
+
+def make_actions(n):
+    random.seed(0)
+    start = datetime(2017, 1, 20, tzinfo=timezone(timedelta(hours=-5)))
+    return [{
+        "date": (start + timedelta(seconds=random.randrange(8 * 365 * 86400))).isoformat(),
+        "themes": random.sample(THEMES, random.randint(0, 2)),
+    } for _ in range(n)]
+
+def scan_theme_profile(actions, start, end, theme):
+    selected = [a for a in actions if matches_filters(a, start, end, theme)]
+    return aggregate(selected).hour_of_day_counts()
+
+def cube_theme_profile(cube, start, end, theme):
+    (hours,), counts = cube.slice(start, end, themes=[theme]).rollup("hour")
+    return dict(zip(hours, counts.tolist()))
+
+def scan_weekday_hour(actions):
+    return {slot: count for slot, count in aggregate(actions).hour_of_week_counts().items() if count}
+
+def cube_weekday_hour(cube):
+    return {weekday * 24 + hour: count for (weekday, hour), count in cube.cells("weekday", "hour").items()}
+
+def best_ms(func, *args, repeat=5):
+    timings = []
+    for _ in range(repeat):
+        started = time.perf_counter()
+        func(*args)
+        timings.append((time.perf_counter() - started) * 1000)
+    return min(timings)
+
+def main(n_actions=200000):
+    actions = make_actions(n_actions)
+    started = time.perf_counter()
+    cube = CountCube.from_actions(actions)
+    build_ms = (time.perf_counter() - started) * 1000
+    untagged = CountCube.from_actions([{**a, "themes": ["any"]} for a in actions])  # One cell per action.
+    query = ("2019-01-01", "2020-12-31", "Economic")
+
+    assert scan_theme_profile(actions, *query) == cube_theme_profile(cube, *query)
+    assert scan_weekday_hour(actions) == cube_weekday_hour(untagged)
+    print(f"{n_actions} actions; cube {len(cube.days)} days x 24 hours x {len(cube.themes)} themes, "
+          f"{cube.counts.nbytes / 1e6:.1f} MB, built in {build_ms:.0f} ms")
+    for name, scan, query_cube in (
+            ("theme hourly profile, 2019-2020", lambda: scan_theme_profile(actions, *query),
+             lambda: cube_theme_profile(cube, *query)),
+            ("weekday x hour, all actions", lambda: scan_weekday_hour(actions),
+             lambda: cube_weekday_hour(untagged))):
+        scan_ms, cube_ms = best_ms(scan), best_ms(query_cube)
+        print(f"  {name:<32} scan {scan_ms:8.1f} ms   cube {cube_ms:7.2f} ms  ({scan_ms / cube_ms:.0f}x faster)")
+
+if __name__ == "__main__":
+    main(int(sys.argv[1]) if len(sys.argv) > 1 else 200000)
@@ -0,0 +1,77 @@
+# benchmarks/bench_json_codec.py
+"""
+Snapshot JSON I/O: json.dump(indent=2) / json.load on text files (what the stage scripts
+did) versus dashboard/json_codec.py writing indented and compact files, across snapshot
+sizes. Times are for writing and reading a snapshot file of n actions; the script checks
+every variant reads back the same records before timing them. The codec variants use
+orjson when it is installed (the backend is printed) and the json module otherwise.
+
+Usage (from the project root):
+    python -m benchmarks.bench_json_codec [max_actions]
+"""
+import os
+import sys
+import json
+import time
+import random
+import tempfile
+from datetime import datetime, timedelta, timezone
+
+from dashboard import json_codec
+
+WORDS = ["Executive", "Order", "Protecting", "American", "Energy", "Restoring", "Memorandum",
+         "Security", "Border", "Federal", "Proclamation", "National", "Day", "Trade", "Foreign"]
+THEMES = ["Economic", "National Security & Border Enforcement", "America First", "Other"]
+
+def make_actions(n):
+    random.seed(0)
+    start = datetime(2017, 1, 20, tzinfo=timezone(timedelta(hours=-5)))
+    return [{
+        "title": " ".join(random.choices(WORDS, k=random.randint(4, 12))) + f" {i}",
+        "date": (start + timedelta(seconds=random.randrange(8 * 365 * 86400))).isoformat(),
+        "themes": random.sample(THEMES, random.randint(0, 2)),
+    } for i in range(n)]
+
+def stdlib_dump(actions, path):
+    with open(path, "w") as f:
+        json.dump(actions, f, indent=2)
+
+def stdlib_load(path):
+    with open(path, "r") as f:
+        return json.load(f)
+
+VARIANTS = [
+    ("json.dump/json.load", stdlib_dump, stdlib_load),
+    ("json_codec indented", json_codec.dump, json_codec.load),
+    ("json_codec compact", lambda actions, path: json_codec.dump(actions, path, compact=True), json_codec.load),
+]
+
+def best_of(func, *args, repeat=3):
+    timings = []
+    for _ in range(repeat):
+        start = time.perf_counter()
+        result = func(*args)
+        timings.append((time.perf_counter() - start) * 1000)
+    return min(timings), result
+
+def main(max_actions=100000):
+    sizes = [n for n in (100, 1000, 10000, 100000, 1000000) if n <= max_actions]
+    print(f"json_codec backend: {json_codec.BACKEND}")
+    with tempfile.TemporaryDirectory() as workdir:
+        for n in sizes:
+            actions = make_actions(n)
+            results = []
+            for i, (name, dump, load) in enumerate(VARIANTS):
+                path = os.path.join(workdir, f"snapshot_{i}.json")
+                dump_ms, _ = best_of(dump, actions, path)
+                load_ms, loaded = best_of(load, path)
+                assert loaded == actions, name
+                results.append((name, dump_ms, load_ms, os.path.getsize(path)))
+            print(f"{n} actions")
+            base_dump, base_load = results[0][1], results[0][2]
+            for name, dump_ms, load_ms, size in results:
+                print(f"  {name:<20} write {dump_ms:8.1f} ms ({base_dump / dump_ms:4.1f}x)"
+                      f"  read {load_ms:8.1f} ms ({base_load / load_ms:4.1f}x)  {size / 1e6:7.2f} MB")
+
+if __name__ == "__main__":
+    main(int(sys.argv[1]) if len(sys.argv) > 1 else 100000)
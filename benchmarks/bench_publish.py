@@ -0,0 +1,65 @@
+# benchmarks/bench_publish.py
+"""
+Cost of the pipeline's "publish" stage when a few actions were added to a large archive:
+recomputing every aggregate from the QA snapshot (precompute_aggregates) versus applying
+only the new records to the running aggregates (publish_aggregates).
+The script checks both produce the same store entries.
+
+Usage (from the project root):
+    python -m benchmarks.bench_publish [n_archive] [n_new]
+"""
+import sys
+import json
+import time
+import shutil
+import random
+import tempfile
+from datetime import datetime, timedelta, timezone
+
+from dashboard import app as dashboard_app
+from dashboard.aggregate_store import read_store
+from scripts.segment_store import SegmentStore
+
+THEMES = ["America First", "Economic", "National Security", "Celebratory", "Foreign Policy"]
+
+def make_actions(start_index, n):
+    random.seed(start_index)
+    start = datetime(2017, 1, 20, tzinfo=timezone(timedelta(hours=-5)))
+    return [{
+        "title": f"Action {start_index + i}",
+        "date": (start + timedelta(seconds=random.randrange(8 * 365 * 86400))).isoformat(),
+        "themes": random.sample(THEMES, random.randint(1, 2)),
+    } for i in range(n)]
+
+def append_and_snapshot(data_dir, actions):
+    """Append to the QA stream and write its snapshot file, as qa_data.run() does."""
+    SegmentStore("qa", root=f"{data_dir}/store").append(actions)
+    records = SegmentStore("qa", root=f"{data_dir}/store").read_all()
+    with open(f"{data_dir}/presidential_actions_with_themes_20250101_000000.json", "w", encoding="utf-8") as f:
+        json.dump(records, f)
+
+def main(n_archive=100000, n_new=5):
+    data_dir = tempfile.mkdtemp(prefix="bench_publish_")
+    try:
+        append_and_snapshot(data_dir, make_actions(0, n_archive))
+        dashboard_app.publish_aggregates(data_dir)  # Initial count of the archive.
+        append_and_snapshot(data_dir, make_actions(n_archive, n_new))
+
+        started = time.perf_counter()
+        source_file = dashboard_app.publish_aggregates(data_dir)
+        delta_ms = (time.perf_counter() - started) * 1000
+        started = time.perf_counter()
+        full = dashboard_app.precompute_aggregates(source_file)
+        full_ms = (time.perf_counter() - started) * 1000
+
+        _, published = read_store(f"{data_dir}/aggregates.db")
+        published.pop("state:version")
+        assert published == {k: v.encode("utf-8") if isinstance(v, str) else v for k, v in full.items()}
+        print(f"{n_new} new actions on an archive of {n_archive}")
+        print(f"  full recompute:           {full_ms:8.1f} ms")
+        print(f"  running aggregates delta: {delta_ms:8.1f} ms  ({full_ms / delta_ms:.1f}x faster)")
+    finally:
+        shutil.rmtree(data_dir, ignore_errors=True)
+
+if __name__ == "__main__":
+    main(*(int(arg) for arg in sys.argv[1:3]))
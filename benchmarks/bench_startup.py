@@ -0,0 +1,112 @@
+# benchmarks/bench_startup.py
+"""
+Cold-start cost of the dashboard and the pipeline scripts.
+
+For each module, runs a fresh interpreter with `-X importtime` and prints the total import
+time plus the most expensive direct imports. Then measures time-to-first-response: a fresh
+interpreter that imports the app, builds it with create_app() and answers one request
+(wall time from process spawn, so interpreter startup is included).
+With --max-import-ms, exits non-zero if dashboard.app takes longer to import.
+
+Usage (from the project root):
+    python -m benchmarks.bench_startup [--runs 5] [--top 5] [--max-import-ms 400]
+"""
+import os
+import sys
+import json
+import time
+import shutil
+import argparse
+import tempfile
+import statistics
+import subprocess
+
+MODULES = [
+    "dashboard.app",
+    "scripts.pipeline",
+    "scripts.etl",
+    "scripts.scrape_presidential_actions",
+    "scripts.aggregate_hourly",
+    "scripts.polar_hourly_chart",
+    "scripts.export_parquet",
+]
+HEAVY = ("plotly", "pandas", "numpy", "pyarrow", "sqlalchemy", "bs4", "jsonschema")
+
+FIRST_RESPONSE = """
+from dashboard.app import create_app
+response = create_app().test_client().get("/api/hourly")
+assert response.status_code == 200, response.status_code
+"""
+
+def import_profile(module):
+    """Return (total ms, [(child ms, child name)], heavy modules loaded) for importing module."""
+    code = f"import sys, {module}; print(','.join(m for m in {HEAVY!r} if m in sys.modules))"
+    result = subprocess.run([sys.executable, "-X", "importtime", "-c", code],
+                            capture_output=True, text=True, check=True)
+    total, children, pending = 0.0, [], []
+    for line in result.stderr.splitlines():
+        if not line.startswith("import time:") or "|" not in line:
+            continue
+        _, cumulative, name = line.split("|")
+        if not cumulative.strip().isdigit():
+            continue  # The header line.
+        depth = (len(name) - len(name.lstrip(" ")) - 1) // 2
+        ms = int(cumulative) / 1000
+        if depth == 1:
+            pending.append((ms, name.strip()))
+        elif depth == 0:
+            # A module is listed after its children, which were collected in pending.
+            if name.strip() == module:
+                total, children = ms, pending
+            pending = []
+    heavy = result.stdout.strip()
+    return total, sorted(children, reverse=True), heavy.split(",") if heavy else []
+
+def first_response_ms(data_dir):
+    env = dict(os.environ, DASHBOARD_DATA_DIR=data_dir)
+    started = time.perf_counter()
+    subprocess.run([sys.executable, "-c", FIRST_RESPONSE], env=env, check=True)
+    return (time.perf_counter() - started) * 1000
+
+def make_data_dir():
+    data_dir = tempfile.mkdtemp(prefix="bench_startup_")
+    actions = [{"title": f"Action {i}", "date": f"2025-02-{1 + i % 28:02d}T{i % 24:02d}:00:00-05:00",
+                "themes": ["Economic"]} for i in range(1000)]
+    with open(os.path.join(data_dir, "presidential_actions_with_themes_20250101_000000.json"), "w", encoding="utf-8") as f:
+        json.dump(actions, f)
+    return data_dir
+
+def main(argv=None):
+    parser = argparse.ArgumentParser(description="Measure import time and time-to-first-response.")
+    parser.add_argument("--runs", type=int, default=5)
+    parser.add_argument("--top", type=int, default=5)
+    parser.add_argument("--max-import-ms", type=float, default=None)
+    args = parser.parse_args(argv)
+
+    app_import_ms = None
+    for module in MODULES:
+        timings, children, heavy = [], [], []
+        for _ in range(args.runs):
+            total, children, heavy = import_profile(module)
+            timings.append(total)
+        median = statistics.median(timings)
+        if module == "dashboard.app":
+            app_import_ms = median
+        print(f"{module:<38} {median:8.1f} ms   heavy: {', '.join(heavy) or '-'}")
+        for ms, name in children[:args.top]:
+            print(f"    {name:<34} {ms:8.1f} ms")
+
+    data_dir = make_data_dir()
+    try:
+        first_response_ms(data_dir)  # Warm the OS file cache and bytecode.
+        timings = [first_response_ms(data_dir) for _ in range(args.runs)]
+    finally:
+        shutil.rmtree(data_dir, ignore_errors=True)
+    print(f"time to first response (spawn -> /api/hourly): {statistics.median(timings):8.1f} ms")
+
+    if args.max_import_ms is not None and app_import_ms > args.max_import_ms:
+        print(f"FAIL: dashboard.app import {app_import_ms:.1f} ms > budget {args.max_import_ms:.1f} ms")
+        sys.exit(1)
+
+if __name__ == "__main__":
+    main()
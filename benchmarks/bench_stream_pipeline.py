@@ -0,0 +1,100 @@
+# benchmarks/bench_stream_pipeline.py
+"""
+End-to-end theme -> QA -> load: the multi-process chain of stage scripts versus the fused
+streaming pipeline (scripts/stream_pipeline.py), both starting from the same scraped
+records in the raw segment stream and loading a fresh SQLite database.
+  - chain: add_themes.run, qa_data.run and the pipeline's load stage, each in its own
+    Python process, handing over full JSON snapshots as the scripts do
+  - fused: one process streaming batches from the raw stream through run_fused()
+Each variant runs in its own scratch directory, first over the whole archive and then over
+a 1% delta appended to the raw stream (the usual incremental refresh, where the chain
+still rewrites full snapshots). Throughput is records per wall-clock second, peak RSS the
+largest resident set of any of its processes. The script checks both end with the same
+rows in the database before reporting.
+
+Usage (from the project root):
+    python -m benchmarks.bench_stream_pipeline [n_actions]
+"""
+import os
+import sys
+import time
+import random
+import sqlite3
+import tempfile
+import subprocess
+from datetime import datetime, timedelta, timezone
+
+from scripts.segment_store import SegmentStore
+
+ROOT = os.path.abspath(os.path.join(os.path.dirname(__file__), ".."))
+WORDS = ["Executive", "Order", "Protecting", "American", "Energy", "Restoring", "Memorandum",
+         "Security", "Border", "Federal", "Proclamation", "National", "Day", "Trade", "Foreign"]
+
+# Each snippet runs in a fresh interpreter and prints its peak RSS (KiB on Linux).
+REPORT_RSS = "; import resource; print('RSS', resource.getrusage(resource.RUSAGE_SELF).ru_maxrss)"
+CHAIN = [
+    "from scripts import add_themes; add_themes.run('data')",
+    "from scripts import qa_data; qa_data.run('data')",
+    "from scripts.pipeline import stage_load; stage_load('data')",
+]
+# The fused run reads the raw records it has not seen yet, as its scraper source only
+# fetches the new pages.
+FUSED = ("from scripts.segment_store import SegmentStore; "
+         "from scripts.stream_pipeline import iter_batches, run_fused; "
+         "raw = SegmentStore('raw', root='data/store'); "
+         "since, end = raw.manifest['cursors'].get('fused', 0), raw.end_offset; "
+         "run_fused(iter_batches(r for _, r in raw.iter_records(since)), 'data'); "
+         "raw.commit('fused', end)")
+
+def make_actions(n):
+    random.seed(0)
+    start = datetime(2017, 1, 20, tzinfo=timezone(timedelta(hours=-5)))
+    return [{
+        "title": " ".join(random.choices(WORDS, k=random.randint(4, 12))) + f" {i}",
+        "date": (start + timedelta(seconds=random.randrange(8 * 365 * 86400))).isoformat(),
+    } for i in range(n)]
+
+def run_snippets(workdir, snippets):
+    """Run the snippets in order in workdir; returns (seconds, peak RSS MB of any of them)."""
+    env = dict(os.environ, PYTHONPATH=ROOT)
+    peak_kb = 0
+    started = time.perf_counter()
+    for snippet in snippets:
+        result = subprocess.run([sys.executable, "-c", snippet + REPORT_RSS], cwd=workdir, env=env,
+                                capture_output=True, text=True, check=True)
+        peak_kb = max(peak_kb, int(result.stdout.rsplit("RSS", 1)[1]))
+    return time.perf_counter() - started, peak_kb / 1024
+
+def run_variant(snippets, archive, delta):
+    """
+    In a scratch data dir: process the archive (timed as the full load), then scrape-append
+    the delta and process again (timed as the incremental run).
+    Returns ((seconds, MB) full, (seconds, MB) incremental, database rows).
+    """
+    with tempfile.TemporaryDirectory() as workdir:
+        data_dir = os.path.join(workdir, "data")
+        os.makedirs(data_dir)
+        raw_store = SegmentStore("raw", root=os.path.join(data_dir, "store"))
+        raw_store.append(archive)
+        full = run_snippets(workdir, snippets)
+        raw_store.append(delta)
+        incremental = run_snippets(workdir, snippets)
+        with sqlite3.connect(os.path.join(data_dir, "presidential_actions.db")) as conn:
+            rows = sorted(conn.execute("SELECT action_title, action_timestamp FROM presidential_actions"))
+    return full, incremental, rows
+
+def main(n_actions=20000):
+    actions = make_actions(n_actions + n_actions // 100)
+    archive, delta = actions[:n_actions], actions[n_actions:]
+    chain_full, chain_delta, chain_rows = run_variant(CHAIN, archive, delta)
+    fused_full, fused_delta, fused_rows = run_variant([FUSED], archive, delta)
+    assert len(chain_rows) == len(actions) and chain_rows == fused_rows
+
+    for title, n, chain, fused in ((f"{n_actions} actions, theme -> QA -> load", n_actions, chain_full, fused_full),
+                                   (f"then {len(delta)} new actions on top", len(delta), chain_delta, fused_delta)):
+        print(title)
+        for name, (seconds, peak_mb) in (("multi-process chain", chain), ("fused streaming", fused)):
+            print(f"  {name:<20} {seconds:6.1f} s  {n / seconds:8.0f} actions/s   peak RSS {peak_mb:6.1f} MB")
+
+if __name__ == "__main__":
+    main(int(sys.argv[1]) if len(sys.argv) > 1 else 20000)
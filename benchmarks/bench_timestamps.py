@@ -0,0 +1,57 @@
+# benchmarks/bench_timestamps.py
+"""
+Timestamp histogramming: per-record datetime.fromisoformat + Counter versus the NumPy
+path (one vectorized parse of the date column, then np.bincount/np.unique).
+Both produce the day, hour-of-day, hour-of-week and clock-hour counters; the script
+checks they are identical before timing them.
+On 1M records (1-CPU VM) the per-record path takes about 2.9-4.2 s and the NumPy path
+about 0.8-1.05 s, i.e. 3.5-4x; the vectorized parse alone is about 0.4-0.5 s of that.
+
+Usage (from the project root):
+    python -m benchmarks.bench_timestamps [n_actions]
+"""
+import sys
+import time
+import random
+from datetime import datetime, timedelta, timezone
+
+from dashboard.aggregation import aggregate_rows
+from dashboard.timestamps import aggregate_columnar, parse_iso_timestamps
+
+def make_actions(n):
+    random.seed(0)
+    offsets = [timezone(timedelta(hours=h)) for h in (-5, -4)]
+    start = datetime(2017, 1, 20)
+    actions = [{
+        "date": (start + timedelta(seconds=random.randrange(8 * 365 * 86400))).replace(
+            tzinfo=random.choice(offsets)).isoformat(),
+        "themes": [],
+    } for _ in range(n)]
+    actions[::10000] = [{"date": "not a date", "themes": []}] * len(actions[::10000])
+    return actions
+
+def best_of(func, arg, repeat=3):
+    timings = []
+    for _ in range(repeat):
+        start = time.perf_counter()
+        result = func(arg)
+        timings.append((time.perf_counter() - start) * 1000)
+    return min(timings), result
+
+def main(n_actions=1000000):
+    actions = make_actions(n_actions)
+    dates = [a["date"] for a in actions]
+    parse_ms, parsed = best_of(parse_iso_timestamps, dates)
+    rows_ms, rows = best_of(aggregate_rows, actions)
+    columnar_ms, columnar = best_of(aggregate_columnar, actions)
+    for name in ("days", "hours_of_day", "hours_of_week", "hourly"):
+        assert getattr(rows, name) == getattr(columnar, name), name
+    assert rows.hourly_offset == columnar.hourly_offset
+
+    print(f"{n_actions} actions, {int(parsed.failed.sum())} unparseable")
+    print(f"  vectorized parse only:           {parse_ms:8.1f} ms")
+    print(f"  per-record fromisoformat+Counter: {rows_ms:8.1f} ms")
+    print(f"  NumPy histograms:                 {columnar_ms:8.1f} ms  ({rows_ms / columnar_ms:.1f}x faster)")
+
+if __name__ == "__main__":
+    main(int(sys.argv[1]) if len(sys.argv) > 1 else 1000000)
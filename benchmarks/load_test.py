@@ -0,0 +1,120 @@
+# benchmarks/load_test.py
+"""
+Local load test of the production serving mode (gunicorn + wsgi:app) at several worker counts.
+
+Builds a temporary data directory with a synthetic themed data file, publishes the shared
+aggregate store once (as the pipeline does), then for each worker count starts gunicorn
+with gunicorn.conf.py and hammers the dashboard and API endpoints from client processes
+over keep-alive connections. Reports requests/sec, p50 and p99 latency per worker count.
+
+Usage (from the project root, gunicorn installed):
+    python -m benchmarks.load_test [--workers 1 2 4] [--clients 16] [--duration 10] [--actions 20000]
+"""
+import os
+import sys
+import json
+import time
+import shutil
+import socket
+import argparse
+import tempfile
+import subprocess
+import http.client
+import multiprocessing
+from datetime import datetime, timedelta, timezone
+
+PATHS = ["/", "/api/daily", "/api/hourly", "/api/themes"]
+THEMES = ["America First", "Economic", "National Security", "Celebratory", "Cultural & Traditional Values"]
+
+def make_data_dir(n_actions):
+    """Temporary data dir with one themed data file of n_actions records and a published store."""
+    from dashboard.app import publish_aggregates
+    data_dir = tempfile.mkdtemp(prefix="load_test_")
+    start = datetime(2017, 1, 20, tzinfo=timezone(timedelta(hours=-5)))
+    actions = [{
+        "title": f"Action {i}",
+        "date": (start + timedelta(minutes=97 * i)).isoformat(),
+        "url": f"https://example.com/{i}",
+        "themes": [THEMES[i % len(THEMES)]],
+    } for i in range(n_actions)]
+    with open(os.path.join(data_dir, "presidential_actions_with_themes_20250101_000000.json"), "w", encoding="utf-8") as f:
+        json.dump(actions, f)
+    publish_aggregates(data_dir)
+    return data_dir
+
+def free_port():
+    with socket.socket() as s:
+        s.bind(("127.0.0.1", 0))
+        return s.getsockname()[1]
+
+def wait_until_ready(port, proc, timeout=30):
+    deadline = time.time() + timeout
+    while time.time() < deadline:
+        if proc.poll() is not None:
+            raise RuntimeError("gunicorn exited during startup")
+        try:
+            conn = http.client.HTTPConnection("127.0.0.1", port, timeout=2)
+            conn.request("GET", "/api/hourly")
+            conn.getresponse().read()
+            return
+        except OSError:
+            time.sleep(0.2)
+    raise RuntimeError("gunicorn did not become ready")
+
+def client(args):
+    """One client process: request PATHS round-robin until the deadline; returns latencies (s)."""
+    port, deadline, offset = args
+    conn = http.client.HTTPConnection("127.0.0.1", port, timeout=30)
+    latencies, i = [], offset
+    while time.time() < deadline:
+        started = time.perf_counter()
+        conn.request("GET", PATHS[i % len(PATHS)])
+        response = conn.getresponse()
+        response.read()
+        latencies.append(time.perf_counter() - started)
+        if response.status != 200:
+            raise RuntimeError(f"{PATHS[i % len(PATHS)]} returned {response.status}")
+        i += 1
+    conn.close()
+    return latencies
+
+def run_level(workers, clients, duration, data_dir):
+    """Start gunicorn with the given worker count and measure it. Returns (req/s, p50 ms, p99 ms)."""
+    port = free_port()
+    env = dict(os.environ, WEB_CONCURRENCY=str(workers), DASHBOARD_DATA_DIR=data_dir,
+               DASHBOARD_BIND=f"127.0.0.1:{port}", DASHBOARD_ACCESS_LOG="/dev/null")
+    proc = subprocess.Popen([sys.executable, "-m", "gunicorn", "-c", "gunicorn.conf.py", "wsgi:app"],
+                            env=env, stdout=subprocess.DEVNULL, stderr=subprocess.DEVNULL)
+    try:
+        wait_until_ready(port, proc)
+        deadline = time.time() + duration
+        with multiprocessing.Pool(clients) as pool:
+            results = pool.map(client, [(port, deadline, i) for i in range(clients)])
+    finally:
+        proc.terminate()
+        proc.wait(30)
+    latencies = sorted(l for result in results for l in result)
+    p50 = latencies[len(latencies) // 2] * 1000
+    p99 = latencies[min(len(latencies) - 1, int(len(latencies) * 0.99))] * 1000
+    return len(latencies) / duration, p50, p99
+
+def main(argv=None):
+    parser = argparse.ArgumentParser(description="Load-test the dashboard under gunicorn.")
+    parser.add_argument("--workers", type=int, nargs="+", default=[1, 2, 4])
+    parser.add_argument("--clients", type=int, default=16)
+    parser.add_argument("--duration", type=float, default=10)
+    parser.add_argument("--actions", type=int, default=20000)
+    args = parser.parse_args(argv)
+
+    data_dir = make_data_dir(args.actions)
+    try:
+        print(f"{args.actions} actions, {args.clients} client processes, {args.duration:.0f}s per level, paths {PATHS}")
+        print(f"{'workers':>7}  {'req/s':>9}  {'p50 ms':>8}  {'p99 ms':>8}")
+        for workers in args.workers:
+            rps, p50, p99 = run_level(workers, args.clients, args.duration, data_dir)
+            print(f"{workers:>7}  {rps:>9.0f}  {p50:>8.2f}  {p99:>8.2f}")
+    finally:
+        shutil.rmtree(data_dir, ignore_errors=True)
+
+if __name__ == "__main__":
+    main()
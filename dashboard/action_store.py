@@ -0,0 +1,236 @@
+# dashboard/action_store.py
+"""
+Compact columnar in-memory store of action records.
+
+The stages pass actions around as lists of dicts ({"title", "date", "themes"}): every
+record is a dict with its own copies of the key strings, a date string and a fresh
+themes list, roughly 1 KB per action. ActionStore keeps the same records in a few flat
+columns instead:
+  - titles: one UTF-8 buffer plus an int64 offsets array
+  - dates: the parsed timestamps of dashboard/timestamps.py (int64 UTC epoch seconds,
+    int32 UTC offsets and flags); canonical "YYYY-MM-DDTHH:MM:SS+HH:MM" strings are
+    rebuilt from them on access
+  - themes: a uint64 bitmask per action against a theme dictionary (up to 64 themes)
+Anything the columns cannot represent exactly (missing keys, None values, dates in other
+ISO forms or unparseable, extra keys such as "source_url") is kept per record in a
+sparse overrides dict, so record(i) returns the original record. The one exception is
+the order of a record's themes, which comes back in theme-dictionary order.
+
+Consumers can iterate records, read whole columns (titles(), parsed, theme_bits), take
+subsets with filter()/take(), and pass a store to dashboard.aggregation.aggregate(),
+which then counts from the columns without re-parsing any dates. The dashboard API holds
+each data file it serves as an ActionStore (see load_indexed_actions in dashboard/app.py).
+"""
+from collections import Counter
+from datetime import datetime, timedelta
+
+import numpy as np
+
+from dashboard.timestamps import ParsedTimestamps, parse_iso_timestamps, fill_time_buckets, day_counts, day_labels
+
+MAX_THEMES = 64
+FIELDS = ("title", "date", "themes")
+_ABSENT = object()  # Override value: the key is not in the record.
+
+def _format_offset(seconds):
+    sign = "-" if seconds < 0 else "+"
+    hours, minutes = divmod(abs(int(seconds)) // 60, 60)
+    return f"{sign}{hours:02d}:{minutes:02d}"
+
+class ActionStore:
+    """Columnar action records (see module docstring). Build with from_records()."""
+
+    def __init__(self, title_data, title_offsets, parsed, theme_bits, theme_names, overrides):
+        self.title_data = title_data  # bytes, UTF-8 titles back to back
+        self.title_offsets = title_offsets  # int64, len + 1 entries
+        self.parsed = parsed  # ParsedTimestamps of the date column
+        self.theme_bits = theme_bits  # uint64, bit i set when the action has theme_names[i]
+        self.theme_names = theme_names
+        self.overrides = overrides  # {index: {key: value or _ABSENT}}
+
+    @classmethod
+    def from_records(cls, records, theme_names=None):
+        """Build a store from action dicts; theme_names seeds the theme dictionary's order."""
+        records = records if isinstance(records, list) else list(records)
+        theme_names = list(theme_names or [])
+        theme_ids = {name: i for i, name in enumerate(theme_names)}
+        overrides = {}
+        titles, dates, bits = [], [], []
+        for i, record in enumerate(records):
+            extra = {key: value for key, value in record.items() if key not in FIELDS}
+            title = record.get("title", _ABSENT)
+            if not isinstance(title, str):
+                extra["title"], title = title, ""
+            titles.append(title)
+            date = record.get("date", _ABSENT)
+            if not isinstance(date, str):
+                extra["date"], date = date, ""
+            dates.append(date)
+            themes = record.get("themes", _ABSENT)
+            mask = 0
+            if isinstance(themes, list) and all(isinstance(t, str) for t in themes) \
+                    and len(set(themes)) == len(themes):
+                for theme in themes:
+                    theme_id = theme_ids.get(theme)
+                    if theme_id is None:
+                        if len(theme_names) == MAX_THEMES:
+                            raise ValueError(f"ActionStore supports at most {MAX_THEMES} distinct themes.")
+                        theme_id = theme_ids[theme] = len(theme_names)
+                        theme_names.append(theme)
+                    mask |= 1 << theme_id
+            else:
+                extra["themes"] = themes
+            bits.append(mask)
+            if extra:
+                overrides[i] = extra
+
+        encoded = [title.encode("utf-8") for title in titles]
+        offsets = np.zeros(len(encoded) + 1, dtype=np.int64)
+        np.cumsum([len(b) for b in encoded], out=offsets[1:])
+        parsed = parse_iso_timestamps(dates)
+        # Dates that cannot be rebuilt from the parsed columns keep their original text.
+        rebuilt = parsed.canonical.copy()
+        for i in np.flatnonzero(rebuilt & (parsed.offset == 0)).tolist():
+            rebuilt[i] = dates[i][19] == "+"  # "-00:00" parses like "+00:00".
+        for i in np.flatnonzero(~rebuilt).tolist():
+            if dates[i]:
+                overrides.setdefault(i, {})["date"] = dates[i]
+        return cls(b"".join(encoded), offsets, parsed, np.array(bits, dtype=np.uint64), theme_names, overrides)
+
+    def __len__(self):
+        return len(self.title_offsets) - 1
+
+    def __iter__(self):
+        for i in range(len(self)):
+            yield self.record(i)
+
+    # --- Per-record access ---
+
+    def title(self, i):
+        return self.title_data[self.title_offsets[i]:self.title_offsets[i + 1]].decode("utf-8")
+
+    def date(self, i):
+        """The record's date string ("" if it has none)."""
+        override = self.overrides.get(i, {}).get("date", _ABSENT)
+        if override is not _ABSENT:
+            return override if isinstance(override, str) else ""
+        if not self.parsed.canonical[i]:
+            return ""
+        offset = int(self.parsed.offset[i])
+        local = datetime(1970, 1, 1) + timedelta(seconds=int(self.parsed.epoch[i]) + offset)
+        return local.isoformat() + _format_offset(offset)
+
+    def themes(self, i):
+        bits = int(self.theme_bits[i])
+        return [name for j, name in enumerate(self.theme_names) if bits >> j & 1]
+
+    def record(self, i):
+        """The action dict at position i."""
+        record = {"title": self.title(i), "date": self.date(i), "themes": self.themes(i)}
+        for key, value in self.overrides.get(i, {}).items():
+            if value is _ABSENT:
+                del record[key]
+            else:
+                record[key] = value
+        return record
+
+    def to_records(self):
+        return list(self)
+
+    # --- Columns ---
+
+    def titles(self):
+        """All titles, in order."""
+        data, offsets = self.title_data, self.title_offsets.tolist()
+        return [data[offsets[i]:offsets[i + 1]].decode("utf-8") for i in range(len(self))]
+
+    def dates(self):
+        """{position: date string} for dates not rebuilt from the parsed columns (see date())."""
+        return {i: self.date(i) for i in np.flatnonzero(~self.parsed.canonical).tolist()}
+
+    def theme_mask(self, theme):
+        """Boolean array: which actions carry the theme."""
+        if theme not in self.theme_names:
+            return np.zeros(len(self), dtype=bool)
+        return ((self.theme_bits >> np.uint64(self.theme_names.index(theme))) & np.uint64(1)).astype(bool)
+
+    def theme_counts(self):
+        """{theme: number of actions with it}, counting theme lists as aggregate() does."""
+        counts = {name: int(self.theme_mask(name).sum()) for name in self.theme_names}
+        for extra in self.overrides.values():
+            themes = extra.get("themes", _ABSENT)
+            if isinstance(themes, list):  # Lists the bitmask could not hold, e.g. with repeats.
+                for theme in themes:
+                    counts[theme] = counts.get(theme, 0) + 1
+        return counts
+
+    def day_counts(self):
+        """Counter of actions per day, keyed like aggregate()'s day bucket."""
+        return day_counts(Counter(), self.dates(), self.parsed)
+
+    def local_days(self):
+        """ISO local date of every action ("" where the date does not parse)."""
+        days = np.full(len(self), "", dtype=object)
+        valid = self.parsed.valid
+        days[valid] = day_labels(self.parsed.local[valid] // 86400)
+        return days
+
+    # --- Subsets ---
+
+    def take(self, indices):
+        """A new store with the actions at the given positions, in that order."""
+        indices = np.asarray(indices, dtype=np.int64)
+        starts, ends = self.title_offsets[indices], self.title_offsets[indices + 1]
+        data = b"".join(self.title_data[s:e] for s, e in zip(starts.tolist(), ends.tolist()))
+        offsets = np.zeros(len(indices) + 1, dtype=np.int64)
+        np.cumsum(ends - starts, out=offsets[1:])
+        parsed = ParsedTimestamps(len(indices))
+        for name in ("epoch", "offset", "aware", "valid", "failed", "canonical"):
+            setattr(parsed, name, getattr(self.parsed, name)[indices])
+        positions = {old: new for new, old in enumerate(indices.tolist())}
+        parsed.errors = [(positions[i], s, e) for i, s, e in self.parsed.errors if i in positions]
+        overrides = {positions[i]: dict(extra) for i, extra in self.overrides.items() if i in positions}
+        return ActionStore(data, offsets, parsed, self.theme_bits[indices], list(self.theme_names), overrides)
+
+    def filter(self, start=None, end=None, theme=None, mask=None):
+        """
+        Actions whose day (the first 10 characters of the date, as in the dashboard filters)
+        is within the inclusive ISO range, that carry the theme, and where mask (a boolean
+        array) is set.
+        """
+        keep = np.ones(len(self), dtype=bool) if mask is None else np.asarray(mask, dtype=bool).copy()
+        if start or end:
+            days = self.local_days()
+            for i, date in self.dates().items():
+                days[i] = date[:10]
+            has_day = days != ""
+            if start:
+                keep &= has_day & (days >= start)
+            if end:
+                keep &= has_day & (days <= end)
+        if theme is not None:
+            has_theme = self.theme_mask(theme)
+            for i, extra in self.overrides.items():
+                if "themes" in extra:
+                    themes = extra["themes"]
+                    has_theme[i] = themes is not _ABSENT and theme in (themes or [])
+            keep &= has_theme
+        return self.take(np.flatnonzero(keep))
+
+    # --- Aggregation ---
+
+    def aggregates(self):
+        """The dashboard Aggregates of the store, counted from its columns (see aggregate())."""
+        from dashboard.aggregation import Aggregates
+        result = Aggregates()
+        result.total = len(self)
+        fill_time_buckets(result, self.dates(), self.parsed)
+        result.themes.update({name: count for name, count in self.theme_counts().items() if count})
+        return result
+
+    @property
+    def nbytes(self):
+        """Approximate memory held by the columns (overrides not included)."""
+        parsed = self.parsed
+        return (len(self.title_data) + self.title_offsets.nbytes + self.theme_bits.nbytes
+                + sum(getattr(parsed, name).nbytes for name in ("epoch", "offset", "aware", "valid", "failed", "canonical")))
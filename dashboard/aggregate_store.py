@@ -0,0 +1,71 @@
+# dashboard/aggregate_store.py
+"""
+Shared on-disk store of precomputed dashboard aggregates.
+
+With several WSGI workers, each one would otherwise parse the latest data file and
+rebuild the same chart JSON and API bodies. Instead the pipeline's "publish" stage
+computes them once and writes them to data/aggregates.db, a small SQLite file that every
+worker reads. The file is built under a temporary name and swapped in with os.replace,
+so readers always see a complete store. Entries are tagged with the signature of the
+data file they were computed from; a worker only uses them while that file is still
+the latest one, and falls back to computing in-process otherwise.
+Reference:
+  - SQLite, "Appropriate Uses For SQLite": https://www.sqlite.org/whentouse.html
+"""
+import os
+import sqlite3
+
+from dashboard import json_codec
+from dashboard.cache import FileKeyedCache
+
+STORE_FILENAME = "aggregates.db"
+
+def store_path(data_dir):
+    return os.path.join(data_dir, STORE_FILENAME)
+
+def source_signature(path):
+    """(absolute path, mtime_ns, size) of a data file; the same file matches from any cwd."""
+    stat = os.stat(path)
+    return [os.path.abspath(path), stat.st_mtime_ns, stat.st_size]
+
+def write_store(path, source_file, entries):
+    """Atomically replace the store with entries ({key: str or bytes}) computed from source_file."""
+    tmp_path = f"{path}.tmp"
+    if os.path.exists(tmp_path):
+        os.remove(tmp_path)
+    conn = sqlite3.connect(tmp_path)
+    try:
+        conn.execute("CREATE TABLE aggregates (key TEXT PRIMARY KEY, value BLOB NOT NULL)")
+        rows = [("__source__", json_codec.dumps(source_signature(source_file), compact=True))]
+        rows += [(key, value.encode("utf-8") if isinstance(value, str) else value) for key, value in entries.items()]
+        conn.executemany("INSERT INTO aggregates (key, value) VALUES (?, ?)", rows)
+        conn.commit()
+    finally:
+        conn.close()
+    os.replace(tmp_path, path)
+
+def read_store(path):
+    """Return (source signature list, {key: bytes}) for a store file."""
+    conn = sqlite3.connect(f"file:{path}?mode=ro", uri=True)
+    try:
+        entries = dict(conn.execute("SELECT key, value FROM aggregates"))
+    finally:
+        conn.close()
+    return json_codec.loads(entries.pop("__source__")), entries
+
+class AggregateStore:
+    """Read side used by the web workers; re-reads the file only after the pipeline swaps it."""
+
+    def __init__(self):
+        self._cache = FileKeyedCache()
+
+    def get(self, data_dir, source_file, key):
+        """Stored bytes for key if the store was built from source_file as it is now, else None."""
+        path = store_path(data_dir)
+        try:
+            source, entries = self._cache.get(path, read_store)
+            if source != source_signature(source_file):
+                return None
+        except (OSError, sqlite3.Error):
+            return None
+        return entries.get(key)
@@ -0,0 +1,229 @@
+# dashboard/aggregation.py
+"""
+Single-pass aggregation of action records.
+
+The dashboard, the API and the chart scripts all need the same counts: actions per day,
+per hour of day, per hour of week, per clock hour (the hourly timeline) and per theme.
+aggregate() fills all of them in one pass over the records, parsing each ISO timestamp
+once, instead of every consumer making its own pass and re-parsing the dates.
+Bucketing rules match the original per-chart functions:
+  - day: the text before "T" of any non-empty date (no parsing needed)
+  - hour of day / hour of week / hourly timeline: the parsed timestamp in its own UTC
+    offset; unparseable dates are reported and skipped
+  - themes: every entry of the record's "themes" list
+Large inputs take the NumPy path in dashboard/timestamps.py, which produces the same
+counters from a vectorized parse of the date column; an ActionStore is counted from its
+already parsed columns.
+
+The hourly timeline is kept sparse (HourlyTimeline): only hours that have actions are
+stored, keyed by the UTC epoch second the hour starts at. A zero-filled dense array is
+built on demand for a bounded window, so a multi-year archive (or one outlier timestamp
+years away from the rest) no longer expands into one Python object per empty hour.
+"""
+import logging
+from array import array
+from bisect import bisect_left, bisect_right
+from datetime import datetime, timedelta, timezone
+from collections import Counter
+
+logger = logging.getLogger(__name__)
+
+# Record count from which aggregate() uses the NumPy path; below it, import and array
+# setup cost more than they save.
+VECTORIZE_THRESHOLD = 5000
+
+# Largest window HourlyTimeline.dense() materializes unless asked for more (~20 years).
+MAX_DENSE_HOURS = 24 * 366 * 20
+
+EPOCH = datetime(1970, 1, 1)
+_EPOCH_ORDINAL = EPOCH.toordinal()
+
+def hour_start(dt):
+    """UTC epoch second at which dt's local hour starts; naive datetimes are read as UTC."""
+    offset = dt.utcoffset()
+    wall = (dt.toordinal() - _EPOCH_ORDINAL) * 86400 + dt.hour * 3600
+    return wall - (int(offset.total_seconds()) if offset is not None else 0)
+
+def to_epoch(value):
+    """Epoch seconds for an int/float or a datetime (naive ones read as UTC)."""
+    if isinstance(value, datetime):
+        if value.tzinfo is None:
+            value = value.replace(tzinfo=timezone.utc)
+        return int(value.timestamp() // 1)
+    return int(value)
+
+class HourlyTimeline:
+    """
+    Per-hour action counts, stored sparsely as {hour start (UTC epoch seconds): count}
+    for the hours that have actions. Hours are labelled as datetimes in the UTC offset of
+    the earliest action (naive if that action had no offset), like the dense OrderedDict
+    this replaces. Gap filling is left to the caller: items() gives the non-empty hours,
+    dense() a zero-filled array for a window.
+    """
+
+    def __init__(self, counts=None, offset=None):
+        self.counts = dict(counts or {})
+        self.hours = sorted(self.counts)
+        self.tz = None if offset is None else timezone(timedelta(seconds=offset))
+
+    def __len__(self):
+        return len(self.hours)
+
+    @property
+    def total(self):
+        return sum(self.counts.values())
+
+    @property
+    def first(self):
+        return self.hours[0] if self.hours else None
+
+    @property
+    def last(self):
+        return self.hours[-1] if self.hours else None
+
+    def label(self, hour):
+        """Datetime label for an hour start (epoch seconds)."""
+        if self.tz is None:
+            return EPOCH + timedelta(seconds=hour)
+        return datetime.fromtimestamp(hour, self.tz)
+
+    def _window(self, start, end):
+        """Grid-aligned (start, end) epoch seconds; defaults to the whole timeline."""
+        start = self.first if start is None else to_epoch(start)
+        end = self.last if end is None else to_epoch(end)
+        # Snap start onto the timeline's hour grid so window slots line up with hours.
+        start = self.first + (start - self.first) // 3600 * 3600
+        return start, end
+
+    def items(self, start=None, end=None):
+        """[(hour label, count)] for the non-empty hours in [start, end], oldest first."""
+        if not self.hours:
+            return []
+        start, end = self._window(start, end)
+        lo, hi = bisect_left(self.hours, start), bisect_right(self.hours, end)
+        return [(self.label(h), self.counts[h]) for h in self.hours[lo:hi]]
+
+    def dense(self, start=None, end=None, max_hours=MAX_DENSE_HOURS):
+        """
+        (label of the first hour, array of counts per hour) for every hour in [start, end],
+        zeros included. Raises ValueError if the window exceeds max_hours.
+        Hours off the window's grid (e.g. from a +05:30 action in a -05:00 timeline) count
+        toward the hour they fall in.
+        """
+        if not self.hours:
+            return None, array("q")
+        start, end = self._window(start, end)
+        size = max(0, (end - start) // 3600 + 1)
+        if size > max_hours:
+            raise ValueError(f"Timeline window of {size} hours exceeds max_hours={max_hours}; "
+                             "request a narrower window.")
+        counts = array("q", bytes(8 * size))
+        for h in self.hours[bisect_left(self.hours, start):bisect_right(self.hours, end)]:
+            counts[(h - start) // 3600] += self.counts[h]
+        return self.label(start), counts
+
+class Aggregates:
+    """Counters filled by aggregate(), with accessors in the shapes the charts use."""
+
+    def __init__(self):
+        self.total = 0
+        self.days = Counter()
+        self.hours_of_day = Counter()
+        self.hours_of_week = Counter()  # weekday * 24 + hour, Monday 0:00 = 0
+        self.hourly = Counter()  # Hour start (UTC epoch seconds) -> count
+        self.hourly_offset = None  # UTC offset (seconds) of the earliest action; None if naive
+        self.themes = Counter()
+        self.errors = []  # (date string, exception) for unparseable dates
+        self.failed = []  # Per-record mask: True where a non-empty date did not parse
+
+    def daily(self):
+        """[(YYYY-MM-DD, count)] sorted by day."""
+        return sorted(self.days.items())
+
+    def hour_of_day_counts(self):
+        """{hour: count} for all 24 hours."""
+        return {hour: self.hours_of_day.get(hour, 0) for hour in range(24)}
+
+    def hour_of_week_counts(self):
+        """{weekday * 24 + hour: count} for all 168 hours of the week."""
+        return {slot: self.hours_of_week.get(slot, 0) for slot in range(168)}
+
+    def theme_counts(self):
+        """[(theme, count)] most frequent first."""
+        return sorted(self.themes.items(), key=lambda x: x[1], reverse=True)
+
+    def hourly_timeline(self):
+        """Sparse HourlyTimeline of the actions per clock hour."""
+        return HourlyTimeline(self.hourly, self.hourly_offset)
+
+def aggregate(actions):
+    """
+    Count the actions into every bucket in a single pass. Returns an Aggregates.
+    Unparseable dates are skipped for the time buckets, listed in .errors/.failed and
+    logged once as a summary.
+    """
+    if hasattr(actions, "aggregates"):
+        # A column store (dashboard/action_store.py) counts from its own columns.
+        result = actions.aggregates()
+    elif len(actions) >= VECTORIZE_THRESHOLD:
+        from dashboard.timestamps import aggregate_columnar
+        result = aggregate_columnar(actions)
+    else:
+        result = aggregate_rows(actions)
+    if result.errors:
+        logger.warning("%d of %d dates could not be parsed (first: %r)",
+                       len(result.errors), result.total, result.errors[0][0])
+    return result
+
+def count_days(actions):
+    """
+    [(YYYY-MM-DD, count)] sorted by day: aggregate()'s day bucket alone, which needs no
+    date parsing (for callers that only count per day).
+    """
+    if hasattr(actions, "aggregates"):
+        return sorted(actions.day_counts().items())
+    return sorted(Counter(d.split("T")[0] for d in (action.get("date") for action in actions) if d).items())
+
+def count_themes(actions):
+    """[(theme, count)] most frequent first: aggregate()'s theme bucket alone."""
+    if hasattr(actions, "aggregates"):
+        counts = {theme: count for theme, count in actions.theme_counts().items() if count}
+    else:
+        counts = Counter(theme for action in actions for theme in action.get("themes", []))
+    return sorted(counts.items(), key=lambda x: x[1], reverse=True)
+
+def aggregate_rows(actions):
+    """The per-record implementation of aggregate()."""
+    result = Aggregates()
+    failed_rows = []
+    # Collect keys in lists and count them at the end: Counter(iterable) counts in C,
+    # which is much cheaper than a Python-level += per record and bucket.
+    days, hours, week_slots, clock_hours, offsets, themes = [], [], [], [], [], []
+    for action in actions:
+        result.total += 1
+        dt_str = action.get("date")
+        if dt_str:
+            days.append(dt_str.split("T")[0])
+            try:
+                dt = datetime.fromisoformat(dt_str)
+            except Exception as e:
+                failed_rows.append(result.total - 1)
+                result.errors.append((dt_str, e))
+            else:
+                hours.append(dt.hour)
+                week_slots.append(dt.weekday() * 24 + dt.hour)
+                clock_hours.append(hour_start(dt))
+                offsets.append(dt.utcoffset())
+        themes.extend(action.get("themes", []))
+    result.days.update(days)
+    result.hours_of_day.update(hours)
+    result.hours_of_week.update(week_slots)
+    result.hourly.update(clock_hours)
+    if clock_hours:
+        offset = offsets[clock_hours.index(min(clock_hours))]
+        result.hourly_offset = None if offset is None else int(offset.total_seconds())
+    result.themes.update(themes)
+    result.failed = [False] * result.total
+    for i in failed_rows:
+        result.failed[i] = True
+    return result
@@ -1,195 +1,584 @@
 import os
-import json
-import subprocess
-from datetime import datetime
-from collections import Counter, defaultdict
-from flask import Flask, render_template, redirect, url_for, flash
-import plotly.graph_objs as go
-import plotly.io as pio
+import sys
+import base64
+from bisect import bisect_left
+from datetime import datetime, date
+from functools import lru_cache
+from collections import defaultdict
+from flask import Flask, Blueprint, Response, render_template, redirect, url_for, flash, request, jsonify
 
-# Explicitly define the templates folder.
-app = Flask(__name__, template_folder=os.path.join(os.getcwd(), "dashboard", "templates"))
-app.secret_key = "your_secret_key"  # Replace with a secure key
+# Make the project root importable when run as `python dashboard/app.py`.
+# Only light modules are imported here; SQLAlchemy (search, ETL) and Plotly (chart
+# skeletons) load on first use, so workers and CLI imports start fast.
+sys.path.append(os.path.abspath(os.path.join(os.path.dirname(__file__), '..')))
+from dashboard.cache import FileKeyedCache, file_signature
+from dashboard import manifest, json_codec
+from dashboard.http_cache import make_etag, cached_json_response
+from dashboard import charts
+from dashboard.aggregation import aggregate, count_days, count_themes
+from dashboard.action_store import ActionStore
+from dashboard.downsample import DailyLevels, RESOLUTIONS
+from dashboard.aggregate_store import AggregateStore, store_path, write_store
+from dashboard.jobs import RefreshJob
+from scripts.pipeline import STAGES
+from scripts import pipeline_daemon
+from dashboard.events import EventBroker, deltas_from_actions, stream_events
 
-DATA_DIR = os.path.join(os.getcwd(), "data")
+# Aggregates and chart JSON for the latest data file, rebuilt only when that file changes.
+chart_cache = FileKeyedCache()
+# Records (as an ActionStore) and their time-sorted index for the JSON API.
+actions_cache = FileKeyedCache()
+# Aggregates precomputed once by the pipeline's "publish" stage, shared by all workers.
+aggregate_store = AggregateStore()
+# Day x hour x theme count cube of the latest data file (see dashboard/cube.py).
+cube_cache = FileKeyedCache()
 
-def load_latest_data_with_themes():
+def publish_deltas(actions):
     """
-    Load the most recent JSON file with themes from the DATA_DIR.
-    Looks for files starting with "presidential_actions_with_themes_".
+    ETL batch listener: push the aggregate deltas of newly inserted actions to open
+    dashboards, tagged with the version of the data file current when they were loaded.
+    A page rendered from that file or a later one already counts them and skips the delta.
+    """
+    event_broker.publish("delta", dict(deltas_from_actions(actions), version=data_stamp()))
+
+def run_refresh_pipeline(on_stage):
+    """Run the pipeline under the same lock and checkpoints as the scheduler daemon."""
+    from scripts import etl
+    # Aggregate deltas from every ETL batch committed in this process go to open dashboards.
+    if publish_deltas not in etl.batch_listeners:
+        etl.batch_listeners.append(publish_deltas)
+    ran = pipeline_daemon.run_once(
+        DATA_DIR,
+        lock_path=os.path.join(DATA_DIR, "pipeline.lock"),
+        checkpoint_path=os.path.join(DATA_DIR, "pipeline_checkpoint.json"),
+        on_stage=on_stage,
+    )
+    if not ran:
+        raise RuntimeError("Another pipeline run (e.g. the scheduler) is in progress.")
+
+# Every open /events stream holds one of the worker's threads (gunicorn.conf.py: threads),
+# so only this many are accepted per process; further clients get 503 and no live updates.
+MAX_EVENT_STREAMS = int(os.environ.get("DASHBOARD_MAX_EVENT_STREAMS", 4))
+
+# Fans ETL deltas out to the /events streams of this process.
+event_broker = EventBroker(max_subscribers=MAX_EVENT_STREAMS)
+
+# Background scrape -> theme -> QA -> load refresh, shared by all requests in this process.
+refresh_job = RefreshJob(run_refresh_pipeline, STAGES)
+
+# Segment-store consumer name of the publish stage (see update_running_aggregates).
+PUBLISH_CONSUMER = "publish"
+
+# Max bars on the daily chart / points in a /api/daily response.
+DAILY_POINT_BUDGET = 1000
+
+API_DEFAULT_LIMIT = 100
+API_MAX_LIMIT = 500
+
+bp = Blueprint("dashboard", __name__)
+
+DATA_DIR = os.environ.get("DASHBOARD_DATA_DIR", os.path.join(os.getcwd(), "data"))
+
+def create_app():
     """
-    files = [f for f in os.listdir(DATA_DIR) if f.startswith("presidential_actions_with_themes_") and f.endswith(".json")]
+    Build the Flask app. Used by `python dashboard/app.py`, wsgi.py (gunicorn) and the tests.
+    The session secret comes from the DASHBOARD_SECRET_KEY environment variable.
+    """
+    app = Flask(__name__, template_folder=os.path.join(os.path.dirname(os.path.abspath(__file__)), "templates"))
+    app.secret_key = os.environ.get("DASHBOARD_SECRET_KEY", "your_secret_key")  # Replace with a secure key
+    app.register_blueprint(bp)
+    return app
+
+def find_latest_data_with_themes(data_dir=None):
+    """
+    Return the path of the most recent JSON file with themes in data_dir (default DATA_DIR).
+    Reads the "qa"/"themed" stage manifests; data directories without manifests
+    fall back to scanning for files starting with "presidential_actions_with_themes_".
+    """
+    data_dir = data_dir or DATA_DIR
+    latest_file = manifest.resolve_latest(data_dir, "qa", "themed")
+    if latest_file is not None:
+        return latest_file
+    files = [f for f in os.listdir(data_dir) if f.startswith("presidential_actions_with_themes_") and f.endswith(".json")]
     if not files:
         raise FileNotFoundError("No updated data file with themes found in the data directory.")
-    files.sort(key=lambda f: os.path.getmtime(os.path.join(DATA_DIR, f)), reverse=True)
-    latest_file = os.path.join(DATA_DIR, files[0])
-    with open(latest_file, "r", encoding="utf-8") as f:
-        data = json.load(f)
-    return data, latest_file
+    files.sort(key=lambda f: os.path.getmtime(os.path.join(data_dir, f)), reverse=True)
+    return os.path.join(data_dir, files[0])
+
+def load_latest_data_with_themes():
+    """
+    Load the most recent JSON file with themes from the DATA_DIR.
+    Returns the records and the file path.
+    """
+    latest_file = find_latest_data_with_themes()
+    return json_codec.load(latest_file), latest_file
+
+# The single-metric helpers below each make a pass of their own; code that needs several
+# metrics should call aggregate() once (see charts_for_actions). The day and theme counts
+# need no date parsing, so they skip aggregate() altogether.
 
 def aggregate_by_day(actions):
     """
     Aggregate the number of actions per day.
     Assumes each action has a 'date' key in ISO format.
     """
-    dates = [action["date"].split("T")[0] for action in actions if action.get("date")]
-    counts = Counter(dates)
-    sorted_counts = sorted(counts.items())
-    return sorted_counts
+    return count_days(actions)
 
 def aggregate_by_hour_of_day(actions):
     """
     Aggregate presidential actions by hour of day (0 to 23), ignoring the date.
     Returns a dictionary mapping hour (int) to count (int) for all 24 hours.
     """
-    hours = []
-    for action in actions:
-        dt_str = action.get("date")
-        if dt_str:
-            try:
-                dt = datetime.fromisoformat(dt_str)
-                hours.append(dt.hour)
-            except Exception as e:
-                print(f"Error parsing date '{dt_str}': {e}")
-    counts = Counter(hours)
-    hourly_counts = {hour: counts.get(hour, 0) for hour in range(24)}
-    return hourly_counts
+    return aggregate(actions).hour_of_day_counts()
 
 def aggregate_by_theme(actions):
     """
     Aggregate counts for each theme across all actions.
-    Each record's 'themes' is a list; count each theme.
     Returns a sorted list of tuples (theme, count) in descending order.
     """
-    theme_counter = Counter()
-    for action in actions:
-        themes = action.get("themes", [])
-        for theme in themes:
-            theme_counter[theme] += 1
-    sorted_themes = sorted(theme_counter.items(), key=lambda x: x[1], reverse=True)
-    return sorted_themes
+    return count_themes(actions)
 
-def generate_daily_chart(aggregated_data):
+def generate_daily_chart(aggregated_data, resolution="day"):
     """
     Generate a standard bar chart for daily aggregated data using a dark theme.
+    aggregated_data may be rolled up to weeks or months (see dashboard/downsample.py).
     """
-    if not aggregated_data:
-        return None
-    dates, counts = zip(*aggregated_data)
-    fig = go.Figure(data=[go.Bar(x=dates, y=counts, marker_color='#00704A')])  # Amazon Green
-    fig.update_layout(
-        title="Number of Presidential Actions per Day",
-        xaxis_title="Date",
-        yaxis_title="Number of Actions",
-        template="plotly_dark"
-    )
-    return pio.to_json(fig)
+    return charts.daily_chart_json(aggregated_data, resolution)
 
 def generate_polar_chart(hourly_counts):
     """
     Generate a polar (clock-like) bar chart for hourly aggregated data using a dark theme.
     Each hour is mapped to an angle (hour * 15°) and the radial length is the count.
     """
-    hours = list(range(24))
-    counts = [hourly_counts[h] for h in hours]
-    theta = [h * 15 for h in hours]  # 0° for 0:00, 15° for 1:00, …, 345° for 23:00
-
-    fig = go.Figure(go.Barpolar(
-        r=counts,
-        theta=theta,
-        width=[15]*24,
-        marker_color=counts,
-        marker_colorscale='Portland',  # A striking, dark colorscale
-        marker_line_color="white",
-        marker_line_width=1,
-        opacity=0.8
-    ))
-    fig.update_layout(
-        title="Aggregated Presidential Actions per Hour of Day",
-        polar=dict(
-            angularaxis=dict(
-                direction="clockwise",
-                tickmode="array",
-                tickvals=theta,
-                ticktext=[f"{h}:00" for h in hours],
-                period=360,
-                color='white'
-            ),
-            radialaxis=dict(
-                ticksuffix=" PA",
-                dtick=1,
-                color='white'
-            )
-        ),
-        showlegend=False,
-        template="plotly_dark"
-    )
-    return pio.to_json(fig)
+    return charts.polar_chart_json(hourly_counts)
 
 def generate_theme_chart(aggregated_theme_data):
     """
     Generate a horizontal bar chart for theme counts, sorted in descending order.
     """
-    if not aggregated_theme_data:
-        return None
-    themes, counts = zip(*aggregated_theme_data)
-    # Reverse the order for horizontal bars (highest on top)
-    themes = list(themes)[::-1]
-    counts = list(counts)[::-1]
-    fig = go.Figure(data=[go.Bar(
-        x=counts,
-        y=themes,
-        orientation='h',
-        marker_color='#FF9900'  # Amazon Orange
-    )])
-    fig.update_layout(
-        title="Presidential Actions by Theme",
-        xaxis_title="Count of Actions",
-        yaxis_title="Theme",
-        template="plotly_dark"
-    )
-    return pio.to_json(fig)
+    return charts.theme_chart_json(aggregated_theme_data)
+
+def build_charts(data_file):
+    """
+    JSON for all three dashboard charts of a data file: from the shared aggregate store
+    when the pipeline has published it, otherwise computed from the file.
+    """
+    stored = aggregate_store.get(DATA_DIR, data_file, "charts")
+    if stored is not None:
+        return json_codec.loads(stored)
+    return charts_for_actions(json_codec.load(data_file))
+
+def charts_for_actions(actions):
+    """Aggregate the actions (one pass) and build the JSON for all three dashboard charts."""
+    return charts_for_counts(aggregate(actions))
+
+def charts_for_counts(counts):
+    """JSON for all three dashboard charts from an Aggregates."""
+    # Long archives are rolled up to weeks/months to stay within the point budget.
+    resolution, daily = DailyLevels(counts.daily()).series(max_points=DAILY_POINT_BUDGET)
+    return {
+        "daily_chart_json": generate_daily_chart(daily, resolution),
+        "daily_resolution": resolution,  # Live deltas are applied at this level.
+        "polar_chart_json": generate_polar_chart(counts.hour_of_day_counts()),
+        "theme_chart_json": generate_theme_chart(counts.theme_counts()),
+    }
 
-@app.route("/")
+@bp.route("/")
 def index():
     try:
-        actions, source_file = load_latest_data_with_themes()
+        source_file = find_latest_data_with_themes()
+        charts = chart_cache.get(source_file, build_charts)
     except FileNotFoundError as e:
         flash(str(e), "danger")
-        actions = []
         source_file = None
-
-    aggregated_daily = aggregate_by_day(actions)
-    daily_chart_json = generate_daily_chart(aggregated_daily)
-
-    aggregated_hourly = aggregate_by_hour_of_day(actions)
-    polar_chart_json = generate_polar_chart(aggregated_hourly)
-
-    aggregated_theme = aggregate_by_theme(actions)
-    theme_chart_json = generate_theme_chart(aggregated_theme)
+        charts = charts_for_actions([])
 
     last_updated = datetime.now().strftime("%Y-%m-%d %H:%M:%S")
     return render_template("index.html",
-                           daily_chart_json=daily_chart_json,
-                           polar_chart_json=polar_chart_json,
-                           theme_chart_json=theme_chart_json,
                            last_updated=last_updated,
-                           source_file=source_file)
+                           source_file=source_file,
+                           data_stamp=data_stamp(source_file),
+                           **charts)
 
-@app.route("/refresh")
-def refresh():
-    """Trigger the scraping script to update data."""
+def build_cube(data_file):
+    """The count cube of a data file: from the aggregate store if published, else built from the file."""
+    # Imported here: the cube needs NumPy, which the other pages do not.
+    from dashboard.cube import CountCube
+    stored = aggregate_store.get(DATA_DIR, data_file, "cube")
+    if stored is not None:
+        return CountCube.from_bytes(stored)
+    return CountCube.from_actions(json_codec.load(data_file))
+
+def heatmap_charts(cube, start=None, end=None, theme=None):
+    """Weekday x hour and theme x hour heatmap JSON for a slice of the cube."""
+    from dashboard.cube import WEEKDAY_NAMES
+    sub = cube.slice(start, end, themes=[theme] if theme else None)
+    if not sub.total:
+        return {"weekday_heatmap_json": None, "theme_heatmap_json": None}
+    (weekdays, _), by_weekday = sub.rollup("weekday", "hour")
+    (themes, _), by_theme = sub.rollup("theme", "hour")
+    return {
+        "weekday_heatmap_json": charts.heatmap_chart_json(
+            "weekday", [WEEKDAY_NAMES[d] for d in weekdays], by_weekday.tolist()),
+        "theme_heatmap_json": charts.heatmap_chart_json(
+            "theme", [t or "(no theme)" for t in themes], by_theme.tolist()),
+    }
+
+@bp.route("/heatmaps")
+def heatmaps():
+    """Weekday x hour and theme x hour heatmaps, filtered by start, end and theme."""
+    try:
+        start, end, theme = parse_api_filters(request.args)
+    except ValueError as e:
+        flash(f"Invalid filter: {e}", "danger")
+        start, end, theme = None, None, None
     try:
-        result = subprocess.run(
-            ["python", os.path.join("scripts", "scrap_presidential_actions.py")],
-            capture_output=True,
-            text=True,
-            check=True
-        )
-        flash("Data refresh initiated successfully.", "success")
-    except subprocess.CalledProcessError as e:
-        flash(f"Data refresh failed: {e.stderr}", "danger")
-    return redirect(url_for("index"))
+        source_file = find_latest_data_with_themes()
+        heatmap_json = heatmap_charts(cube_cache.get(source_file, build_cube), start, end, theme)
+    except FileNotFoundError as e:
+        flash(str(e), "danger")
+        source_file, heatmap_json = None, {"weekday_heatmap_json": None, "theme_heatmap_json": None}
+    return render_template("heatmaps.html", source_file=source_file,
+                           start=start or "", end=end or "", theme=theme or "", **heatmap_json)
+
+@bp.route("/search")
+def search():
+    """Full-text search over action titles, ranked by relevance and paginated."""
+    from dashboard.search import search_actions
+    query = request.args.get("q", "").strip()
+    page = request.args.get("page", 1, type=int)
+    results = search_actions(query, page=page) if query else None
+    return render_template("search.html", query=query, results=results)
+
+# --- JSON API ---
+
+def load_indexed_actions(data_file):
+    """
+    Load a data file for the API. Returns the records as an ActionStore (a fraction of
+    the memory of the dicts; see dashboard/action_store.py) plus the dated records as
+    (epoch, title, position in the file) tuples sorted oldest first; the position breaks
+    ties between records with the same date and title (QA keeps duplicates) and is where
+    store.record() finds the record. Undated/unparseable records are left out of the
+    sorted list (and so out of /api/actions).
+    """
+    store = ActionStore.from_records(json_codec.load(data_file))
+    titles = store.titles()
+    canonical = store.parsed.canonical.tolist()
+    epochs = store.parsed.epoch.tolist()
+    indexed = []
+    for position, title in enumerate(titles):
+        if canonical[position]:
+            ts = float(epochs[position])  # Whole seconds with an offset: exactly fromisoformat's.
+        else:
+            try:
+                ts = datetime.fromisoformat(store.date(position)).timestamp()
+            except ValueError:
+                continue
+        indexed.append((ts, title, position))
+    indexed.sort(key=row_key)
+    return store, indexed
+
+def row_key(row):
+    """Unique sort key of an indexed row: (epoch, title, position)."""
+    return row[:3]
+
+def parse_api_filters(args):
+    """Read the start/end (YYYY-MM-DD, inclusive) and theme filters; raises ValueError."""
+    start = args.get("start") or None
+    end = args.get("end") or None
+    for value in (start, end):
+        if value is not None:
+            date.fromisoformat(value)
+    return start, end, args.get("theme") or None
+
+def matches_filters(action, start, end, theme):
+    """True if the action falls in the [start, end] date range and carries the theme."""
+    day = (action.get("date") or "")[:10]
+    if start and (not day or day < start):
+        return False
+    if end and (not day or day > end):
+        return False
+    return theme is None or theme in (action.get("themes") or [])
+
+def encode_cursor(row):
+    return base64.urlsafe_b64encode(json_codec.dumps(list(row_key(row)), compact=True)).decode("ascii")
+
+def decode_cursor(cursor):
+    """The row_key() a cursor resumes after; raises ValueError if it is malformed."""
+    ts, title, position = json_codec.loads(base64.urlsafe_b64decode(cursor.encode("ascii")))
+    return float(ts), str(title), int(position)
+
+@lru_cache(maxsize=32)
+def daily_levels(signature, theme):
+    """Day/week/month levels of the daily counts for one data version and theme filter."""
+    store, _ = actions_cache.get(signature[0], load_indexed_actions)
+    return DailyLevels(aggregate_by_day(store.filter(theme=theme)))
+
+def stored_key(endpoint, start, end, theme, limit=None, resolution=None):
+    """Aggregate-store key of the unfiltered requests the pipeline precomputes, else None."""
+    if endpoint == "actions" or (start, end, theme) != (None, None, None):
+        return None
+    if endpoint == "daily" and (limit, resolution) != (DAILY_POINT_BUDGET, "auto"):
+        return None
+    return f"api:{endpoint}"
+
+@lru_cache(maxsize=256)
+def api_payload(signature, endpoint, start, end, theme, cursor=None, limit=None, resolution=None):
+    """
+    The JSON body (bytes) for an API endpoint. Memoized per data-file signature,
+    so a new data file naturally misses and old entries age out of the LRU.
+    """
+    key = stored_key(endpoint, start, end, theme, limit, resolution)
+    stored = aggregate_store.get(DATA_DIR, signature[0], key) if key else None
+    if stored is not None:
+        return stored
+    return build_api_payload(signature, endpoint, start, end, theme, cursor, limit, resolution)
+
+def daily_resolution(signature, start, end, theme, limit):
+    """The level ("day"/"week"/"month") an auto-resolution /api/daily request is served at."""
+    key = stored_key("daily", start, end, theme, limit, "auto")
+    stored = aggregate_store.get(DATA_DIR, signature[0], f"{key}:resolution") if key else None
+    if stored is not None:
+        return stored.decode("ascii")
+    return daily_levels(signature, theme).series(start, end, max_points=limit)[0]
+
+def build_api_payload(signature, endpoint, start, end, theme, cursor=None, limit=None, resolution=None):
+    """Compute the JSON body (bytes) for an API endpoint from the data file."""
+    store, indexed = actions_cache.get(signature[0], load_indexed_actions)
+    if endpoint == "actions":
+        # Newest first: walk backwards from the cursor position in the sorted list.
+        position = len(indexed) if cursor is None else bisect_left(indexed, decode_cursor(cursor), key=row_key)
+        page = []
+        while position > 0 and len(page) < limit:
+            position -= 1
+            row = indexed[position]
+            record = store.record(row[2])
+            if matches_filters(record, start, end, theme):
+                page.append((row, record))
+        body = {
+            "actions": [record for _, record in page],
+            "next_cursor": encode_cursor(page[-1][0]) if len(page) == limit and position > 0 else None,
+        }
+        return json_codec.dumps(body, compact=True)
+    if endpoint == "daily":
+        # resolution is "auto" or a fixed level; limit doubles as the point budget.
+        fixed = None if resolution == "auto" else resolution
+        _, series = daily_levels(signature, theme).series(start, end, max_points=limit, resolution=fixed)
+        return daily_body(series)
+    selected = store.filter(start, end, theme)
+    if endpoint == "hourly":
+        return hourly_body(aggregate_by_hour_of_day(selected))
+    return themes_body(aggregate_by_theme(selected))
+
+# JSON bodies of the aggregate endpoints, shared by the per-request and published paths.
+
+def daily_body(series):
+    return json_codec.dumps([{"date": d, "count": c} for d, c in series], compact=True)
+
+def hourly_body(hourly_counts):
+    return json_codec.dumps([{"hour": h, "count": c} for h, c in hourly_counts.items()], compact=True)
+
+def themes_body(theme_counts):
+    return json_codec.dumps([{"theme": t, "count": c} for t, c in theme_counts], compact=True)
+
+def api_response(endpoint, paginated=False):
+    """Shared handler: validate filters, then answer with an ETag-validated, compressed body."""
+    try:
+        start, end, theme = parse_api_filters(request.args)
+        cursor, limit, resolution = None, None, None
+        if endpoint == "daily":
+            resolution = request.args.get("resolution", "auto")
+            if resolution != "auto" and resolution not in RESOLUTIONS:
+                raise ValueError(f"resolution must be auto, {', '.join(RESOLUTIONS)}")
+            limit = min(max(request.args.get("max_points", DAILY_POINT_BUDGET, type=int), 3), 10 * DAILY_POINT_BUDGET)
+        if paginated:
+            cursor = request.args.get("cursor") or None
+            limit = min(max(request.args.get("limit", API_DEFAULT_LIMIT, type=int), 1), API_MAX_LIMIT)
+            if cursor is not None:
+                decode_cursor(cursor)
+    except (ValueError, TypeError) as e:
+        return jsonify({"error": f"Invalid query parameter: {e}"}), 400
+    try:
+        signature = file_signature(find_latest_data_with_themes())
+    except FileNotFoundError as e:
+        return jsonify({"error": str(e)}), 404
+
+    etag = make_etag(signature, endpoint, start, end, theme, cursor, limit, resolution)
+    response = cached_json_response(
+        etag, lambda: api_payload(signature, endpoint, start, end, theme, cursor, limit, resolution))
+    if endpoint == "daily":
+        response.headers["X-Resolution"] = resolution if resolution != "auto" else \
+            daily_resolution(signature, start, end, theme, limit)
+    return response
+
+@bp.route("/api/daily")
+def api_daily():
+    """
+    Actions per day: [{"date", "count"}]. Filters: start, end, theme.
+    Long ranges are rolled up to weeks, months or years to fit max_points (default 1000);
+    pass resolution=day|week|month|year to force a level. X-Resolution names the level used.
+    """
+    return api_response("daily")
+
+@bp.route("/api/hourly")
+def api_hourly():
+    """Actions per hour of day (0-23): [{"hour", "count"}]. Filters: start, end, theme."""
+    return api_response("hourly")
+
+@bp.route("/api/themes")
+def api_themes():
+    """
+    Actions per theme, most frequent first: [{"theme", "count"}]. Filters: start, end, theme
+    (which keeps the actions carrying that theme, so their other themes are counted too).
+    """
+    return api_response("themes")
+
+@bp.route("/api/actions")
+def api_actions():
+    """
+    Actions newest first, {"actions": [...], "next_cursor": ...}.
+    Filters: start, end, theme; pagination: limit (max 500) and the opaque cursor
+    returned by the previous page.
+    """
+    return api_response("actions", paginated=True)
+
+@bp.route("/api/cube")
+def api_cube():
+    """
+    Roll-up of the day x hour x theme cube: {"by", "axes", "counts"}, counts nested one
+    level per dimension of by. by is a comma-separated list of at most one of
+    day/week/month/year/weekday plus hour and/or theme (default "hour").
+    Filters: start, end, theme. Drill down by narrowing start/end and asking for a
+    finer day level.
+    """
+    try:
+        start, end, theme = parse_api_filters(request.args)
+        by = tuple(d.strip() for d in request.args.get("by", "hour").split(",") if d.strip())
+        from dashboard.cube import DIMENSIONS, DAY_LEVELS
+        if not by or any(d not in DIMENSIONS for d in by) or len(set(by)) != len(by) \
+                or sum(d in DAY_LEVELS for d in by) > 1:
+            raise ValueError(f"by must list distinct dimensions of {', '.join(DIMENSIONS)} (at most one day level)")
+    except (ValueError, TypeError) as e:
+        return jsonify({"error": f"Invalid query parameter: {e}"}), 400
+    try:
+        source_file = find_latest_data_with_themes()
+    except FileNotFoundError as e:
+        return jsonify({"error": str(e)}), 404
+
+    def body():
+        sub = cube_cache.get(source_file, build_cube).slice(start, end, themes=[theme] if theme else None)
+        axes, counts = sub.rollup(*by)
+        return json_codec.dumps({"by": list(by), "axes": axes, "counts": counts}, compact=True)
+
+    return cached_json_response(make_etag(file_signature(source_file), "cube", by, start, end, theme), body)
+
+def data_version():
+    """Signature of the latest data file, or None if there is none yet."""
+    try:
+        return file_signature(find_latest_data_with_themes())
+    except FileNotFoundError:
+        return None
+
+def data_stamp(source_file=None):
+    """
+    Modification time (microseconds, exact as a JavaScript number) of source_file or the
+    latest data file; 0 if there is none. Orders page renders and deltas (see publish_deltas).
+    """
+    try:
+        return file_signature(source_file or find_latest_data_with_themes())[1] // 1000
+    except FileNotFoundError:
+        return 0
+
+@bp.route("/events")
+def events():
+    """Server-Sent Events stream of aggregate deltas ("delta") and data reloads ("refresh")."""
+    subscription = event_broker.subscribe()
+    if subscription is None:
+        return Response("Too many live update streams.", status=503, headers={"Retry-After": "60"})
+    return Response(stream_events(event_broker, data_version, subscription=subscription),
+                    mimetype="text/event-stream",
+                    headers={"Cache-Control": "no-cache", "X-Accel-Buffering": "no"})
+
+@bp.route("/refresh")
+def refresh():
+    """Start the background data refresh (or join the one already running)."""
+    started, status = refresh_job.start()
+    if started:
+        flash("Data refresh started. Progress: /refresh/status", "success")
+    else:
+        flash(f"A data refresh is already running (run {status['run']}).", "success")
+    return redirect(url_for(".index"))
+
+@bp.route("/refresh/status")
+def refresh_status():
+    """Report the state, per-stage timings and outcome of the current or last refresh."""
+    return jsonify(refresh_job.status())
+
+# --- Shared aggregate store ---
+
+def precompute_aggregates(data_file):
+    """
+    Store entries for a data file, computed from all of its records (the full recompute
+    that publish_aggregates() replaces with running aggregates).
+    """
+    from dashboard.cube import CountCube
+    actions = json_codec.load(data_file)
+    return aggregate_entries(aggregate(actions), CountCube.from_actions(actions).to_bytes())
+
+def aggregate_entries(counts, cube_bytes):
+    """Chart JSON, unfiltered API bodies and the serialized count cube, keyed for the aggregate store."""
+    resolution, daily = DailyLevels(counts.daily()).series(max_points=DAILY_POINT_BUDGET)
+    return {
+        "charts": json_codec.dumps(charts_for_counts(counts), compact=True),
+        "cube": cube_bytes,
+        stored_key("daily", None, None, None, DAILY_POINT_BUDGET, "auto"): daily_body(daily),
+        "api:daily:resolution": resolution,
+        stored_key("hourly", None, None, None): hourly_body(counts.hour_of_day_counts()),
+        stored_key("themes", None, None, None): themes_body(counts.theme_counts()),
+    }
+
+def update_running_aggregates(data_dir, source_file):
+    """
+    Bring the running aggregates of data_dir up to date with the latest QA'd records and
+    return their snapshot. With a QA segment store only the records appended since the
+    last publish are read; otherwise the snapshot file is diffed against the counted
+    records. Everything is recounted only when records disappeared from the source
+    (e.g. segment retention or a rewritten snapshot).
+    """
+    from dashboard.running_aggregates import RunningAggregates, BUCKETS, state_path
+    from scripts.segment_store import SegmentStore, record_hash
+    state = RunningAggregates(state_path(data_dir))
+    qa_store = SegmentStore("qa", root=os.path.join(data_dir, "store"))
+    if qa_store.head is not None:
+        cursor = qa_store.manifest["cursors"].get(PUBLISH_CONSUMER, 0)
+        kept = sum(s["count"] for s in qa_store.manifest["segments"] if s["offset"] < cursor)
+        if state.offset == cursor and state.record_count == kept:
+            records, end_offset = qa_store.read_new(PUBLISH_CONSUMER)
+            state.apply(records, offset=end_offset)
+        else:
+            state.rebuild(qa_store.read_all(), offset=qa_store.end_offset)
+        qa_store.commit(PUBLISH_CONSUMER, state.offset)
+    else:
+        records = json_codec.load(source_file)
+        keys = [record_hash(record) for record in records]
+        counted = state.contains(keys)
+        if len(counted) == state.record_count:
+            state.apply([record for record, key in zip(records, keys) if key not in counted])
+        else:
+            state.rebuild(records)
+    # The store entries do not use the hourly timeline.
+    return state.snapshot(buckets=[b for b in BUCKETS if b != "hourly"])
+
+def publish_aggregates(data_dir=None):
+    """Update the running aggregates and rewrite the aggregate store for the latest data file; returns its path."""
+    from dashboard.cube import CountCube
+    data_dir = data_dir or DATA_DIR
+    source_file = find_latest_data_with_themes(data_dir)
+    snapshot = update_running_aggregates(data_dir, source_file)
+    entries = aggregate_entries(snapshot.counts, snapshot.cube_bytes or CountCube.empty().to_bytes())
+    entries["state:version"] = str(snapshot.version)
+    write_store(store_path(data_dir), source_file, entries)
+    return source_file
 
 if __name__ == "__main__":
-    app.run(debug=True)
+    create_app().run(debug=True)
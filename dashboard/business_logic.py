@@ -1,14 +1,15 @@
 # dashboard/business_logic.py
 """
 This module contains functions to query and aggregate the presidential action data.
+Counts are read from the rollup tables maintained by the ETL (see dashboard/rollups.py),
+so each query touches one row per bucket rather than every action.
 References:
-  - SQLAlchemy extract(): https://docs.sqlalchemy.org/en/14/core/expression_api.html#sqlalchemy.sql.expression.extract
   - Flask logging: https://flask.palletsprojects.com/en/2.2.x/logging/
 """
-from sqlalchemy import create_engine, func, extract
+from sqlalchemy import create_engine
 from sqlalchemy.orm import sessionmaker
 from config.config import DB_URI
-from dashboard.models import PresidentialAction
+from dashboard.models import DailyCount, HourlyCount, ThemeCount
 import logging
 
 logger = logging.getLogger(__name__)
@@ -22,14 +23,9 @@ def get_daily_counts():
     """Return daily counts deduplicated via the unique hash."""
     session = get_db_session()
     try:
-        # Group by the DATE portion of the full timestamp.
         results = (
-            session.query(
-                func.date(PresidentialAction.action_timestamp).label('date'),
-                func.count(PresidentialAction.id).label('count')
-            )
-            .group_by(func.date(PresidentialAction.action_timestamp))
-            .order_by(func.date(PresidentialAction.action_timestamp))
+            session.query(DailyCount.day.label('date'), DailyCount.count.label('count'))
+            .order_by(DailyCount.day)
             .all()
         )
         return results
@@ -44,12 +40,8 @@ def get_actions_by_theme():
     session = get_db_session()
     try:
         results = (
-            session.query(
-                PresidentialAction.theme,
-                func.count(PresidentialAction.id).label('count')
-            )
-            .group_by(PresidentialAction.theme)
-            .order_by(PresidentialAction.theme)
+            session.query(ThemeCount.theme, ThemeCount.count.label('count'))
+            .order_by(ThemeCount.theme)
             .all()
         )
         return results
@@ -64,12 +56,8 @@ def get_actions_by_hour():
     session = get_db_session()
     try:
         results = (
-            session.query(
-                extract('hour', PresidentialAction.action_timestamp).label('hour'),
-                func.count(PresidentialAction.id).label('count')
-            )
-            .group_by('hour')
-            .order_by('hour')
+            session.query(HourlyCount.hour.label('hour'), HourlyCount.count.label('count'))
+            .order_by(HourlyCount.hour)
             .all()
         )
         return results
@@ -0,0 +1,42 @@
+# dashboard/cache.py
+"""
+In-process cache for values derived from a data file (aggregates, chart JSON).
+Entries are keyed by the file's path, mtime and size, so they are rebuilt only when
+the pipeline writes a new file. Rebuilds are single-flight: when several requests miss
+at once, one of them builds while the others wait and then reuse its result.
+"""
+import os
+import threading
+
+def file_signature(path):
+    """Return (path, mtime_ns, size) for the file, the cache key for anything derived from it."""
+    stat = os.stat(path)
+    return path, stat.st_mtime_ns, stat.st_size
+
+class FileKeyedCache:
+    """Caches one value per file signature; a changed file invalidates the value."""
+
+    def __init__(self):
+        self._lock = threading.Lock()
+        self._entry = (None, None)  # (signature, value), swapped as one object.
+
+    def get(self, path, build):
+        """
+        Return the cached value for path, calling build(path) to (re)compute it when
+        the file's signature changed. Concurrent misses share a single build.
+        """
+        signature = file_signature(path)
+        cached_signature, value = self._entry
+        if signature == cached_signature:
+            return value
+        with self._lock:
+            # Another request may have rebuilt while we waited for the lock.
+            cached_signature, value = self._entry
+            if signature != cached_signature:
+                value = build(path)
+                self._entry = (signature, value)
+            return value
+
+    def clear(self):
+        with self._lock:
+            self._entry = (None, None)
@@ -0,0 +1,171 @@
+# dashboard/charts.py
+"""
+Lightweight Plotly chart-spec builder for the dashboard.
+
+Building go.Figure objects validates every property on every call and pio.to_json then
+walks the whole figure, including the fully expanded "plotly_dark" template. That cost
+grows with the number of bars. Here each chart's static parts (layout with the expanded
+template, colorscale, trace styling) are built once with plotly.graph_objs and cached as
+plain dicts / pre-serialized layout bytes. Per call only the data arrays are filled
+in and dumped with dashboard/json_codec.py, which yields the same JSON as the go.Figure
+version.
+"""
+from functools import lru_cache
+
+from dashboard import json_codec
+
+DAILY_BAR_COLOR = '#00704A'  # Amazon Green
+THEME_BAR_COLOR = '#FF9900'  # Amazon Orange
+CHART_TEMPLATE = "plotly_dark"
+
+HOURS = list(range(24))
+HOUR_THETA = [h * 15 for h in HOURS]  # 0° for 0:00, 15° for 1:00, …, 345° for 23:00
+
+# Daily chart wording per bucket resolution (see dashboard/downsample.py).
+DAILY_TITLES = {
+    "day": ("Number of Presidential Actions per Day", "Date"),
+    "week": ("Number of Presidential Actions per Week", "Week Starting"),
+    "month": ("Number of Presidential Actions per Month", "Month"),
+    "year": ("Number of Presidential Actions per Year", "Year"),
+}
+
+def _daily_figure(dates, counts, resolution="day"):
+    import plotly.graph_objs as go
+    title, xaxis_title = DAILY_TITLES[resolution]
+    fig = go.Figure(data=[go.Bar(x=dates, y=counts, marker_color=DAILY_BAR_COLOR)])
+    fig.update_layout(
+        title=title,
+        xaxis_title=xaxis_title,
+        yaxis_title="Number of Actions",
+        template=CHART_TEMPLATE
+    )
+    return fig
+
+def _polar_figure(counts):
+    import plotly.graph_objs as go
+    fig = go.Figure(go.Barpolar(
+        r=counts,
+        theta=HOUR_THETA,
+        width=[15]*24,
+        marker_color=counts,
+        marker_colorscale='Portland',  # A striking, dark colorscale
+        marker_line_color="white",
+        marker_line_width=1,
+        opacity=0.8
+    ))
+    fig.update_layout(
+        title="Aggregated Presidential Actions per Hour of Day",
+        polar=dict(
+            angularaxis=dict(
+                direction="clockwise",
+                tickmode="array",
+                tickvals=HOUR_THETA,
+                ticktext=[f"{h}:00" for h in HOURS],
+                period=360,
+                color='white'
+            ),
+            radialaxis=dict(
+                ticksuffix=" PA",
+                dtick=1,
+                color='white'
+            )
+        ),
+        showlegend=False,
+        template=CHART_TEMPLATE
+    )
+    return fig
+
+# Heatmap wording per row dimension (the columns are always the hours of the day).
+HEATMAP_TITLES = {
+    "weekday": ("Presidential Actions by Weekday and Hour", "Weekday"),
+    "theme": ("Presidential Actions by Theme and Hour", "Theme"),
+}
+
+def _heatmap_figure(rows, z, kind):
+    import plotly.graph_objs as go
+    title, yaxis_title = HEATMAP_TITLES[kind]
+    fig = go.Figure(data=[go.Heatmap(
+        x=[f"{h}:00" for h in HOURS],
+        y=rows,
+        z=z,
+        colorscale='Portland'
+    )])
+    fig.update_layout(
+        title=title,
+        xaxis_title="Hour of Day",
+        yaxis_title=yaxis_title,
+        template=CHART_TEMPLATE
+    )
+    return fig
+
+def _theme_figure(themes, counts):
+    import plotly.graph_objs as go
+    fig = go.Figure(data=[go.Bar(
+        x=counts,
+        y=themes,
+        orientation='h',
+        marker_color=THEME_BAR_COLOR
+    )])
+    fig.update_layout(
+        title="Presidential Actions by Theme",
+        xaxis_title="Count of Actions",
+        yaxis_title="Theme",
+        template=CHART_TEMPLATE
+    )
+    return fig
+
+# Reference figures with placeholder data; only their static parts are reused.
+_REFERENCE_FIGURES = {
+    "daily": lambda: _daily_figure(["2025-01-01"], [0]),
+    "daily-week": lambda: _daily_figure(["2025-01-01"], [0], "week"),
+    "daily-month": lambda: _daily_figure(["2025-01"], [0], "month"),
+    "daily-year": lambda: _daily_figure(["2025"], [0], "year"),
+    "polar": lambda: _polar_figure([0] * 24),
+    "theme": lambda: _theme_figure(["theme"], [0]),
+    "heatmap-weekday": lambda: _heatmap_figure(["row"], [[0] * 24], "weekday"),
+    "heatmap-theme": lambda: _heatmap_figure(["row"], [[0] * 24], "theme"),
+}
+
+@lru_cache(maxsize=None)
+def chart_skeleton(kind):
+    """
+    Return (trace dict, layout JSON bytes) for a chart kind, computed once per process
+    from the reference go.Figure. The trace dict still holds placeholder data arrays.
+    """
+    import plotly.io as pio
+    spec = json_codec.loads(pio.to_json(_REFERENCE_FIGURES[kind](), engine=json_codec.BACKEND))
+    return spec["data"][0], json_codec.dumps(spec["layout"], compact=True)
+
+def _spec_json(kind, **data):
+    """Fill the cached trace with new data arrays and stitch in the cached layout JSON."""
+    trace, layout_json = chart_skeleton(kind)
+    trace = {**trace, **data}
+    return (b'{"data":[' + json_codec.dumps(trace, compact=True) + b'],"layout":' + layout_json + b'}').decode("utf-8")
+
+def daily_chart_json(aggregated_data, resolution="day"):
+    """Bar chart JSON for [(date or bucket label, count), ...]; None when there is no data."""
+    if not aggregated_data:
+        return None
+    dates, counts = zip(*aggregated_data)
+    kind = "daily" if resolution == "day" else f"daily-{resolution}"
+    return _spec_json(kind, x=list(dates), y=list(counts))
+
+def polar_chart_json(hourly_counts):
+    """Polar (clock-like) bar chart JSON for {hour: count} over hours 0-23."""
+    counts = [hourly_counts[h] for h in HOURS]
+    trace, _ = chart_skeleton("polar")
+    return _spec_json("polar", r=counts, marker={**trace["marker"], "color": counts})
+
+def theme_chart_json(aggregated_theme_data):
+    """Horizontal bar chart JSON for [(theme, count), ...] sorted descending; None when empty."""
+    if not aggregated_theme_data:
+        return None
+    themes, counts = zip(*aggregated_theme_data)
+    # Reverse the order for horizontal bars (highest on top)
+    return _spec_json("theme", x=list(counts)[::-1], y=list(themes)[::-1])
+
+def heatmap_chart_json(kind, rows, z):
+    """Row x hour-of-day heatmap JSON ("weekday" or "theme" rows, z[row][hour]); None when empty."""
+    if not rows:
+        return None
+    return _spec_json(f"heatmap-{kind}", y=list(rows), z=[list(r) for r in z])
@@ -0,0 +1,199 @@
+# dashboard/cube.py
+"""
+Precomputed day x hour x theme count cube with slice / roll-up / drill-down queries.
+
+The dashboard's fixed views (per day, per hour of day, per theme) are each a roll-up of
+one cube of counts: a dense (days, 24, themes) int64 array. Any cross-cut, such as a
+theme's hour-of-day profile in a date range or weekday x hour, is answered by slicing
+and summing that array instead of scanning the records again.
+  - days: the days that have actions, sorted (the local date of each timestamp)
+  - hours: 0-23, the local hour of each timestamp
+  - themes: every theme of the record; records without themes count under NO_THEME
+Unparseable dates are left out of the cube (they have no day or hour).
+
+The cube is built once per data version: from the records of a data file
+(from_actions, which the pipeline's "publish" stage stores for the web workers), or
+from the rollup_cube table the ETL increments with every batch (from_session).
+The day axis can be rolled up to the levels in DAY_LEVELS.
+"""
+import io
+from bisect import bisect_left, bisect_right
+from datetime import date
+
+import numpy as np
+
+from dashboard.downsample import bucket_label
+
+NO_THEME = ""  # Theme key of actions without a theme.
+HOURS = list(range(24))
+WEEKDAY_NAMES = ["Monday", "Tuesday", "Wednesday", "Thursday", "Friday", "Saturday", "Sunday"]
+
+# Levels of the day axis: label function of an ISO day.
+DAY_LEVELS = {
+    "day": lambda day: day,
+    "week": lambda day: bucket_label(day, "week"),
+    "month": lambda day: day[:7],
+    "year": lambda day: day[:4],
+    "weekday": lambda day: date.fromisoformat(day).weekday(),
+}
+DIMENSIONS = ("hour", "theme") + tuple(DAY_LEVELS)
+
+class CountCube:
+    """Counts per (day, hour, theme), with the day and theme labels of each axis."""
+
+    def __init__(self, days, themes, counts):
+        self.days = list(days)
+        self.themes = list(themes)
+        self.counts = counts  # int64 array of shape (len(days), 24, len(themes))
+
+    @classmethod
+    def empty(cls):
+        return cls([], [], np.zeros((0, 24, 0), dtype=np.int64))
+
+    @classmethod
+    def from_cells(cls, cells):
+        """Build from {(ISO day, hour, theme): count}."""
+        if not cells:
+            return cls.empty()
+        days = sorted({day for day, _, _ in cells})
+        themes = sorted({theme for _, _, theme in cells})
+        day_index = {d: i for i, d in enumerate(days)}
+        theme_index = {t: i for i, t in enumerate(themes)}
+        counts = np.zeros((len(days), 24, len(themes)), dtype=np.int64)
+        for (day, hour, theme), count in cells.items():
+            counts[day_index[day], hour, theme_index[theme]] += count
+        return cls(days, themes, counts)
+
+    @classmethod
+    def from_actions(cls, actions):
+        """Build from records ({"date", "themes"}) with one vectorized date parse."""
+        from dashboard.timestamps import parse_iso_timestamps, day_labels
+        actions = list(actions)
+        parsed = parse_iso_timestamps(action.get("date") or "" for action in actions)
+        rows, theme_names = [], []
+        for i in np.flatnonzero(parsed.valid).tolist():
+            for theme in actions[i].get("themes") or [NO_THEME]:
+                rows.append(i)
+                theme_names.append(theme)
+        if not rows:
+            return cls.empty()
+        local = parsed.local[rows]
+        day_numbers, day_of_row = np.unique(local // 86400, return_inverse=True)
+        themes, theme_of_row = np.unique(np.array(theme_names, dtype=object), return_inverse=True)
+        cell = (day_of_row * 24 + (local % 86400) // 3600) * len(themes) + theme_of_row
+        counts = np.bincount(cell, minlength=len(day_numbers) * 24 * len(themes))
+        return cls(day_labels(day_numbers).tolist(), themes.tolist(),
+                   counts.reshape(len(day_numbers), 24, len(themes)).astype(np.int64))
+
+    @classmethod
+    def from_session(cls, session):
+        """Build from the rollup_cube table maintained by the ETL."""
+        from dashboard.models import CubeCount
+        return cls.from_cells({(r.day, r.hour, r.theme): r.count for r in session.query(CubeCount)})
+
+    def to_bytes(self):
+        """Serialize as an .npz archive (for the aggregate store)."""
+        buffer = io.BytesIO()
+        np.savez(buffer, days=np.array(self.days, dtype=str), themes=np.array(self.themes, dtype=str),
+                 counts=self.counts)
+        return buffer.getvalue()
+
+    @classmethod
+    def from_bytes(cls, data):
+        with np.load(io.BytesIO(data), allow_pickle=False) as archive:
+            return cls(archive["days"].tolist(), archive["themes"].tolist(), archive["counts"])
+
+    def combine(self, other, sign=1):
+        """
+        A new cube with other's counts added (sign=1) or subtracted (sign=-1), over the
+        union of both cubes' days and themes. Days and themes left without counts are dropped.
+        """
+        days = sorted(set(self.days) | set(other.days))
+        themes = sorted(set(self.themes) | set(other.themes))
+        counts = np.zeros((len(days), 24, len(themes)), dtype=np.int64)
+        for cube, factor in ((self, 1), (other, sign)):
+            if cube.counts.size:
+                rows = np.searchsorted(days, cube.days)
+                columns = np.searchsorted(themes, cube.themes)
+                counts[np.ix_(rows, np.arange(24), columns)] += factor * cube.counts
+        kept_days = np.flatnonzero(counts.any(axis=(1, 2)))
+        kept_themes = np.flatnonzero(counts.any(axis=(0, 1)))
+        counts = counts[np.ix_(kept_days, np.arange(24), kept_themes)]
+        return CountCube([days[i] for i in kept_days], [themes[i] for i in kept_themes], counts)
+
+    @property
+    def total(self):
+        """Number of counted (record, theme) pairs."""
+        return int(self.counts.sum())
+
+    def slice(self, start=None, end=None, themes=None, hours=None):
+        """
+        Sub-cube for the inclusive ISO date range, the given themes and hours (None keeps
+        the whole axis). Themes not in the cube are ignored.
+        """
+        lo = bisect_left(self.days, start) if start else 0
+        hi = bisect_right(self.days, end) if end else len(self.days)
+        counts = self.counts[lo:hi]
+        kept_themes = self.themes
+        if themes is not None:
+            wanted = set(themes)
+            positions = [i for i, t in enumerate(self.themes) if t in wanted]
+            counts = counts[:, :, positions]
+            kept_themes = [self.themes[i] for i in positions]
+        if hours is not None:
+            mask = np.zeros(24, dtype=bool)
+            mask[list(hours)] = True
+            counts = counts * mask[None, :, None]
+        return CountCube(self.days[lo:hi], kept_themes, counts)
+
+    def rollup(self, *by):
+        """
+        Sum over every dimension not in by. Returns ([labels of each dimension in by],
+        counts array with one axis per dimension, in that order).
+        by takes at most one day level (see DAY_LEVELS) plus "hour" and/or "theme".
+        """
+        unknown = [d for d in by if d not in DIMENSIONS]
+        day_level = [d for d in by if d in DAY_LEVELS]
+        if unknown or len(day_level) > 1 or len(set(by)) != len(by):
+            raise ValueError(f"Cannot roll up by {', '.join(by)}; dimensions: {', '.join(DIMENSIONS)} "
+                             "(at most one day level).")
+        counts, axes = self.counts, {"hour": HOURS, "theme": self.themes}
+        if day_level:
+            level = day_level[0]
+            labels, grouped = self._group_days(level)
+            counts, axes[level] = grouped, labels
+        else:
+            counts = counts.sum(axis=0, keepdims=True)
+            level = None
+        order = [level, "hour", "theme"]
+        present = [d for d in order if d in by]
+        summed = tuple(i for i, d in enumerate(order) if d not in by)
+        values = counts.sum(axis=summed) if summed else counts
+        values = np.transpose(values, [present.index(d) for d in by])
+        return [list(axes[d]) for d in by], values
+
+    def _group_days(self, level):
+        """(labels, counts) with the day axis summed into the buckets of a day level."""
+        if level == "day":
+            return self.days, self.counts
+        keys = [DAY_LEVELS[level](day) for day in self.days]
+        labels = list(range(7)) if level == "weekday" else sorted(set(keys))
+        index = {label: i for i, label in enumerate(labels)}
+        grouped = np.zeros((len(labels),) + self.counts.shape[1:], dtype=np.int64)
+        np.add.at(grouped, [index[k] for k in keys], self.counts)
+        return labels, grouped
+
+    def drill_down(self, level, label, *by):
+        """Roll up the days inside one bucket of a day level (e.g. month "2025-02") by the given dimensions."""
+        positions = [i for i, day in enumerate(self.days) if DAY_LEVELS[level](day) == label]
+        sub = CountCube([self.days[i] for i in positions], self.themes, self.counts[positions])
+        return sub.rollup(*by)
+
+    def cells(self, *by):
+        """{label or tuple of labels: count} of the non-zero cells of rollup(*by)."""
+        axes, values = self.rollup(*by)
+        result = {}
+        for position in zip(*np.nonzero(values)):
+            labels = tuple(axes[d][i] for d, i in enumerate(position))
+            result[labels if len(labels) > 1 else labels[0]] = int(values[position])
+        return result
@@ -0,0 +1,115 @@
+# dashboard/downsample.py
+"""
+Resolution-aware bucketing and downsampling for long time series.
+
+Daily counts over a multi-year archive are rolled up to weeks, months or years so a chart
+never ships more than a point budget to the browser: the finest of day/week/month/year
+whose bucket count for the requested range fits the budget is used (years when none does,
+as there is no coarser level). DailyLevels precomputes all four levels once per data version, and serves any date range by bisecting into the chosen
+level. For line views of dense series (e.g. the hourly timeline), lttb() keeps the visual
+shape with a fixed number of points.
+Reference:
+  - Steinarsson, "Downsampling Time Series for Visual Representation" (LTTB), 2013.
+"""
+from bisect import bisect_left, bisect_right
+from collections import Counter
+from datetime import date, timedelta
+
+RESOLUTIONS = ("day", "week", "month", "year")
+DEFAULT_POINT_BUDGET = 1000
+
+def bucket_label(day, resolution):
+    """Label of the bucket containing an ISO date: the day, its week's Monday, YYYY-MM or YYYY."""
+    if resolution == "day":
+        return day
+    if resolution == "week":
+        d = date.fromisoformat(day)
+        return (d - timedelta(days=d.weekday())).isoformat()
+    if resolution == "month":
+        return day[:7]
+    return day[:4]
+
+def bucket_counts(daily_counts, resolution):
+    """Roll sorted [(YYYY-MM-DD, count)] up to [(bucket label, count)], sorted."""
+    if resolution == "day":
+        return list(daily_counts)
+    counts = Counter()
+    for day, count in daily_counts:
+        counts[bucket_label(day, resolution)] += count
+    return sorted(counts.items())
+
+def choose_resolution(start, end, max_points=DEFAULT_POINT_BUDGET):
+    """
+    Finest resolution whose number of buckets between two ISO dates fits max_points
+    ("year", the coarsest, if none does).
+    """
+    first, last = date.fromisoformat(start), date.fromisoformat(end)
+    span_days = (last - first).days + 1
+    if span_days <= max_points:
+        return "day"
+    if span_days / 7 <= max_points:
+        return "week"
+    if (last.year - first.year) * 12 + last.month - first.month + 1 <= max_points:
+        return "month"
+    return "year"
+
+class DailyLevels:
+    """Day, week, month and year series for one set of daily counts, precomputed once."""
+
+    def __init__(self, daily_counts):
+        self.levels = {r: bucket_counts(daily_counts, r) for r in RESOLUTIONS}
+        self._labels = {r: [label for label, _ in series] for r, series in self.levels.items()}
+        days = self._labels["day"]
+        self.first_day = days[0] if days else None
+        self.last_day = days[-1] if days else None
+
+    def series(self, start=None, end=None, max_points=DEFAULT_POINT_BUDGET, resolution=None):
+        """
+        Return (resolution, [(label, count)]) for the inclusive date range, choosing the
+        resolution from the range and point budget unless one is given.
+        """
+        if self.first_day is None:
+            return resolution or "day", []
+        start = max(start or self.first_day, self.first_day)
+        end = min(end or self.last_day, self.last_day)
+        if start > end:
+            return resolution or "day", []
+        resolution = resolution or choose_resolution(start, end, max_points)
+        labels = self._labels[resolution]
+        lo = bisect_left(labels, bucket_label(start, resolution))
+        hi = bisect_right(labels, bucket_label(end, resolution))
+        return resolution, self.levels[resolution][lo:hi]
+
+def lttb(points, threshold):
+    """
+    Largest-Triangle-Three-Buckets downsampling of [(x, y)] with numeric x, sorted by x.
+    Always keeps the first and last point; returns the input if it is already small enough.
+    """
+    n = len(points)
+    if threshold >= n or threshold < 3:
+        return list(points)
+
+    sampled = [points[0]]
+    bucket_size = (n - 2) / (threshold - 2)
+    a = 0  # Index of the previously selected point.
+    for i in range(threshold - 2):
+        # Average of the next bucket, the third corner of the triangle.
+        next_start = int((i + 1) * bucket_size) + 1
+        next_end = min(int((i + 2) * bucket_size) + 1, n)
+        next_bucket = points[next_start:next_end] or [points[-1]]
+        avg_x = sum(p[0] for p in next_bucket) / len(next_bucket)
+        avg_y = sum(p[1] for p in next_bucket) / len(next_bucket)
+
+        start = int(i * bucket_size) + 1
+        end = int((i + 1) * bucket_size) + 1
+        ax, ay = points[a]
+        best, best_area = start, -1.0
+        for j in range(start, end):
+            x, y = points[j]
+            area = abs((ax - avg_x) * (y - ay) - (ax - x) * (avg_y - ay))
+            if area > best_area:
+                best, best_area = j, area
+        sampled.append(points[best])
+        a = best
+    sampled.append(points[-1])
+    return sampled
@@ -0,0 +1,115 @@
+# dashboard/events.py
+"""
+Server-Sent Events broadcasting for open dashboards.
+
+When the ETL commits a batch in this process, the inserted actions are turned into
+aggregate deltas (per day, hour of day and theme increments, counted by the same
+aggregate() as the charts, so a multi-theme action counts once per theme) and pushed to
+every connected /events stream. Browsers patch their charts in place instead of polling
+or reloading.
+Each subscriber has a bounded queue; a client that stops reading is dropped rather than
+letting its backlog grow without bound. Every open stream holds a server thread, so a
+broker accepts at most max_subscribers streams.
+Reference:
+  - Server-sent events: https://html.spec.whatwg.org/multipage/server-sent-events.html
+"""
+import queue
+import threading
+import logging
+
+from dashboard import json_codec
+
+logger = logging.getLogger(__name__)
+
+# Seconds between keep-alive comments (also how often streams re-check the data version).
+HEARTBEAT_SECONDS = 15
+SUBSCRIBER_QUEUE_SIZE = 100
+
+class EventBroker:
+    """Fans published events out to all subscribed queues."""
+
+    def __init__(self, queue_size=SUBSCRIBER_QUEUE_SIZE, max_subscribers=None):
+        self._queue_size = queue_size
+        self._max_subscribers = max_subscribers
+        self._subscribers = set()
+        self._lock = threading.Lock()
+
+    def subscribe(self):
+        """A new subscriber queue, or None if max_subscribers are already subscribed."""
+        q = queue.Queue(maxsize=self._queue_size)
+        with self._lock:
+            if self._max_subscribers is not None and len(self._subscribers) >= self._max_subscribers:
+                return None
+            self._subscribers.add(q)
+        return q
+
+    def unsubscribe(self, q):
+        with self._lock:
+            self._subscribers.discard(q)
+
+    @property
+    def subscriber_count(self):
+        with self._lock:
+            return len(self._subscribers)
+
+    def publish(self, event, data):
+        """Queue an event for every subscriber, dropping subscribers whose queue is full."""
+        message = (event, data)
+        with self._lock:
+            subscribers = list(self._subscribers)
+        for q in subscribers:
+            try:
+                q.put_nowait(message)
+            except queue.Full:
+                logger.warning("Dropping slow SSE subscriber")
+                self.unsubscribe(q)
+
+def deltas_from_actions(actions):
+    """Aggregate increments for newly inserted actions, keyed for JSON."""
+    from dashboard.aggregation import aggregate
+    from dashboard.downsample import RESOLUTIONS, bucket_counts
+    counts = aggregate([{"date": action.action_timestamp.isoformat(), "themes": action.theme_list}
+                        for action in actions])
+    daily = counts.daily()
+    return {
+        "total": counts.total,
+        "daily": dict(daily),
+        # The same increments per week/month/year bucket, for daily charts rolled up to one.
+        "daily_rollups": {r: dict(bucket_counts(daily, r)) for r in RESOLUTIONS if r != "day"},
+        "hourly": {str(hour): count for hour, count in counts.hours_of_day.items()},
+        "themes": dict(counts.themes),
+    }
+
+def format_sse(event, data):
+    """Encode one event in the text/event-stream wire format."""
+    return f"event: {event}\ndata: {json_codec.dumps(data, compact=True).decode('utf-8')}\n\n"
+
+def stream_events(broker, data_version=None, heartbeat=HEARTBEAT_SECONDS, subscription=None):
+    """
+    Generator for one client's /events stream. Yields SSE-encoded strings.
+    data_version, if given, is polled on each heartbeat; when it changes without a delta
+    having been delivered (e.g. the pipeline ran in another process), a "refresh" event
+    tells the client to reload its data. subscription is a queue already subscribed to
+    broker (default: subscribe when the stream starts).
+    """
+    q = subscription if subscription is not None else broker.subscribe()
+    version = data_version() if data_version else None
+    try:
+        yield f"retry: {heartbeat * 1000}\n\n"
+        while True:
+            try:
+                event, data = q.get(timeout=heartbeat)
+            except queue.Empty:
+                if data_version:
+                    current = data_version()
+                    if current != version:
+                        version = current
+                        yield format_sse("refresh", {"version": str(current)})
+                        continue
+                yield ": keep-alive\n\n"
+                continue
+            if data_version:
+                version = data_version()  # The delta already covers this change.
+            yield format_sse(event, data)
+    finally:
+        broker.unsubscribe(q)
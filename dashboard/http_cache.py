@@ -0,0 +1,104 @@
+# dashboard/http_cache.py
+"""
+HTTP caching helpers for the JSON API: strong ETags derived from the data version,
+If-None-Match / 304 handling, and gzip / Brotli response compression.
+Brotli is used only when the optional `brotli` package is installed.
+References:
+  - RFC 9110 conditional requests: https://www.rfc-editor.org/rfc/rfc9110#name-conditional-requests
+  - Flask Response: https://flask.palletsprojects.com/en/2.2.x/api/#flask.Response
+"""
+import gzip
+import hashlib
+import threading
+from collections import OrderedDict
+from flask import Response, request
+
+try:
+    import brotli
+except ImportError:  # Optional dependency.
+    brotli = None
+
+# Responses smaller than this are sent uncompressed; the headers would eat the savings.
+MIN_COMPRESS_SIZE = 512
+
+_compressed = OrderedDict()  # (etag, encoding) -> compressed body, LRU order.
+_compressed_lock = threading.Lock()
+_COMPRESSED_MAX_ENTRIES = 256
+
+def make_etag(*parts):
+    """Strong ETag (quoted) from the data version and anything else that shapes the body."""
+    digest = hashlib.sha256("\x1f".join(str(p) for p in parts).encode("utf-8")).hexdigest()
+    return f'"{digest[:32]}"'
+
+def negotiate_encoding(accept_encoding):
+    """Pick the best supported content coding from an Accept-Encoding header."""
+    offered = {}
+    for item in (accept_encoding or "").split(","):
+        coding, _, params = item.strip().partition(";")
+        q = 1.0
+        if params.strip().startswith("q="):
+            try:
+                q = float(params.strip()[2:])
+            except ValueError:
+                q = 0.0
+        if coding:
+            offered[coding.lower()] = q
+    if brotli is not None and offered.get("br", 0) > 0:
+        return "br"
+    if offered.get("gzip", 0) > 0:
+        return "gzip"
+    return None
+
+def compress(body, encoding):
+    """Compress body with the given content coding."""
+    if encoding == "br":
+        return brotli.compress(body, quality=5)
+    if encoding == "gzip":
+        return gzip.compress(body, compresslevel=6)
+    return body
+
+def _compressed_body(etag, encoding, body):
+    """Compress once per (etag, encoding); identical ETags always have identical bodies."""
+    key = (etag, encoding)
+    with _compressed_lock:
+        if key in _compressed:
+            _compressed.move_to_end(key)
+            return _compressed[key]
+    data = compress(body, encoding)
+    with _compressed_lock:
+        _compressed[key] = data
+        while len(_compressed) > _COMPRESSED_MAX_ENTRIES:
+            _compressed.popitem(last=False)
+    return data
+
+def _etag_matches(if_none_match, etag):
+    if not if_none_match:
+        return False
+    if if_none_match.strip() == "*":
+        return True
+    return etag in (tag.strip() for tag in if_none_match.split(","))
+
+def cached_json_response(etag, build_body):
+    """
+    Build a JSON response for the current request.
+    Returns 304 without calling build_body() when If-None-Match matches the ETag;
+    otherwise calls build_body() for the raw JSON bytes and compresses them if the
+    client accepts gzip or br. Each coding gets its own strong ETag.
+    """
+    encoding = negotiate_encoding(request.headers.get("Accept-Encoding"))
+    headers = {"Vary": "Accept-Encoding", "Cache-Control": "no-cache"}
+    # Compressed variants need distinct strong validators; try both so a cached
+    # identity response can also be revalidated by a client that now accepts gzip.
+    candidates = [etag] + ([etag[:-1] + f'-{encoding}"'] if encoding else [])
+    for candidate in candidates:
+        if _etag_matches(request.headers.get("If-None-Match"), candidate):
+            return Response(status=304, headers={**headers, "ETag": candidate})
+
+    body = build_body()
+    if encoding and len(body) >= MIN_COMPRESS_SIZE:
+        body = _compressed_body(etag, encoding, body)
+        headers["Content-Encoding"] = encoding
+        headers["ETag"] = candidates[-1]
+    else:
+        headers["ETag"] = etag
+    return Response(body, status=200, mimetype="application/json", headers=headers)
@@ -0,0 +1,80 @@
+# dashboard/jobs.py
+"""
+Background refresh job for the dashboard.
+
+/refresh starts the scrape -> theme -> QA -> load pipeline on a worker thread and returns
+immediately. The job is single-flight: starting it while it is running just returns the
+running job, so repeated clicks join the same refresh. status() reports the overall state,
+per-stage status and timings, and the outcome of the last run.
+"""
+import threading
+import logging
+from datetime import datetime
+
+logger = logging.getLogger(__name__)
+
+class RefreshJob:
+    """Runs a pipeline function in the background, at most one run at a time."""
+
+    def __init__(self, pipeline, stages):
+        self._pipeline = pipeline  # Called as pipeline(on_stage=callback).
+        self._stage_names = list(stages)
+        self._lock = threading.Lock()
+        self._thread = None
+        self._status = {"state": "idle", "run": 0, "stages": [], "started": None,
+                        "finished": None, "error": None}
+
+    def start(self):
+        """
+        Start a refresh unless one is already running.
+        Returns (started, status): started is False when joining a running job.
+        """
+        with self._lock:
+            if self._thread is not None and self._thread.is_alive():
+                return False, self._snapshot()
+            self._status = {
+                "state": "running",
+                "run": self._status["run"] + 1,
+                "stages": [{"name": name, "status": "pending", "seconds": None, "detail": None}
+                           for name in self._stage_names],
+                "started": datetime.now().isoformat(timespec="seconds"),
+                "finished": None,
+                "error": None,
+            }
+            self._thread = threading.Thread(target=self._run, name="refresh-job", daemon=True)
+            self._thread.start()
+            return True, self._snapshot()
+
+    def status(self):
+        """Return a copy of the current (or last) run's status."""
+        with self._lock:
+            return self._snapshot()
+
+    def wait(self, timeout=None):
+        """Block until the running job (if any) finishes. Mainly for tests and scripts."""
+        thread = self._thread
+        if thread is not None:
+            thread.join(timeout)
+
+    def _snapshot(self):
+        status = dict(self._status)
+        status["stages"] = [dict(stage) for stage in self._status["stages"]]
+        return status
+
+    def _on_stage(self, name, status, seconds, detail):
+        with self._lock:
+            for stage in self._status["stages"]:
+                if stage["name"] == name:
+                    stage.update(status=status, seconds=None if seconds is None else round(seconds, 3),
+                                 detail=detail)
+
+    def _run(self):
+        try:
+            self._pipeline(on_stage=self._on_stage)
+            outcome, error = "succeeded", None
+        except Exception as e:
+            logger.exception("Background refresh failed")
+            outcome, error = "failed", str(e)
+        with self._lock:
+            self._status.update(state=outcome, error=error,
+                                finished=datetime.now().isoformat(timespec="seconds"))
@@ -0,0 +1,67 @@
+# dashboard/json_codec.py
+"""
+The one JSON codec behind every file and HTTP body the pipeline and dashboard read or write.
+
+Uses orjson (a native encoder/decoder, several times faster than the json module on
+snapshot-sized arrays) when it is installed and falls back to the json module otherwise.
+Everything is bytes: loads() parses bytes as they come off disk or the socket, dumps()
+returns UTF-8 bytes, and load()/dump() use binary files, so no str copy of a snapshot is
+made on the orjson path.
+Output is indented by 2 spaces, as the stage scripts always wrote it, or has no
+whitespace at all with compact=True (for files and bodies only machines read). Both
+backends write the same bytes for strings, ints, lists and dicts: non-ASCII characters
+as UTF-8, not \\u escapes; int dict keys as strings; NumPy arrays as lists. Floats are
+the exception: each backend writes the shortest form that reads back as the same value,
+but in its own notation (orjson 1e20 and 0.00001, json 1e+20 and 1e-05), and orjson
+writes NaN and infinities as null. Pipeline snapshots hold no floats, so their manifest
+digests (which the stage cache compares) do not depend on the backend.
+Hashes that must stay stable across versions (segment_store.record_hash,
+stage_cache.stage_key) keep their own canonical json.dumps calls.
+
+Reference: orjson - https://github.com/ijl/orjson
+"""
+import json
+
+try:
+    import orjson
+except ImportError:  # Optional: the json module gives the same output (floats aside), only slower.
+    orjson = None
+
+BACKEND = "json" if orjson is None else "orjson"
+
+# orjson.JSONDecodeError subclasses it, so callers catch the same error on both backends.
+JSONDecodeError = json.JSONDecodeError
+
+def _default(obj):
+    """NumPy arrays and scalars for the json backend (orjson serializes them natively)."""
+    if hasattr(obj, "tolist"):
+        return obj.tolist()
+    raise TypeError(f"Object of type {type(obj).__name__} is not JSON serializable")
+
+def loads(data):
+    """Parse JSON from bytes (or str)."""
+    if orjson is not None:
+        return orjson.loads(data)
+    return json.loads(data)
+
+def dumps(obj, compact=False):
+    """Serialize obj to UTF-8 JSON bytes, indented by 2 spaces unless compact."""
+    if orjson is not None:
+        option = orjson.OPT_NON_STR_KEYS | orjson.OPT_SERIALIZE_NUMPY
+        if not compact:
+            option |= orjson.OPT_INDENT_2
+        return orjson.dumps(obj, default=_default, option=option)
+    if compact:
+        return json.dumps(obj, ensure_ascii=False, default=_default, separators=(",", ":")).encode("utf-8")
+    return json.dumps(obj, ensure_ascii=False, default=_default, indent=2).encode("utf-8")
+
+def load(path):
+    """Read and parse a JSON file."""
+    with open(path, "rb") as f:
+        return loads(f.read())
+
+def dump(obj, path, compact=False):
+    """Write obj to a JSON file (see dumps)."""
+    data = dumps(obj, compact)
+    with open(path, "wb") as f:
+        f.write(data)
@@ -0,0 +1,81 @@
+# dashboard/manifest.py
+"""
+Per-stage "current output" pointers for the data directory.
+
+Each pipeline stage publishes a small JSON pointer to data/manifests/<stage>.json after
+writing its output file, naming the file together with its SHA-256 checksum, record
+count and publish time. Readers resolve the latest file by reading one pointer instead of
+listing the data directory and stat-ing every historical snapshot. Pointers are replaced
+atomically (temp file + os.replace), so a reader never sees a partially written one.
+
+Stages: "raw" (scraper), "themed" (add_themes), "qa" (qa_data).
+"""
+import os
+import hashlib
+from datetime import datetime
+
+from dashboard import json_codec
+
+MANIFEST_DIR = "manifests"
+
+def _pointer_path(data_dir, stage):
+    return os.path.join(data_dir, MANIFEST_DIR, f"{stage}.json")
+
+def file_checksum(path):
+    """SHA-256 hex digest of a file, read in chunks."""
+    digest = hashlib.sha256()
+    with open(path, "rb") as f:
+        for chunk in iter(lambda: f.read(1 << 20), b""):
+            digest.update(chunk)
+    return digest.hexdigest()
+
+def publish(data_dir, stage, path, record_count):
+    """Atomically point the stage's manifest at path. Returns the manifest entry."""
+    entry = {
+        "stage": stage,
+        "file": os.path.basename(path),
+        "sha256": file_checksum(path),
+        "records": record_count,
+        "published": datetime.now().isoformat(timespec="microseconds"),
+    }
+    pointer = _pointer_path(data_dir, stage)
+    os.makedirs(os.path.dirname(pointer), exist_ok=True)
+    tmp_path = f"{pointer}.tmp"
+    json_codec.dump(entry, tmp_path)
+    os.replace(tmp_path, pointer)
+    return entry
+
+def read_manifest(data_dir, stage):
+    """Return the stage's manifest entry, or None if the stage never published."""
+    try:
+        return json_codec.load(_pointer_path(data_dir, stage))
+    except (FileNotFoundError, json_codec.JSONDecodeError):
+        return None
+
+def published_files(data_dir):
+    """Names of the files the stages' manifests currently point at."""
+    directory = os.path.join(data_dir, MANIFEST_DIR)
+    if not os.path.isdir(directory):
+        return set()
+    stages = [name[:-len(".json")] for name in os.listdir(directory) if name.endswith(".json")]
+    return {entry["file"] for entry in (read_manifest(data_dir, stage) for stage in stages) if entry}
+
+def resolve_latest(data_dir, *stages):
+    """
+    Return the path of the most recently published output among the given stages,
+    or None if none of them has a manifest pointing at an existing file.
+    """
+    entries = [e for e in (read_manifest(data_dir, stage) for stage in stages) if e]
+    entries = [e for e in entries if os.path.exists(os.path.join(data_dir, e["file"]))]
+    if not entries:
+        return None
+    latest = max(entries, key=lambda e: e["published"])
+    return os.path.join(data_dir, latest["file"])
+
+def verify(data_dir, stage):
+    """Return True if the stage's published file still matches its recorded checksum."""
+    entry = read_manifest(data_dir, stage)
+    if entry is None:
+        return False
+    path = os.path.join(data_dir, entry["file"])
+    return os.path.exists(path) and file_checksum(path) == entry["sha256"]
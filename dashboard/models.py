@@ -4,17 +4,53 @@ This module defines the PresidentialAction model.
 Changes:
   - Replaced action_date with action_timestamp (a DateTime field) to store full datetime info.
   - Added a new nullable 'theme' column for breakdown by theme.
+  - Added rollup tables (daily, hourly, theme, day x theme counts) maintained by the ETL.
+  - Added the day x hour x theme cube table (rollup_cube) behind dashboard/cube.py.
+  - Added a compact 64-bit 'hash_key' dedup column. It is the first 8 bytes of the same
+    SHA-256 digest stored in the legacy 'hash_value' hex column, so old rows can be
+    backfilled with hash_key_from_hex() and both keys agree.
+  - Added a nullable 'themes' column holding every theme of the action ('theme' stays the
+    first one), so aggregates count multi-theme actions the way the charts do.
 Reference:
   - SQLAlchemy Datetime: https://docs.sqlalchemy.org/en/14/core/type_basics.html#sqlalchemy.types.DateTime
   - SQLAlchemy UniqueConstraint: https://docs.sqlalchemy.org/en/14/core/constraints.html#sqlalchemy.schema.UniqueConstraint
 """
-from sqlalchemy import Column, Integer, String, DateTime, UniqueConstraint
+from sqlalchemy import Column, Integer, BigInteger, String, DateTime, JSON, UniqueConstraint
 from sqlalchemy.ext.declarative import declarative_base
 from datetime import datetime
 import hashlib
 
 Base = declarative_base()
 
+def compute_hash_keys(rows):
+    """
+    Compute dedup keys for a batch of (action_title, action_timestamp, source_url) rows
+    without constructing model instances. Timestamps may be datetimes or ISO strings.
+    Returns a list of signed 64-bit integers (the first 8 bytes of the SHA-256 digest).
+    """
+    sha256 = hashlib.sha256
+    from_bytes = int.from_bytes
+    fromisoformat = datetime.fromisoformat
+    keys = []
+    for action_title, action_timestamp, source_url in rows:
+        if isinstance(action_timestamp, str):
+            action_timestamp = fromisoformat(action_timestamp)
+        digest = sha256(f"{action_title}{action_timestamp}{source_url}".encode('utf-8')).digest()
+        keys.append(from_bytes(digest[:8], 'big', signed=True))
+    return keys
+
+def compute_hash_key(action_title, action_timestamp, source_url=None):
+    """Compute the dedup key for a single action (see compute_hash_keys)."""
+    return compute_hash_keys([(action_title, action_timestamp, source_url)])[0]
+
+def compute_hash_value(action_title, action_timestamp, source_url=None):
+    """The legacy 64-char hex hash_value of an action (hash_key is its first 8 bytes)."""
+    return hashlib.sha256(f"{action_title}{action_timestamp}{source_url}".encode('utf-8')).hexdigest()
+
+def hash_key_from_hex(hash_value):
+    """Convert a legacy 64-char hex hash_value into the equivalent hash_key."""
+    return int.from_bytes(bytes.fromhex(hash_value[:16]), 'big', signed=True)
+
 class PresidentialAction(Base):
     __tablename__ = 'presidential_actions'
     
@@ -23,11 +59,13 @@ class PresidentialAction(Base):
     action_timestamp = Column(DateTime, nullable=False)  # Changed from date to full datetime.
     source_url = Column(String, nullable=True)
     theme = Column(String, nullable=True)  # New field for theme breakdown.
-    hash_value = Column(String, unique=True, nullable=False)
+    themes = Column(JSON, nullable=True)  # Every theme (a list); theme is the first.
+    hash_value = Column(String, unique=True, nullable=True)  # Legacy hex digest (see etl.migrate_schema).
+    hash_key = Column(BigInteger, unique=True, nullable=True)  # Compact dedup key (see compute_hash_keys).
     
     __table_args__ = (UniqueConstraint('hash_value', name='_hash_uc'), )
     
-    def __init__(self, action_title, action_timestamp, source_url=None, theme=None):
+    def __init__(self, action_title, action_timestamp, source_url=None, theme=None, themes=None, hash_key=None):
         self.action_title = action_title
         # Accept both datetime objects and ISO format strings.
         if isinstance(action_timestamp, str):
@@ -36,6 +74,63 @@ class PresidentialAction(Base):
             self.action_timestamp = action_timestamp
         self.source_url = source_url
         self.theme = theme
-        # Compute a unique hash from key fields.
-        hash_input = f"{action_title}{self.action_timestamp}{source_url}".encode('utf-8')
-        self.hash_value = hashlib.sha256(hash_input).hexdigest()
+        self.themes = list(themes) if themes is not None else ([theme] if theme else [])
+        # Bulk loaders pass a precomputed key; otherwise hash the key fields here.
+        if hash_key is None:
+            hash_key = compute_hash_key(action_title, self.action_timestamp, source_url)
+        self.hash_key = hash_key
+
+    @property
+    def theme_list(self):
+        """Every theme of the action (rows from before the themes column only have theme)."""
+        if self.themes is not None:
+            return self.themes
+        return [self.theme] if self.theme else []
+
+    @property
+    def action_date(self):
+        """Date portion of action_timestamp (kept for callers that predate the timestamp column)."""
+        return self.action_timestamp.date() if self.action_timestamp else None
+
+
+# --- Rollup tables ---
+# One row per bucket, incremented by the ETL in the same transaction as the
+# inserted actions (see dashboard/rollups.py). Dashboard reads hit these
+# tables instead of grouping over presidential_actions.
+
+class DailyCount(Base):
+    __tablename__ = 'rollup_daily'
+
+    day = Column(String, primary_key=True)  # YYYY-MM-DD, same format as SQLite date().
+    count = Column(Integer, nullable=False, default=0)
+
+
+class HourlyCount(Base):
+    __tablename__ = 'rollup_hourly'
+
+    hour = Column(Integer, primary_key=True)  # 0-23
+    count = Column(Integer, nullable=False, default=0)
+
+
+class ThemeCount(Base):
+    __tablename__ = 'rollup_theme'
+
+    theme = Column(String, primary_key=True)
+    count = Column(Integer, nullable=False, default=0)
+
+
+class DayThemeCount(Base):
+    __tablename__ = 'rollup_day_theme'
+
+    day = Column(String, primary_key=True)
+    theme = Column(String, primary_key=True)
+    count = Column(Integer, nullable=False, default=0)
+
+
+class CubeCount(Base):
+    __tablename__ = 'rollup_cube'
+
+    day = Column(String, primary_key=True)
+    hour = Column(Integer, primary_key=True)  # 0-23
+    theme = Column(String, primary_key=True)  # '' for actions without a theme.
+    count = Column(Integer, nullable=False, default=0)
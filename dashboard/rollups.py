@@ -0,0 +1,87 @@
+# dashboard/rollups.py
+"""
+This module maintains the rollup tables (day, hour, theme and day x theme counts, plus
+the day x hour x theme cube that dashboard/cube.py queries).
+The ETL calls apply_rollups() with the actions it just added, before committing,
+so the rollups always move in the same transaction as the rows they count.
+rebuild_rollups() recomputes every table from presidential_actions with the same
+count_buckets(). Theme buckets count every theme of an action (models.theme_list), as the
+charts and the file-based cube (dashboard/cube.py) do; actions without a theme are
+counted in the day/hour rollups only, and in the cube under the '' theme.
+Reference:
+  - SQLAlchemy Session.no_autoflush: https://docs.sqlalchemy.org/en/14/orm/session_api.html#sqlalchemy.orm.Session.no_autoflush
+"""
+from collections import Counter
+from sqlalchemy import tuple_
+from dashboard.models import (
+    PresidentialAction, DailyCount, HourlyCount, ThemeCount, DayThemeCount, CubeCount
+)
+
+ROLLUP_MODELS = (DailyCount, HourlyCount, ThemeCount, DayThemeCount, CubeCount)
+
+def count_buckets(actions):
+    """
+    Count the new actions per rollup bucket.
+    Returns a dict mapping each rollup model to a Counter keyed by its primary key.
+    """
+    daily, hourly, themes, day_themes, cube = Counter(), Counter(), Counter(), Counter(), Counter()
+    for action in actions:
+        ts = action.action_timestamp
+        day = ts.strftime("%Y-%m-%d")
+        daily[day] += 1
+        hourly[ts.hour] += 1
+        action_themes = action.theme_list
+        for theme in action_themes or [""]:
+            cube[(day, ts.hour, theme)] += 1
+        for theme in action_themes:
+            themes[theme] += 1
+            day_themes[(day, theme)] += 1
+    return {DailyCount: daily, HourlyCount: hourly, ThemeCount: themes, DayThemeCount: day_themes,
+            CubeCount: cube}
+
+def _increment(session, model, counts):
+    """
+    Add each bucket's count to its row, creating rows for new buckets.
+    The existing rows are loaded up front with a few key IN (...) queries instead of one
+    autoflushing Session.get() per bucket.
+    """
+    key_names = [col.name for col in model.__table__.primary_key.columns]
+    key_columns = tuple_(*(getattr(model, name) for name in key_names))
+    keys = {key if isinstance(key, tuple) else (key,): count for key, count in counts.items()}
+    pending = list(keys)
+    step = 999 // len(key_names)  # Stay under SQLite's bound-parameter limit.
+    existing = {}
+    with session.no_autoflush:
+        for i in range(0, len(pending), step):
+            for row in session.query(model).filter(key_columns.in_(pending[i:i + step])):
+                existing[tuple(getattr(row, name) for name in key_names)] = row
+        for key, count in keys.items():
+            row = existing.get(key)
+            if row is None:
+                session.add(model(count=count, **dict(zip(key_names, key))))
+            else:
+                row.count += count
+
+def apply_rollups(session, actions):
+    """
+    Increment the rollup tables by the given (newly added) actions.
+    Does not commit; the caller commits together with the actions themselves.
+    """
+    session.flush()  # Rollup rows still pending from earlier calls must be visible below.
+    for model, counts in count_buckets(actions).items():
+        _increment(session, model, counts)
+
+def rebuild_rollups(session):
+    """Recompute all rollup tables from scratch and commit."""
+    try:
+        for model in ROLLUP_MODELS:
+            session.query(model).delete()
+        buckets = count_buckets(session.query(PresidentialAction).yield_per(5000))
+        for model, counts in buckets.items():
+            key_names = [col.name for col in model.__table__.primary_key.columns]
+            session.add_all(model(count=count, **dict(zip(key_names, key if isinstance(key, tuple) else (key,))))
+                            for key, count in counts.items())
+        session.commit()
+    except Exception:
+        session.rollback()
+        raise
@@ -0,0 +1,213 @@
+# dashboard/running_aggregates.py
+"""
+Persisted running aggregates, updated by deltas instead of recomputed.
+
+The publish stage used to re-aggregate the whole QA snapshot after every pipeline run,
+even when a handful of actions were new. RunningAggregates keeps the counters of
+dashboard/aggregation.py (day, hour of day, hour of week, clock hour, theme) and the
+cells of the day x hour x theme cube of dashboard/cube.py (one row per non-zero cell) in
+a small SQLite file, together with the content hash of every record counted. apply() adds
+and/or retracts records:
+  - an added record whose hash was already counted is skipped (no double counting)
+  - a retracted record is only subtracted if its hash was counted
+so the work per refresh scales with the delta, not the archive: every counter and cube
+cell is an UPSERT of the rows the delta touches. Each apply() is one
+transaction that also bumps the state's version; snapshot() reads counters and version
+in one read transaction, so readers never see half of a delta.
+Limitations: the UTC offset used to label the hourly timeline is that of the earliest
+hour ever added (retracting it does not change the labels), and records without a
+parseable date count in the day/theme buckets only, as in aggregate().
+Reference:
+  - SQLite UPSERT: https://www.sqlite.org/lang_upsert.html
+  - SQLite WAL mode: https://www.sqlite.org/wal.html
+"""
+import os
+import json
+import sqlite3
+import threading
+from contextlib import closing, contextmanager
+
+from dashboard.aggregation import Aggregates, aggregate
+from scripts.segment_store import record_hash
+
+STATE_FILENAME = "aggregate_state.db"
+
+# Aggregates counters kept in the state.
+BUCKETS = ("days", "hours_of_day", "hours_of_week", "hourly", "themes")
+CUBE_BUCKET = "cube"  # Cube cells, keyed by [day, hour, theme].
+
+def state_path(data_dir):
+    return os.path.join(data_dir, STATE_FILENAME)
+
+def _key(value):
+    return json.dumps(value, separators=(",", ":"))
+
+def _unkey(text):
+    value = json.loads(text)
+    return tuple(value) if isinstance(value, list) else value
+
+class AggregateSnapshot:
+    """One consistent version of the running aggregates."""
+
+    def __init__(self, version, counts, cube_cells):
+        self.version = version
+        self.counts = counts  # Aggregates (without per-record errors)
+        self.cube_cells = cube_cells  # {(day, hour, theme): count}
+
+    @property
+    def total(self):
+        return self.counts.total
+
+    def cube(self):
+        from dashboard.cube import CountCube
+        return CountCube.from_cells(self.cube_cells)
+
+    @property
+    def cube_bytes(self):
+        """CountCube.to_bytes() of the cube, or None if it is empty."""
+        return self.cube().to_bytes() if self.cube_cells else None
+
+class RunningAggregates:
+    """Delta-maintained aggregates persisted in a SQLite file (see module docstring)."""
+
+    def __init__(self, path):
+        self.path = path
+        self._lock = threading.Lock()
+        with self._connect() as conn:
+            conn.execute("PRAGMA journal_mode=WAL")
+            conn.execute("CREATE TABLE IF NOT EXISTS meta (name TEXT PRIMARY KEY, value TEXT NOT NULL)")
+            conn.execute("CREATE TABLE IF NOT EXISTS counts (bucket TEXT NOT NULL, key TEXT NOT NULL, "
+                         "count INTEGER NOT NULL, PRIMARY KEY (bucket, key))")
+            conn.execute("CREATE TABLE IF NOT EXISTS seen (key TEXT PRIMARY KEY)")
+            conn.execute("CREATE TABLE IF NOT EXISTS blobs (name TEXT PRIMARY KEY, value BLOB NOT NULL)")
+            self._migrate_cube_blob(conn)
+
+    @contextmanager
+    def _connect(self):
+        """A connection that commits (or rolls back) its transaction and is closed on exit."""
+        with closing(sqlite3.connect(self.path, timeout=30)) as conn, conn:
+            yield conn
+
+    @staticmethod
+    def _migrate_cube_blob(conn):
+        """Move a cube stored as one .npz blob (older state files) into per-cell rows."""
+        stored = conn.execute("SELECT value FROM blobs WHERE name = 'cube'").fetchone()
+        if stored:
+            from dashboard.cube import CountCube
+            cells = CountCube.from_bytes(stored[0]).cells("day", "hour", "theme")
+            conn.executemany("INSERT OR REPLACE INTO counts (bucket, key, count) VALUES (?, ?, ?)",
+                             [(CUBE_BUCKET, _key(cell), count) for cell, count in cells.items()])
+            conn.execute("DELETE FROM blobs WHERE name = 'cube'")
+
+    def _meta(self, conn):
+        meta = {"version": 0, "total": 0, "offset": None, "first_hour": None, "hourly_offset": None}
+        meta.update((name, json.loads(value)) for name, value in conn.execute("SELECT name, value FROM meta"))
+        return meta
+
+    @property
+    def version(self):
+        with self._connect() as conn:
+            return self._meta(conn)["version"]
+
+    @property
+    def offset(self):
+        """Source offset recorded by the last apply() (e.g. a segment-store cursor), or None."""
+        with self._connect() as conn:
+            return self._meta(conn)["offset"]
+
+    @property
+    def record_count(self):
+        """Number of distinct records currently counted."""
+        with self._connect() as conn:
+            return conn.execute("SELECT COUNT(*) FROM seen").fetchone()[0]
+
+    def contains(self, keys):
+        """The subset of the given record hashes that are counted."""
+        found = set()
+        with self._connect() as conn:
+            for i in range(0, len(keys), 500):  # Stay under SQLite's bound-parameter limit.
+                chunk = keys[i:i + 500]
+                found.update(k for (k,) in conn.execute(
+                    f"SELECT key FROM seen WHERE key IN ({','.join('?' * len(chunk))})", chunk))
+        return found
+
+    def apply(self, added=(), retracted=(), offset=None):
+        """
+        Add and retract records in one transaction and bump the version.
+        offset, if given, is stored with the delta (see .offset).
+        Returns (records added, records retracted), duplicates and unknown records excluded.
+        """
+        with self._lock, self._connect() as conn:
+            conn.execute("BEGIN IMMEDIATE")
+            new_records = self._claim(conn, added, insert=True)
+            gone_records = self._claim(conn, retracted, insert=False)
+            meta = self._meta(conn)
+            for records, sign in ((new_records, 1), (gone_records, -1)):
+                if records:
+                    self._add_counts(conn, meta, records, sign)
+            meta["version"] += 1
+            if offset is not None:
+                meta["offset"] = offset
+            conn.executemany("INSERT OR REPLACE INTO meta (name, value) VALUES (?, ?)",
+                             [(name, json.dumps(value)) for name, value in meta.items()])
+        return len(new_records), len(gone_records)
+
+    def rebuild(self, records, offset=None):
+        """Drop all state and count the records from scratch (one new version)."""
+        with self._lock, self._connect() as conn:
+            conn.execute("BEGIN IMMEDIATE")
+            version = self._meta(conn)["version"]
+            for table in ("meta", "counts", "seen", "blobs"):
+                conn.execute(f"DELETE FROM {table}")
+            conn.execute("INSERT INTO meta (name, value) VALUES ('version', ?)", (json.dumps(version),))
+        return self.apply(records, offset=offset)
+
+    def _claim(self, conn, records, insert):
+        """Records whose hash is new (insert=True) or counted (insert=False), updating the seen set."""
+        claimed = []
+        for record in records:
+            key = record_hash(record)
+            if insert:
+                changed = conn.execute("INSERT OR IGNORE INTO seen (key) VALUES (?)", (key,)).rowcount
+            else:
+                changed = conn.execute("DELETE FROM seen WHERE key = ?", (key,)).rowcount
+            if changed:
+                claimed.append(record)
+        return claimed
+
+    def _add_counts(self, conn, meta, records, sign):
+        from dashboard.cube import CountCube
+        counts = aggregate(records)
+        rows = [(name, _key(key), sign * count) for name in BUCKETS for key, count in getattr(counts, name).items()]
+        cells = CountCube.from_actions(records).cells("day", "hour", "theme")
+        rows.extend((CUBE_BUCKET, _key(cell), sign * count) for cell, count in cells.items())
+        conn.executemany("INSERT INTO counts (bucket, key, count) VALUES (?, ?, ?) "
+                         "ON CONFLICT (bucket, key) DO UPDATE SET count = count + excluded.count", rows)
+        if sign < 0:
+            conn.execute("DELETE FROM counts WHERE count <= 0")
+        meta["total"] += sign * counts.total
+        if sign > 0 and counts.hourly:
+            first_hour = min(counts.hourly)
+            if meta["first_hour"] is None or first_hour < meta["first_hour"]:
+                meta["first_hour"], meta["hourly_offset"] = first_hour, counts.hourly_offset
+
+    def snapshot(self, buckets=BUCKETS):
+        """
+        The current version's counters as an AggregateSnapshot. Buckets not listed (e.g.
+        the per-hour "hourly" timeline, which grows with the archive) are left empty.
+        """
+        with self._connect() as conn:
+            conn.execute("BEGIN")  # One read transaction: counters and version agree.
+            meta = self._meta(conn)
+            wanted = list(buckets) + [CUBE_BUCKET]
+            rows = conn.execute(f"SELECT bucket, key, count FROM counts WHERE bucket IN ({','.join('?' * len(wanted))})",
+                                wanted).fetchall()
+            conn.rollback()
+        counts = Aggregates()
+        counts.total = meta["total"]
+        counts.hourly_offset = meta["hourly_offset"]
+        cube_cells = {}
+        for bucket, key, count in rows:
+            target = cube_cells if bucket == CUBE_BUCKET else getattr(counts, bucket)
+            target[_unkey(key)] = count
+        return AggregateSnapshot(meta["version"], counts, cube_cells)
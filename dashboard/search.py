@@ -0,0 +1,125 @@
+# dashboard/search.py
+"""
+This module provides full-text search over action titles using an SQLite FTS5 index.
+The index is an external-content FTS5 table over presidential_actions.action_title,
+kept in sync by triggers, so every ETL insert/update/delete updates it in the same
+transaction. ensure_search_index() creates the table and triggers (and back-fills
+the index) on databases that predate it.
+References:
+  - SQLite FTS5: https://www.sqlite.org/fts5.html
+  - External content tables: https://www.sqlite.org/fts5.html#external_content_tables
+"""
+import html
+import logging
+import re
+from sqlalchemy import text
+from dashboard.business_logic import get_db_session
+
+logger = logging.getLogger(__name__)
+
+FTS_TABLE = "presidential_actions_fts"
+
+_CREATE_STATEMENTS = [
+    f"""CREATE VIRTUAL TABLE {FTS_TABLE} USING fts5(
+        action_title, content='presidential_actions', content_rowid='id'
+    )""",
+    f"""CREATE TRIGGER IF NOT EXISTS {FTS_TABLE}_ai AFTER INSERT ON presidential_actions BEGIN
+        INSERT INTO {FTS_TABLE}(rowid, action_title) VALUES (new.id, new.action_title);
+    END""",
+    f"""CREATE TRIGGER IF NOT EXISTS {FTS_TABLE}_ad AFTER DELETE ON presidential_actions BEGIN
+        INSERT INTO {FTS_TABLE}({FTS_TABLE}, rowid, action_title) VALUES ('delete', old.id, old.action_title);
+    END""",
+    f"""CREATE TRIGGER IF NOT EXISTS {FTS_TABLE}_au AFTER UPDATE OF action_title ON presidential_actions BEGIN
+        INSERT INTO {FTS_TABLE}({FTS_TABLE}, rowid, action_title) VALUES ('delete', old.id, old.action_title);
+        INSERT INTO {FTS_TABLE}(rowid, action_title) VALUES (new.id, new.action_title);
+    END""",
+    f"INSERT INTO {FTS_TABLE}({FTS_TABLE}) VALUES ('rebuild')",
+]
+
+# Snippet markers are control characters so the title can be HTML-escaped
+# before they are swapped for <mark> tags.
+_MARK_START, _MARK_END = "\x02", "\x03"
+
+_SEARCH_SQL = text(f"""
+    SELECT a.id, a.action_title, a.action_timestamp, a.source_url,
+           snippet({FTS_TABLE}, 0, '{_MARK_START}', '{_MARK_END}', '...', 16) AS snippet
+    FROM {FTS_TABLE}
+    JOIN presidential_actions a ON a.id = {FTS_TABLE}.rowid
+    WHERE {FTS_TABLE} MATCH :query
+    ORDER BY bm25({FTS_TABLE})
+    LIMIT :limit OFFSET :offset
+""")
+
+def ensure_search_index(engine):
+    """Create the FTS5 table and sync triggers if missing. Returns True if created."""
+    if engine.dialect.name != "sqlite":
+        return False
+    with engine.begin() as conn:
+        exists = conn.execute(
+            text("SELECT 1 FROM sqlite_master WHERE type = 'table' AND name = :name"),
+            {"name": FTS_TABLE}
+        ).first()
+        if exists:
+            return False
+        for statement in _CREATE_STATEMENTS:
+            conn.execute(text(statement))
+    logger.info("Created full-text index %s", FTS_TABLE)
+    return True
+
+def build_match_query(term):
+    """
+    Turn free-text user input into a safe FTS5 MATCH expression.
+    Every word is quoted (so FTS5 operators in the input are not interpreted)
+    and the last word is a prefix match, e.g. 'border sec' -> '"border" "sec"*'.
+    """
+    words = re.findall(r"\w+", term or "")
+    if not words:
+        return None
+    quoted = [f'"{w}"' for w in words]
+    quoted[-1] += "*"
+    return " ".join(quoted)
+
+def _highlight(snippet):
+    """HTML-escape a snippet and turn the FTS5 markers into <mark> tags."""
+    escaped = html.escape(snippet or "")
+    return escaped.replace(_MARK_START, "<mark>").replace(_MARK_END, "</mark>")
+
+def search_actions(term, page=1, per_page=20, session=None):
+    """
+    Search action titles, best matches first (BM25).
+    Returns a dict with 'results' (id, title, timestamp, source_url, snippet HTML),
+    'page', 'per_page' and 'has_next'.
+    """
+    page = max(int(page), 1)
+    per_page = min(max(int(per_page), 1), 100)
+    response = {"results": [], "page": page, "per_page": per_page, "has_next": False}
+    match = build_match_query(term)
+    if match is None:
+        return response
+
+    own_session = session is None
+    session = session or get_db_session()
+    try:
+        # Fetch one extra row to know whether there is a next page without a COUNT(*).
+        rows = session.execute(_SEARCH_SQL, {
+            "query": match, "limit": per_page + 1, "offset": (page - 1) * per_page
+        }).fetchall()
+    except Exception as e:
+        logger.error("Error searching actions for %r: %s", term, e)
+        return response
+    finally:
+        if own_session:
+            session.close()
+
+    response["has_next"] = len(rows) > per_page
+    response["results"] = [
+        {
+            "id": row.id,
+            "title": row.action_title,
+            "timestamp": str(row.action_timestamp),
+            "source_url": row.source_url,
+            "snippet": _highlight(row.snippet),
+        }
+        for row in rows[:per_page]
+    ]
+    return response
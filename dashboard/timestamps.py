@@ -0,0 +1,230 @@
+# dashboard/timestamps.py
+"""
+Vectorized ISO-8601 timestamp parsing and histogramming with NumPy.
+
+parse_iso_timestamps() converts a whole date column at once into int64 UTC epoch seconds
+plus the int32 UTC offset (seconds) each timestamp was written in, so local wall-clock
+fields (day, hour, weekday) stay exactly as datetime.fromisoformat reports them.
+Strings in the scraper's canonical form, "YYYY-MM-DDTHH:MM:SS+HH:MM", are decoded with
+array arithmetic on their code points; anything else (naive, "Z", fractional seconds,
+out-of-range fields) is handed to datetime.fromisoformat one by one, so results match the
+per-record parser exactly. Parse failures come back as a boolean mask, not printed.
+aggregate_columnar() fills the same Aggregates as dashboard.aggregation.aggregate().
+On 1M records this is 3.5-4x faster than the per-record path (benchmarks/bench_timestamps.py),
+not an order of magnitude: the column parse is about 0.4-0.5 s, and pulling the date
+and theme columns out of the dicts costs about as much as the parse itself.
+Reference:
+  - Days from civil: https://howardhinnant.github.io/date_algorithms.html#days_from_civil
+"""
+from datetime import datetime
+
+import numpy as np
+
+from dashboard.aggregation import Aggregates
+
+CANONICAL_LENGTH = 25  # "2025-02-09T17:08:57-05:00"
+_DIGITS = [0, 1, 2, 3, 5, 6, 8, 9, 11, 12, 14, 15, 17, 18, 20, 21, 23, 24]
+_SEPARATORS = {4: "-", 7: "-", 10: "T", 13: ":", 16: ":", 22: ":"}
+_DAYS_IN_MONTH = np.array([0, 31, 28, 31, 30, 31, 30, 31, 31, 30, 31, 30, 31])
+
+class ParsedTimestamps:
+    """
+    Column of parsed timestamps. For each input position: epoch (int64 UTC seconds,
+    sub-seconds dropped), offset (int32 seconds east of UTC), aware (False for naive
+    strings, whose epoch is their wall clock read as UTC), and the masks valid, failed
+    (a non-empty string that does not parse) and canonical (decoded by the fast path).
+    """
+
+    def __init__(self, n):
+        self.epoch = np.zeros(n, dtype=np.int64)
+        self.offset = np.zeros(n, dtype=np.int32)
+        self.aware = np.ones(n, dtype=bool)
+        self.valid = np.zeros(n, dtype=bool)
+        self.failed = np.zeros(n, dtype=bool)
+        self.canonical = np.zeros(n, dtype=bool)
+        self.errors = []  # (position, date string, exception) for failed entries
+
+    @property
+    def local(self):
+        """Wall-clock seconds in each timestamp's own offset."""
+        return self.epoch + self.offset
+
+def _days_from_civil(y, m, d):
+    y = y - (m <= 2)
+    era = y // 400
+    yoe = y - era * 400
+    doy = (153 * ((m + 9) % 12) + 2) // 5 + d - 1
+    doe = yoe * 365 + yoe // 4 - yoe // 100 + doy
+    return era * 146097 + doe - 719468
+
+def _parse_canonical(codes):
+    """
+    Decode rows of ASCII bytes (uint8, CANONICAL_LENGTH columns); returns (epoch, offset,
+    ok mask) arrays. The matrix is transposed once so every character position is a
+    contiguous array; field arithmetic is done in int32.
+    """
+    codes = np.ascontiguousarray(codes.T)
+    ok = np.ones(codes.shape[1], dtype=bool)
+    digit = {}
+    for pos in _DIGITS:
+        value = codes[pos] - np.uint8(ord("0"))  # Non-digits wrap around to >= 10.
+        ok &= value < 10
+        digit[pos] = value.astype(np.int32)
+    for pos, char in _SEPARATORS.items():
+        ok &= codes[pos] == ord(char)
+    sign_code = codes[19]
+    ok &= (sign_code == ord("+")) | (sign_code == ord("-"))
+
+    def field(pos, width):
+        value = digit[pos]
+        for j in range(1, width):
+            value = value * 10 + digit[pos + j]
+        return value
+
+    year, month, day = field(0, 4), field(5, 2), field(8, 2)
+    hour, minute, second = field(11, 2), field(14, 2), field(17, 2)
+    off_hour, off_minute = field(20, 2), field(23, 2)
+    leap = (year % 4 == 0) & ((year % 100 != 0) | (year % 400 == 0))
+    month_len = _DAYS_IN_MONTH[np.clip(month, 0, 12)] + (leap & (month == 2))
+    ok &= (year >= 1) & (month >= 1) & (month <= 12) & (day >= 1) & (day <= month_len)
+    ok &= (hour < 24) & (minute < 60) & (second < 60) & (off_hour < 24) & (off_minute < 60)
+
+    sign = np.where(sign_code == ord("-"), -1, 1).astype(np.int32)
+    offset = sign * (off_hour * 3600 + off_minute * 60)
+    seconds = hour * 3600 + minute * 60 + second - offset
+    return _days_from_civil(year, month, day).astype(np.int64) * 86400 + seconds, offset, ok
+
+def parse_iso_timestamps(dates):
+    """Parse a sequence of ISO date strings ("" for missing) into a ParsedTimestamps."""
+    dates = list(dates)
+    parsed = ParsedTimestamps(len(dates))
+    # One fixed-width byte array for the column; one extra byte makes longer strings
+    # (truncated by the dtype) still differ in length from the canonical form.
+    width = CANONICAL_LENGTH + 1
+    try:
+        column = np.array(dates, dtype=f"S{width}")
+        lengths = np.char.str_len(column)
+    except UnicodeEncodeError:
+        # Non-ASCII strings are never canonical: blank them out of the byte array and
+        # give them a length that routes them to the reference parser.
+        column = np.array([s if s.isascii() else "" for s in dates], dtype=f"S{width}")
+        lengths = np.char.str_len(column)
+        lengths[[i for i, s in enumerate(dates) if not s.isascii()]] = width
+    candidates = np.flatnonzero(lengths == CANONICAL_LENGTH)
+    fast_ok = np.zeros(len(dates), dtype=bool)
+    if len(candidates):
+        codes = column[candidates].view(np.uint8).reshape(-1, width)[:, :CANONICAL_LENGTH]
+        epoch, offset, ok = _parse_canonical(codes)
+        rows = candidates[ok]
+        parsed.epoch[rows] = epoch[ok]
+        parsed.offset[rows] = offset[ok]
+        fast_ok[rows] = True
+    parsed.canonical = fast_ok.copy()
+
+    # Everything else goes through the reference parser, one string at a time.
+    for i in np.flatnonzero(~fast_ok & (lengths > 0)):
+        dt_str = dates[i]
+        try:
+            dt = datetime.fromisoformat(dt_str)
+        except Exception as e:
+            parsed.failed[i] = True
+            parsed.errors.append((int(i), dt_str, e))
+            continue
+        utcoffset = dt.utcoffset()
+        wall = dt.replace(tzinfo=None, microsecond=0)
+        local = int((wall - datetime(1970, 1, 1)).total_seconds())
+        if utcoffset is None:
+            parsed.aware[i] = False
+            offset = 0
+        else:
+            offset = int(utcoffset.total_seconds())
+        parsed.epoch[i] = local - offset
+        parsed.offset[i] = offset
+        fast_ok[i] = True
+    parsed.valid = fast_ok
+    return parsed
+
+def day_labels(days):
+    """ISO date strings for an array of days since 1970-01-01."""
+    return np.asarray(days, dtype="datetime64[D]").astype(str)
+
+def count_values(values, step=1):
+    """
+    (unique values, counts) for an int64 array whose values are offset by multiples of
+    step. Uses np.bincount over the value range when it is compact, np.unique (a sort)
+    otherwise, e.g. when an outlier stretches the range.
+    """
+    if not len(values):
+        return values, np.zeros(0, dtype=np.int64)
+    lo = values.min()
+    scaled = (values - lo) // step
+    if scaled.max() <= 4 * len(values) + 1024:
+        counts = np.bincount(scaled)
+        present = np.flatnonzero(counts)
+        return present * step + lo, counts[present]
+    return np.unique(values, return_counts=True)
+
+def day_counts(days, dates, parsed):
+    """
+    Add the day counts of a parsed date column to the Counter days and return it. Day keys
+    are the text before "T" (unparseable dates included), as in aggregate(); for canonical
+    strings that text is exactly the local calendar date. dates needs the entries at the
+    non-canonical positions only.
+    """
+    values, counts = count_values(parsed.local[parsed.canonical] // 86400)
+    days.update(dict(zip(day_labels(values).tolist(), counts.tolist())))
+    for i in np.flatnonzero(~parsed.canonical):
+        dt_str = dates[i]
+        if dt_str:
+            days[dt_str.split("T")[0]] += 1
+    return days
+
+def fill_time_buckets(result, dates, parsed=None):
+    """
+    Fill the day, hour-of-day, hour-of-week and hourly counters of an Aggregates from a
+    date column ("" for missing dates), and record the parse failures on it.
+    With parsed (the column already parsed), dates only needs the entries at the
+    non-canonical positions (e.g. a dict, as ActionStore.dates() returns).
+    """
+    if parsed is None:
+        parsed = parse_iso_timestamps(dates)
+    result.failed = parsed.failed
+    result.errors = [(dt_str, e) for _, dt_str, e in parsed.errors]
+
+    day_counts(result.days, dates, parsed)
+
+    local = parsed.local[parsed.valid]
+    local_days = local // 86400
+    seconds_of_day = local - local_days * 86400
+    hours = seconds_of_day // 3600
+    weekdays = (local_days + 3) % 7  # 1970-01-01 was a Thursday (weekday 3).
+    result.hours_of_day.update({h: int(c) for h, c in enumerate(np.bincount(hours, minlength=24)) if c})
+    result.hours_of_week.update({s: int(c) for s, c in enumerate(np.bincount(weekdays * 24 + hours, minlength=168)) if c})
+
+    # Hour starts as UTC epoch seconds. Whole-quarter-hour offsets (all real ones) keep
+    # them on a 15-minute grid, which lets np.bincount do the counting.
+    rounded = parsed.epoch[parsed.valid] - (seconds_of_day % 3600)
+    if len(rounded):
+        step = 900 if not (rounded % 900).any() else 1
+        hour_starts, counts = count_values(rounded, step)
+        result.hourly.update(dict(zip(hour_starts.tolist(), counts.tolist())))
+        first = np.flatnonzero(parsed.valid)[np.argmax(rounded == hour_starts[0])]
+        result.hourly_offset = int(parsed.offset[first]) if parsed.aware[first] else None
+    return result
+
+def aggregate_columnar(actions):
+    """
+    NumPy version of dashboard.aggregation.aggregate(): one pass over the records to pull
+    out the date and theme columns, then histograms from np.bincount.
+    Returns an Aggregates with identical counters; failures are in .errors and .failed.
+    """
+    dates, themes = [], []
+    add_date, add_themes = dates.append, themes.extend
+    for action in actions:
+        get = action.get
+        add_date(get("date") or "")
+        add_themes(get("themes", []))
+    result = Aggregates()
+    result.total = len(dates)
+    result.themes.update(themes)
+    return fill_time_buckets(result, dates)
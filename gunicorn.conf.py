@@ -0,0 +1,35 @@
+# gunicorn.conf.py
+"""
+Gunicorn settings for the dashboard (loaded automatically from the working directory).
+
+The app is imported once in the master (preload_app) and the workers are forked from it,
+so module imports and the Plotly chart skeletons are shared copy-on-write instead of
+being rebuilt per worker. Aggregates come from data/aggregates.db, written once by the
+pipeline's "publish" stage, so workers do not each recompute them.
+Threaded workers keep long-lived /events (SSE) streams from tying up a whole process, but
+each open stream still holds one of the worker's threads for as long as the page is open.
+The app accepts at most DASHBOARD_MAX_EVENT_STREAMS (default 4) streams per worker, so
+keep DASHBOARD_THREADS well above it to leave threads for ordinary requests.
+Every setting can be overridden with the environment variables below.
+Reference:
+  - https://docs.gunicorn.org/en/stable/settings.html
+"""
+import os
+import multiprocessing
+
+bind = os.environ.get("DASHBOARD_BIND", "0.0.0.0:8000")
+workers = int(os.environ.get("WEB_CONCURRENCY", multiprocessing.cpu_count() * 2 + 1))
+worker_class = "gthread"
+threads = int(os.environ.get("DASHBOARD_THREADS", 8))
+preload_app = True
+timeout = 60
+graceful_timeout = 30
+keepalive = 5
+accesslog = os.environ.get("DASHBOARD_ACCESS_LOG", "-")
+errorlog = "-"
+
+def on_starting(server):
+    # Build the chart skeletons before forking so every worker inherits them.
+    from dashboard import charts
+    for kind in ("daily", "daily-week", "daily-month", "daily-year", "polar", "theme"):
+        charts.chart_skeleton(kind)
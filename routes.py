@@ -1,7 +1,6 @@
 from flask import Flask, render_template, redirect, url_for, flash
 import subprocess
-import plotly.graph_objs as go
-import plotly.io as pio
+from dashboard.aggregation import aggregate
 
 app = Flask(__name__)
 app.secret_key = "your_secret_key"  # For flashing messages
@@ -10,16 +9,14 @@ app.secret_key = "your_secret_key"  # For flashing messages
 
 def aggregate_by_day(actions):
     """Aggregate article counts per day."""
-    # Assuming each record has a 'date' key in ISO format; we extract the date portion.
-    dates = [action["date"].split("T")[0] for action in actions if action.get("date")]
-    counts = Counter(dates)
-    sorted_counts = sorted(counts.items())
-    return sorted_counts
+    return aggregate(actions).daily()
 
 def generate_chart(aggregated_data):
     """Generate a Plotly bar chart for aggregated data."""
     if not aggregated_data:
         return None
+    import plotly.graph_objs as go
+    import plotly.io as pio
     dates, counts = zip(*aggregated_data)
     fig = go.Figure(data=[go.Bar(x=dates, y=counts)])
     fig.update_layout(
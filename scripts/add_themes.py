@@ -1,7 +1,11 @@
 import os
-import json
+import sys
 from datetime import datetime
 
+sys.path.append(os.path.abspath(os.path.join(os.path.dirname(__file__), '..')))
+from scripts.segment_store import SegmentStore, prune_snapshots, SNAPSHOT_COMPACT
+from dashboard import manifest, json_codec
+
 def get_themes(title):
     """
     Analyze the title (case-insensitive) and return a list of matching themes.
@@ -65,41 +69,62 @@ def add_themes_to_data(raw_data):
         record["themes"] = get_themes(title)
     return raw_data
 
-def load_latest_json(data_dir, prefix="presidential_actions_", suffix=".json"):
+def load_latest_json(data_dir, prefix="presidential_actions_", suffix=".json", stage="raw"):
     """
     Locate the most recent JSON file in the given directory that matches the naming pattern.
+    Uses the stage's published manifest when there is one; otherwise falls back to
+    scanning the directory by modification time.
     Returns the loaded data and the filename.
     """
-    files = [f for f in os.listdir(data_dir) if f.startswith(prefix) and f.endswith(suffix)]
-    if not files:
-        raise FileNotFoundError("No matching data files found in the directory.")
-    # Sort files by modification time (latest first)
-    files.sort(key=lambda f: os.path.getmtime(os.path.join(data_dir, f)), reverse=True)
-    latest_file = os.path.join(data_dir, files[0])
-    with open(latest_file, "r") as f:
-        data = json.load(f)
-    return data, latest_file
+    latest_file = manifest.resolve_latest(data_dir, stage)
+    if latest_file is None:
+        files = [f for f in os.listdir(data_dir) if f.startswith(prefix) and f.endswith(suffix)]
+        if not files:
+            raise FileNotFoundError("No matching data files found in the directory.")
+        # Sort files by modification time (latest first)
+        files.sort(key=lambda f: os.path.getmtime(os.path.join(data_dir, f)), reverse=True)
+        latest_file = os.path.join(data_dir, files[0])
+    return json_codec.load(latest_file), latest_file
 
 def save_updated_data(data, data_dir):
     """
     Saves the updated data (with themes) into a new JSON file in the data directory,
-    using a timestamped filename.
+    using a timestamped filename, and publishes it as the "themed" stage's latest output.
     """
     timestamp = datetime.now().strftime("%Y%m%d_%H%M%S")
     new_filename = os.path.join(data_dir, f"presidential_actions_with_themes_{timestamp}.json")
-    with open(new_filename, "w") as f:
-        json.dump(data, f, indent=2)
+    json_codec.dump(data, new_filename, compact=SNAPSHOT_COMPACT)
+    manifest.publish(data_dir, "themed", new_filename, len(data))
     return new_filename
 
+def run(data_dir="data"):
+    """
+    Theme the latest raw data and save it as a new snapshot.
+    With a raw segment store, only records this stage has not processed yet are themed.
+    Returns (output_file, record_count); raises FileNotFoundError if there is no input.
+    """
+    raw_store = SegmentStore("raw", root=os.path.join(data_dir, "store"))
+    if raw_store.head is not None:
+        # Incremental path: only theme the raw records this stage has not processed yet.
+        themed_store = SegmentStore("themed", root=os.path.join(data_dir, "store"))
+        new_records, end_offset = raw_store.read_new("add_themes")
+        added = themed_store.append(add_themes_to_data(new_records))
+        raw_store.commit("add_themes", end_offset)
+        print(f"Themed {len(new_records)} new records ({added} appended to the themed stream).")
+        updated_data = themed_store.read_all()
+    else:
+        raw_data, latest_file = load_latest_json(data_dir)
+        print(f"Loaded data from {latest_file} ({len(raw_data)} records).")
+        updated_data = add_themes_to_data(raw_data)
+
+    output_file = save_updated_data(updated_data, data_dir)
+    prune_snapshots(data_dir, "presidential_actions_with_themes_")
+    return output_file, len(updated_data)
+
 if __name__ == "__main__":
-    DATA_DIR = "data"
     try:
-        raw_data, latest_file = load_latest_json(DATA_DIR)
-        print(f"Loaded data from {latest_file} ({len(raw_data)} records).")
+        output_file, _ = run("data")
     except FileNotFoundError as e:
         print(e)
         exit(1)
-    
-    updated_data = add_themes_to_data(raw_data)
-    output_file = save_updated_data(updated_data, DATA_DIR)
     print(f"Updated data with themes saved to {output_file}")
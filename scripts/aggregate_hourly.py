@@ -1,69 +1,67 @@
-import json
-from datetime import datetime, timedelta
-from collections import Counter, OrderedDict
-import plotly.graph_objs as go
-import plotly.io as pio
+import os
+import sys
+from datetime import timedelta
+
+sys.path.append(os.path.abspath(os.path.join(os.path.dirname(__file__), '..')))
+from dashboard.downsample import lttb
+from dashboard import json_codec, manifest
+from dashboard.aggregation import aggregate
+
+# Max points drawn for the hourly timeline; longer spans are downsampled with LTTB.
+MAX_CHART_POINTS = 2000
 
 def load_data(filename):
     """Load presidential actions data from a JSON file."""
-    with open(filename, "r") as f:
-        return json.load(f)
+    return json_codec.load(filename)
 
 def aggregate_actions_per_hour(actions):
     """
     For each action in the list, parse the ISO timestamp and round it down to the hour.
-    Then, aggregate counts for each hour in the complete range between the earliest and latest hour.
     
     Returns:
-        An OrderedDict mapping datetime objects (rounded to the hour) to counts.
+        A sparse HourlyTimeline holding only the hours that have actions; use
+        .items() for the (hour, count) pairs or .dense() for a zero-filled window.
     """
-    hours = []
-    for action in actions:
-        dt_str = action.get("date")
-        if dt_str:
-            try:
-                # Parse the ISO timestamp (e.g., "2025-02-09T17:08:57-05:00")
-                dt = datetime.fromisoformat(dt_str)
-                # Round down to the nearest hour
-                dt_hour = dt.replace(minute=0, second=0, microsecond=0)
-                hours.append(dt_hour)
-            except Exception as e:
-                print(f"Error parsing date '{dt_str}': {e}")
-    if not hours:
-        return OrderedDict()
-    
-    # Count how many actions occurred in each hour
-    counts = Counter(hours)
-    
-    # Determine the range of hours in the data
-    min_hour = min(hours)
-    max_hour = max(hours)
-    
-    # Create an ordered dictionary that covers every hour between min_hour and max_hour
-    hourly_counts = OrderedDict()
-    current_hour = min_hour
-    while current_hour <= max_hour:
-        hourly_counts[current_hour] = counts.get(current_hour, 0)
-        current_hour += timedelta(hours=1)
-    
-    return hourly_counts
+    return aggregate(actions).hourly_timeline()
+
+def downsample_hourly(timeline, max_points=MAX_CHART_POINTS, start=None, end=None):
+    """
+    Reduce the timeline (between start and end) to at most max_points hours with LTTB,
+    keeping peaks, the overall shape and the empty stretches between them.
+    Returns [(hour, count)], oldest first.
+    """
+    first, counts = timeline.dense(start, end)
+    if len(counts) <= max_points:
+        return [(first + timedelta(hours=i), count) for i, count in enumerate(counts)]
+    points = list(enumerate(counts))
+    return [(first + timedelta(hours=i), count) for i, count in lttb(points, max_points)]
 
-def generate_hourly_bar_chart(hourly_counts):
+def generate_hourly_bar_chart(timeline, max_points=None, start=None, end=None):
     """
-    Generate a Plotly bar chart from the hourly counts.
+    Generate a Plotly bar chart from the hourly timeline.
+    Bars are drawn for the non-empty hours only; the date axis leaves the empty hours as
+    gaps. With max_points, timelines with more hours than that are drawn as a
+    downsampled line instead.
     
     Returns:
         A Plotly Figure object.
     """
+    import plotly.graph_objs as go
+    points = timeline.items(start, end)
+    line = max_points is not None and len(points) > max_points
+    if line:
+        points = downsample_hourly(timeline, max_points, start, end)
     # Format the datetime keys as strings for the x-axis
-    hours_formatted = [dt.strftime("%Y-%m-%d %H:%M") for dt in hourly_counts.keys()]
-    counts = list(hourly_counts.values())
+    hours_formatted = [dt.strftime("%Y-%m-%d %H:%M") for dt, _ in points]
+    counts = [count for _, count in points]
     
-    # Create a bar chart
-    fig = go.Figure(data=[go.Bar(x=hours_formatted, y=counts)])
+    # Create a bar chart (or a line for downsampled timelines)
+    trace = go.Scatter(x=hours_formatted, y=counts, mode="lines") if line else go.Bar(x=hours_formatted, y=counts)
+    fig = go.Figure(data=[trace])
     fig.update_layout(
         title="Presidential Actions Per Hour",
         xaxis_title="Hour",
+        xaxis_type="date",
         yaxis_title="Count of Actions",
         xaxis_tickangle=-45,
         template="plotly_white"
@@ -71,8 +69,11 @@ def generate_hourly_bar_chart(hourly_counts):
     return fig
 
 if __name__ == "__main__":
-    # Update the filename to your latest enriched JSON file
-    filename = "data/presidential_actions_with_themes_20250209_222540.json"
+    # The latest enriched file the pipeline published (QA'd if there is one).
+    filename = manifest.resolve_latest("data", "qa", "themed")
+    if filename is None:
+        print("No published enriched data file found!")
+        exit(1)
     
     # Load the data from JSON
     data = load_data(filename)
@@ -82,7 +83,7 @@ if __name__ == "__main__":
     hourly_counts = aggregate_actions_per_hour(data)
     
     # Generate the hourly bar chart
-    fig = generate_hourly_bar_chart(hourly_counts)
+    fig = generate_hourly_bar_chart(hourly_counts, max_points=MAX_CHART_POINTS)
     
     # Display the chart in your default browser
-    pio.show(fig)
+    fig.show()
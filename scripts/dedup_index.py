@@ -0,0 +1,244 @@
+# scripts/dedup_index.py
+"""
+Persistent dedup index of the actions already loaded, shared by every pipeline stage.
+
+An action's identity is the database's dedup key (dashboard.models.compute_hash_keys of
+its title, timestamp and source URL), so the scraper and the ETL agree on what "already
+known" means, whatever else differs between the records
+(e.g. re-scraped with new themes). The index lives in data/dedup_index.db:
+  - an exact key set (an INTEGER PRIMARY KEY table of the 64-bit keys)
+  - a bloom filter over the same keys, kept as a blob and loaded into memory
+Lookups ask the bloom filter first; only keys it reports as possibly present (every known
+key plus ~ERROR_RATE of the new ones) are checked against the exact set, so a batch of new
+actions costs no exact lookups. The bloom filter doubles its capacity when it fills up.
+
+The database stays the source of truth: the ETL adds the keys it inserts, and sync()
+rebuilds the index from the presidential_actions table whenever the table no longer
+matches the row count / max id recorded at the last update. A stale index can only let a
+known action through to the ETL, whose insert dedup still catches it.
+Reference:
+  - Bloom filters: https://en.wikipedia.org/wiki/Bloom_filter
+  - Double hashing: Kirsch & Mitzenmacher, "Less Hashing, Same Performance" (2006)
+"""
+import os
+import json
+import math
+import sqlite3
+import logging
+import threading
+from contextlib import closing, contextmanager
+
+import numpy as np
+
+INDEX_FILENAME = "dedup_index.db"
+DEFAULT_CAPACITY = 100000
+ERROR_RATE = 0.001
+
+logger = logging.getLogger(__name__)
+
+def index_path(data_dir):
+    return os.path.join(data_dir, INDEX_FILENAME)
+
+def record_keys(records):
+    """
+    Dedup keys of pipeline records ({"title", "date", "source_url"?}), as the ETL computes
+    them. None for records without a title or a parseable date (they cannot be matched).
+    """
+    from dashboard.models import compute_hash_keys  # SQLAlchemy is only loaded when there are records to key.
+    keys = []
+    for record in records:
+        try:
+            title = record.get("title")
+            if not title:
+                raise ValueError("missing title")
+            keys.append(compute_hash_keys([(title, record["date"], record.get("source_url"))])[0])
+        except (KeyError, TypeError, ValueError):
+            keys.append(None)
+    return keys
+
+class BloomFilter:
+    """Bloom filter over 64-bit integer keys, sized for capacity keys at error_rate."""
+
+    def __init__(self, capacity, error_rate=ERROR_RATE, bits=None):
+        self.capacity = capacity
+        self.error_rate = error_rate
+        self.num_bits = max(64, math.ceil(-capacity * math.log(error_rate) / math.log(2) ** 2))
+        self.num_hashes = max(1, round(self.num_bits / capacity * math.log(2)))
+        size = (self.num_bits + 7) // 8
+        self.bits = np.zeros(size, dtype=np.uint8) if bits is None else np.frombuffer(bits, dtype=np.uint8).copy()
+
+    def _positions(self, keys):
+        """(len(keys), num_hashes) bit positions. The keys are already SHA-256 prefixes,
+        so their two 32-bit halves serve as the two hashes of double hashing."""
+        keys = np.asarray(keys, dtype=np.int64).view(np.uint64)
+        low = keys & np.uint64(0xFFFFFFFF)
+        high = (keys >> np.uint64(32)) | np.uint64(1)
+        steps = np.arange(self.num_hashes, dtype=np.uint64)
+        return (low[:, None] + steps[None, :] * high[:, None]) % np.uint64(self.num_bits)
+
+    def add(self, keys):
+        positions = self._positions(keys).ravel()
+        np.bitwise_or.at(self.bits, positions >> np.uint64(3),
+                         (np.uint8(1) << (positions & np.uint64(7)).astype(np.uint8)))
+
+    def might_contain(self, keys):
+        """Boolean array: False means the key was certainly never added."""
+        positions = self._positions(keys)
+        present = (self.bits[positions >> np.uint64(3)] >> (positions & np.uint64(7)).astype(np.uint8)) & 1
+        return present.all(axis=1) if len(positions) else np.zeros(0, dtype=bool)
+
+    def to_bytes(self):
+        return self.bits.tobytes()
+
+class DedupIndex:
+    """Bloom filter in front of an exact key set, persisted in SQLite (see module docstring)."""
+
+    def __init__(self, path, capacity=DEFAULT_CAPACITY, error_rate=ERROR_RATE):
+        self.path = path
+        self._lock = threading.Lock()
+        self.exact_lookups = 0  # Keys checked against the exact set (bloom filter positives).
+        with self._connect() as conn:
+            conn.execute("PRAGMA journal_mode=WAL")
+            conn.execute("CREATE TABLE IF NOT EXISTS meta (name TEXT PRIMARY KEY, value TEXT NOT NULL)")
+            conn.execute("CREATE TABLE IF NOT EXISTS keys (key INTEGER PRIMARY KEY)")
+            conn.execute("CREATE TABLE IF NOT EXISTS blobs (name TEXT PRIMARY KEY, value BLOB NOT NULL)")
+            meta = self._meta(conn)
+            stored = conn.execute("SELECT value FROM blobs WHERE name = 'bloom'").fetchone()
+        if stored:
+            self.bloom = BloomFilter(meta["capacity"], meta["error_rate"], stored[0])
+        else:
+            self.bloom = BloomFilter(capacity, error_rate)
+
+    @contextmanager
+    def _connect(self):
+        """A connection that commits (or rolls back) its transaction and is closed on exit."""
+        with closing(sqlite3.connect(self.path, timeout=30)) as conn, conn:
+            yield conn
+
+    def _meta(self, conn):
+        meta = {"count": 0, "capacity": None, "error_rate": None, "fingerprint": None}
+        meta.update((name, json.loads(value)) for name, value in conn.execute("SELECT name, value FROM meta"))
+        return meta
+
+    def __len__(self):
+        with self._connect() as conn:
+            return self._meta(conn)["count"]
+
+    @property
+    def fingerprint(self):
+        """Database fingerprint recorded with the last update (see db_fingerprint())."""
+        with self._connect() as conn:
+            return self._meta(conn)["fingerprint"]
+
+    # --- Lookups ---
+
+    def might_contain(self, keys):
+        """Boolean array from the bloom filter alone (False: certainly not indexed)."""
+        return self.bloom.might_contain(keys)
+
+    def known(self, keys):
+        """The subset of the given keys (None entries ignored) that are in the index."""
+        keys = [k for k in keys if k is not None]
+        if not keys:
+            return set()
+        candidates = [k for k, maybe in zip(keys, self.might_contain(keys).tolist()) if maybe]
+        self.exact_lookups += len(candidates)
+        found = set()
+        with self._connect() as conn:
+            for i in range(0, len(candidates), 500):  # Stay under SQLite's bound-parameter limit.
+                chunk = candidates[i:i + 500]
+                found.update(k for (k,) in conn.execute(
+                    f"SELECT key FROM keys WHERE key IN ({','.join('?' * len(chunk))})", chunk))
+        return found
+
+    def drop_known(self, records):
+        """(records whose dedup key is not indexed, number dropped), in input order."""
+        keys = record_keys(records)
+        found = self.known(keys)
+        if not found:
+            return list(records), 0
+        new_records = [r for r, k in zip(records, keys) if k is None or k not in found]
+        return new_records, len(records) - len(new_records)
+
+    # --- Updates ---
+
+    def add(self, keys, fingerprint=None):
+        """Index the keys (None entries ignored); returns how many were new."""
+        keys = [k for k in keys if k is not None]
+        with self._lock, self._connect() as conn:
+            conn.execute("BEGIN IMMEDIATE")
+            meta = self._meta(conn)
+            before = conn.total_changes
+            conn.executemany("INSERT OR IGNORE INTO keys (key) VALUES (?)", [(k,) for k in keys])
+            added = conn.total_changes - before
+            meta["count"] += added
+            if fingerprint is not None:
+                meta["fingerprint"] = fingerprint
+            if meta["count"] > self.bloom.capacity:
+                # Full: rebuild at twice the size so the false positive rate holds.
+                self.bloom = BloomFilter(max(meta["count"], self.bloom.capacity) * 2, self.bloom.error_rate)
+                self.bloom.add(np.fromiter((k for (k,) in conn.execute("SELECT key FROM keys")),
+                                           dtype=np.int64, count=meta["count"]))
+            elif keys:
+                self.bloom.add(keys)
+            self._save(conn, meta)
+        return added
+
+    def rebuild(self, keys, fingerprint=None):
+        """Replace the whole index with the given keys."""
+        keys = np.unique(np.array([k for k in keys if k is not None], dtype=np.int64))
+        with self._lock, self._connect() as conn:
+            conn.execute("BEGIN IMMEDIATE")
+            conn.execute("DELETE FROM keys")
+            conn.executemany("INSERT INTO keys (key) VALUES (?)", ((k,) for k in keys.tolist()))
+            self.bloom = BloomFilter(max(DEFAULT_CAPACITY, len(keys) * 2), self.bloom.error_rate)
+            self.bloom.add(keys)
+            self._save(conn, {"count": len(keys), "fingerprint": fingerprint})
+        logger.info("Rebuilt the dedup index with %d keys.", len(keys))
+
+    def _save(self, conn, meta):
+        meta = dict(meta, capacity=self.bloom.capacity, error_rate=self.bloom.error_rate)
+        conn.executemany("INSERT OR REPLACE INTO meta (name, value) VALUES (?, ?)",
+                         [(name, json.dumps(value)) for name, value in meta.items()])
+        conn.execute("INSERT OR REPLACE INTO blobs (name, value) VALUES ('bloom', ?)", (self.bloom.to_bytes(),))
+
+    # --- Database ---
+
+    def sync(self, session):
+        """Rebuild from the database if it changed since the index was last updated. Returns True if rebuilt."""
+        fingerprint = db_fingerprint(session)
+        if fingerprint == self.fingerprint:
+            return False
+        self.rebuild_from_db(session, fingerprint)
+        return True
+
+    def rebuild_from_db(self, session, fingerprint=None):
+        from dashboard.models import PresidentialAction
+        keys = [k for (k,) in session.query(PresidentialAction.hash_key)]
+        self.rebuild(keys, fingerprint or db_fingerprint(session))
+
+def db_fingerprint(session):
+    """[row count, max id] of presidential_actions: changes whenever rows are added or removed."""
+    from sqlalchemy import func
+    from dashboard.models import PresidentialAction
+    count, max_id = session.query(func.count(PresidentialAction.id), func.max(PresidentialAction.id)).one()
+    return [count, max_id]
+
+def open_index(data_dir):
+    """The data directory's dedup index, or None if none has been built yet."""
+    path = index_path(data_dir)
+    return DedupIndex(path) if os.path.exists(path) else None
+
+if __name__ == "__main__":
+    # Maintenance entry point: rebuild the index from the database.
+    import sys
+    logging.basicConfig(level=logging.INFO)
+    from scripts import etl
+    data_dir = sys.argv[1] if len(sys.argv) > 1 else "data"
+    session = etl.get_session()
+    try:
+        index = DedupIndex(index_path(data_dir))
+        index.rebuild_from_db(session)
+        print(f"{index_path(data_dir)}: {len(index)} keys")
+    finally:
+        session.close()
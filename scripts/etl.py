@@ -1,21 +1,26 @@
 # scripts/etl.py
 
-import json
 import glob
 import logging
 import os
 import time
+import sqlite3
 from datetime import datetime
-
-from jsonschema import validate, ValidationError
+from pathlib import Path
 
 from sqlalchemy import create_engine
+from sqlalchemy.engine import make_url
 from sqlalchemy.exc import IntegrityError
 from sqlalchemy.orm import sessionmaker
 
 # Import configuration and models
 from config.config import DB_URI  # Example: DB_URI = 'sqlite:///data/presidential_actions.db'
-from dashboard.models import Base, PresidentialAction
+from dashboard import json_codec
+from dashboard.models import (
+    Base, PresidentialAction, DailyCount, compute_hash_keys, compute_hash_value, hash_key_from_hex
+)
+from dashboard.rollups import apply_rollups, rebuild_rollups
+from dashboard.search import ensure_search_index
 
 # Set up logging for the ETL process
 logging.basicConfig(level=logging.INFO)
@@ -32,6 +37,10 @@ PRESIDENTIAL_ACTION_SCHEMA = {
     "required": ["action_title", "action_date"]
 }
 
+# Callables invoked with the list of inserted actions after each committed batch
+# (e.g. the dashboard pushes the resulting aggregate deltas to open browsers).
+batch_listeners = []
+
 # Retry mechanism parameters
 MAX_RETRIES = 3
 RETRY_DELAY = 5  # seconds
@@ -41,22 +50,87 @@ def validate_record(record):
     Validate a record against the predefined JSON schema.
     Raises a ValidationError if the record does not conform.
     """
+    from jsonschema import validate, ValidationError  # Only the JSON-file loaders need it.
     try:
         validate(instance=record, schema=PRESIDENTIAL_ACTION_SCHEMA)
     except ValidationError as e:
         logger.error(f"Record validation error: {e.message} | Record: {record}")
         raise
 
-def process_json_file(filepath, session):
+def build_row(record):
+    """
+    Validate a record and convert it into an (action_title, action_timestamp, source_url) row.
+    Raises ValidationError / ValueError for records that cannot be loaded.
+    """
+    validate_record(record)
+    # Convert action_date from string to a (midnight) timestamp.
+    action_timestamp = datetime.strptime(record['action_date'], "%Y-%m-%d")
+    return record['action_title'], action_timestamp, record.get('source_url')
+
+def existing_hash_keys(session, keys):
+    """Return the subset of the given dedup keys that are already stored."""
+    found = set()
+    for i in range(0, len(keys), 500):  # Stay under SQLite's bound-parameter limit.
+        chunk = keys[i:i + 500]
+        found.update(k for (k,) in session.query(PresidentialAction.hash_key)
+                     .filter(PresidentialAction.hash_key.in_(chunk)))
+    return found
+
+def insert_batch(session, rows, index=None):
+    """
+    Insert a batch of (action_title, action_timestamp, source_url[, theme[, themes]]) rows and update
+    the rollup tables in one transaction. Dedup keys are computed for the whole
+    batch up front, so model instances are only built for rows that are new
+    (not already stored and not repeated earlier in the batch).
+    With a dedup index (scripts/dedup_index.py, synced with this database), only the keys
+    its bloom filter cannot rule out are looked up in the table, and the inserted keys
+    are added to it.
+    Returns the list of actions actually inserted.
+    """
+    keys = compute_hash_keys(row[:3] for row in rows)
+    if index is not None and keys:
+        candidates = [k for k, maybe in zip(keys, index.might_contain(keys).tolist()) if maybe]
+        seen = existing_hash_keys(session, candidates)
+    else:
+        seen = existing_hash_keys(session, keys)
+    legacy_hash_value = session.info.get("hash_value_required", False)
+    new_actions, new_keys = [], []
+    for row, key in zip(rows, keys):
+        action_title, action_timestamp = row[0], row[1]
+        if key in seen:
+            logger.warning(f"Duplicate record skipped: {action_title} on {action_timestamp.date()}")
+            continue
+        seen.add(key)
+        action = PresidentialAction(*row, hash_key=key)
+        if legacy_hash_value:
+            action.hash_value = compute_hash_value(*row[:3])
+        new_actions.append(action)
+        new_keys.append(key)
+
+    session.add_all(new_actions)
+    apply_rollups(session, new_actions)
+    session.commit()
+    if index is not None and new_actions:
+        from scripts.dedup_index import db_fingerprint
+        index.add(new_keys, db_fingerprint(session))
+    if new_actions:
+        for listener in batch_listeners:
+            try:
+                listener(new_actions)
+            except Exception as e:
+                logger.error(f"Batch listener {listener} failed: {e}")
+    return new_actions
+
+def process_json_file(filepath, session, index=None):
     """
     Process a single JSON file:
       - Load the JSON data.
       - Validate each record.
-      - Convert and insert the record into the database.
+      - Insert the new records and their rollup increments as one batch.
+    Constraint errors are retried record by record (see insert_rows).
     """
     try:
-        with open(filepath, 'r') as file:
-            data = json.load(file)
+        data = json_codec.load(filepath)
     except Exception as e:
         logger.error(f"Failed to load JSON file {filepath}: {e}")
         return
@@ -65,45 +139,158 @@ def process_json_file(filepath, session):
         logger.error(f"Data in {filepath} is not a list of records.")
         return
 
+    rows = []
     for record in data:
         try:
-            # Validate the record structure
-            validate_record(record)
-            
-            # Convert action_date from string to a date object
-            action_date = datetime.strptime(record['action_date'], "%Y-%m-%d").date()
-            
-            # Create an instance of PresidentialAction
-            action = PresidentialAction(
-                action_title=record['action_title'],
-                action_date=action_date,
-                source_url=record.get('source_url')
-            )
-            
-            # Attempt to add and commit the record
-            session.add(action)
-            session.commit()
-            logger.info(f"Inserted: {action.action_title} on {action.action_date}")
-        
+            rows.append(build_row(record))
+        except Exception as e:
+            logger.error(f"Error processing record {record}: {e}")
+
+    for action in insert_rows(session, rows, index, filepath):
+        logger.info(f"Inserted: {action.action_title} on {action.action_date}")
+
+def insert_rows(session, rows, index=None, source="batch"):
+    """
+    insert_batch() the rows; if the batch hits a constraint error (e.g. a concurrent
+    load), fall back to inserting record by record so one duplicate does not drop the
+    whole batch. Returns the inserted actions.
+    """
+    try:
+        return insert_batch(session, rows, index)
+    except IntegrityError:
+        session.rollback()
+        logger.warning(f"Batch insert for {source} hit a constraint error; retrying record by record.")
+
+    inserted = []
+    for row in rows:
+        try:
+            inserted.extend(insert_batch(session, [row], index))
         except IntegrityError:
             session.rollback()
-            logger.warning(f"Duplicate record skipped: {record}")
-        
+            logger.warning(f"Duplicate record skipped: {row[0]} on {row[1].date()}")
         except Exception as e:
             session.rollback()
+            logger.error(f"Error processing record {row[0]}: {e}")
+    return inserted
+
+def rows_from_actions(actions):
+    """
+    Convert pipeline records ({'title', 'date', 'themes'}) into insert_batch rows.
+    The first (primary) theme goes in the theme column, all of them in themes.
+    Records without a title or a parseable date are logged and skipped.
+    """
+    rows = []
+    for record in actions:
+        try:
+            action_timestamp = datetime.fromisoformat(record["date"])
+            if not record.get("title"):
+                raise ValueError("missing title")
+        except (KeyError, TypeError, ValueError) as e:
             logger.error(f"Error processing record {record}: {e}")
+            continue
+        themes = list(record.get("themes") or [])
+        rows.append((record["title"], action_timestamp, record.get("source_url"),
+                     themes[0] if themes else None, themes))
+    return rows
+
+def load_actions(actions, session, index=None):
+    """Load pipeline records into the database in one batch (see insert_rows); returns the inserted actions."""
+    inserted = insert_rows(session, rows_from_actions(actions), index)
+    logger.info(f"Inserted {len(inserted)} of {len(actions)} actions.")
+    return inserted
+
+def get_session():
+    """Create or migrate the schema and search index if needed and return a new session."""
+    engine = create_engine(DB_URI)
+    Base.metadata.create_all(engine)
+    hash_value_required = migrate_schema(engine)
+    ensure_search_index(engine)  # Triggers keep the title index in sync with every insert.
+    Session = sessionmaker(bind=engine)
+    session = Session()
+    # insert_batch() keeps writing the legacy hex digest while the table requires it.
+    session.info["hash_value_required"] = hash_value_required
+    backfill_hash_keys(session)
+    ensure_rollups(session)
+    return session
+
+def get_read_only_session():
+    """
+    A session on the existing database that never creates, migrates or writes to it (as
+    get_session() does), or None if there is no database yet. SQLite files are opened in
+    read-only mode.
+    """
+    url = make_url(DB_URI)
+    if url.get_backend_name() != "sqlite":
+        return sessionmaker(bind=create_engine(DB_URI))()
+    if not url.database or url.database == ":memory:" or not os.path.exists(url.database):
+        return None
+    uri = Path(url.database).resolve().as_uri() + "?mode=ro"
+    engine = create_engine("sqlite://", creator=lambda: sqlite3.connect(uri, uri=True))
+    return sessionmaker(bind=engine)()
+
+def migrate_schema(engine):
+    """
+    Bring a presidential_actions table created by older models up to date (create_all
+    only creates missing tables, it never alters existing ones): add the hash_key column
+    and its unique index, and the themes column. Returns True while the table still has the legacy NOT NULL
+    constraint on hash_value (SQLite cannot drop it without rebuilding the table), in
+    which case new rows must keep writing hash_value.
+    """
+    with engine.begin() as conn:
+        # PRAGMA table_info rows: (cid, name, type, notnull, default, pk).
+        columns = {row[1]: row for row in conn.exec_driver_sql("PRAGMA table_info(presidential_actions)")}
+        if "hash_key" not in columns:
+            conn.exec_driver_sql("ALTER TABLE presidential_actions ADD COLUMN hash_key BIGINT")
+            conn.exec_driver_sql("CREATE UNIQUE INDEX IF NOT EXISTS uq_presidential_actions_hash_key "
+                                 "ON presidential_actions (hash_key)")
+            logger.info("Added the hash_key column to presidential_actions.")
+        if "themes" not in columns:
+            conn.exec_driver_sql("ALTER TABLE presidential_actions ADD COLUMN themes JSON")
+            logger.info("Added the themes column to presidential_actions.")
+    return "hash_value" in columns and bool(columns["hash_value"][3])
+
+def get_dedup_index(data_dir, session):
+    """The data directory's dedup index, rebuilt first if the database changed without it."""
+    from scripts.dedup_index import DedupIndex, index_path
+    index = DedupIndex(index_path(data_dir))
+    if index.sync(session):
+        logger.info(f"Dedup index rebuilt from the database ({len(index)} keys).")
+    return index
+
+def backfill_hash_keys(session):
+    """
+    Fill in hash_key for legacy rows that only carry the hex hash_value, so dedup
+    lookups (which use hash_key) also match rows loaded before the column existed.
+    """
+    legacy = (session.query(PresidentialAction)
+              .filter(PresidentialAction.hash_key.is_(None), PresidentialAction.hash_value.isnot(None))
+              .all())
+    for action in legacy:
+        action.hash_key = hash_key_from_hex(action.hash_value)
+    if legacy:
+        session.commit()
+        logger.info(f"Backfilled hash_key for {len(legacy)} legacy rows.")
+
+def ensure_rollups(session):
+    """
+    Build the rollup tables from presidential_actions when they are empty but the table
+    has rows (a database loaded before the rollups existed, or by other means), so readers
+    of the rollups never see empty counts.
+    """
+    if session.query(DailyCount.day).first() is None and session.query(PresidentialAction.id).first() is not None:
+        rebuild_rollups(session)
+        logger.info("Rebuilt the empty rollup tables from presidential_actions.")
 
 def run_etl():
     """
     Run the ETL process:
       - Set up the database and session.
       - Process all JSON files in the data directory with a retry mechanism.
+      - Keep the dedup index (data/dedup_index.db) in step with the inserts.
     """
     # Set up SQLAlchemy engine and session
-    engine = create_engine(DB_URI)
-    Base.metadata.create_all(engine)
-    Session = sessionmaker(bind=engine)
-    session = Session()
+    session = get_session()
+    index = get_dedup_index('data', session)
     
     # Find JSON files in the data directory
     json_files = glob.glob(os.path.join('data', '*.json'))
@@ -113,7 +300,7 @@ def run_etl():
         while retries < MAX_RETRIES:
             try:
                 logger.info(f"Processing file: {filepath}")
-                process_json_file(filepath, session)
+                process_json_file(filepath, session, index)
                 break  # Successfully processed the file; break out of the retry loop.
             except Exception as e:
                 retries += 1
@@ -0,0 +1,90 @@
+# scripts/export_parquet.py
+"""
+This script exports the action archive to columnar Parquet files, partitioned by month
+(data/parquet/month=YYYY-MM/...), and provides loaders that read them back into pandas.
+Readers only decode the columns (and months) they ask for, and files are memory-mapped,
+so re-aggregations skip the cost of parsing the full pretty-printed JSON snapshots.
+
+Columns:
+  - title     (string)
+  - date      (string, original ISO timestamp with its UTC offset)
+  - timestamp (timestamp[us, UTC])
+  - themes    (list<string>)
+  - month     (partition key, YYYY-MM of the local date)
+Reference:
+  - pyarrow datasets: https://arrow.apache.org/docs/python/parquet.html#partitioned-datasets-multiple-files
+"""
+import os
+import sys
+import pyarrow as pa
+import pyarrow.parquet as pq
+
+PARQUET_DIR = os.path.join("data", "parquet")
+
+SCHEMA = pa.schema([
+    ("title", pa.string()),
+    ("date", pa.string()),
+    ("timestamp", pa.timestamp("us", tz="UTC")),
+    ("themes", pa.list_(pa.string())),
+    ("month", pa.string()),
+])
+
+def actions_to_table(actions):
+    """Convert a list of action dicts ({'title', 'date', 'themes'}) into an Arrow table."""
+    import pandas as pd  # Only for ISO-8601 parsing with mixed UTC offsets.
+    dates = [action.get("date") for action in actions]
+    return pa.table({
+        "title": [action.get("title") for action in actions],
+        "date": dates,
+        "timestamp": pd.to_datetime(pd.Series(dates, dtype="object"), utc=True, errors="coerce", format="ISO8601"),
+        "themes": [list(action.get("themes") or []) for action in actions],
+        "month": [d[:7] if d else "unknown" for d in dates],
+    }, schema=SCHEMA)
+
+def export_parquet(actions, out_dir=PARQUET_DIR):
+    """
+    Write the actions to out_dir as a month-partitioned Parquet dataset.
+    Months present in this export replace their previous partition; other months are kept.
+    Returns the number of rows written.
+    """
+    table = actions_to_table(actions)
+    pq.write_to_dataset(
+        table,
+        root_path=out_dir,
+        partition_cols=["month"],
+        existing_data_behavior="delete_matching",
+    )
+    return table.num_rows
+
+def load_parquet(out_dir=PARQUET_DIR, columns=None, months=None):
+    """
+    Memory-map the Parquet dataset into a pandas DataFrame.
+    Only the requested columns (default: all) and months (default: all) are read.
+    """
+    filters = [("month", "in", list(months))] if months else None
+    table = pq.read_table(out_dir, columns=list(columns) if columns else None,
+                          filters=filters, memory_map=True)
+    return table.to_pandas()
+
+def load_parquet_actions(out_dir=PARQUET_DIR, columns=("date", "themes"), months=None):
+    """
+    Load actions as a list of dicts for the dict-based aggregation functions
+    (aggregate_by_day, aggregate_by_hour_of_day, aggregate_by_theme).
+    Defaults to the two columns those functions read.
+    """
+    df = load_parquet(out_dir, columns=columns, months=months)
+    if "themes" in df.columns:
+        df["themes"] = [list(t) if t is not None else [] for t in df["themes"]]
+    return df.to_dict("records")
+
+if __name__ == "__main__":
+    if len(sys.argv) < 2:
+        print("Usage: python -m scripts.export_parquet <path_to_json> [output_dir]")
+        sys.exit(1)
+
+    json_file_path = sys.argv[1]
+    out_dir = sys.argv[2] if len(sys.argv) > 2 else PARQUET_DIR
+    from dashboard import json_codec
+    actions = json_codec.load(json_file_path)
+    count = export_parquet(actions, out_dir)
+    print(f"Exported {count} records from {json_file_path} to {out_dir}")
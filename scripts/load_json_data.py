@@ -4,14 +4,16 @@ This script loads JSON data into the SQLite database.
 Changes:
   - Uses the full datetime from the JSON (action_timestamp or action_date) via datetime.fromisoformat.
   - Optionally loads a 'theme' field.
+  - Updates the rollup tables in the same commit as each loaded record.
 Reference:
   - Python datetime.fromisoformat: https://docs.python.org/3/library/datetime.html#datetime.datetime.fromisoformat
 """
-import json
 import os
 import sys
 from datetime import datetime
+from dashboard import json_codec
 from dashboard.models import PresidentialAction, Base
+from dashboard.rollups import apply_rollups
 from config.config import DB_URI
 from sqlalchemy import create_engine
 from sqlalchemy.orm import sessionmaker
@@ -21,8 +23,7 @@ def load_json_data(json_file_path):
     Session = sessionmaker(bind=engine)
     session = Session()
     
-    with open(json_file_path, 'r') as file:
-        data = json.load(file)
+    data = json_codec.load(json_file_path)
     
     for record in data:
         action_title = record.get('action_title')
@@ -42,6 +43,7 @@ def load_json_data(json_file_path):
         action = PresidentialAction(action_title, action_timestamp, source_url, theme)
         try:
             session.add(action)
+            apply_rollups(session, [action])
             session.commit()
             print(f"Loaded record: {action_title} at {action_timestamp}")
         except Exception as e:
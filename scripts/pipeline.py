@@ -0,0 +1,144 @@
+# scripts/pipeline.py
+"""
+Runs the full refresh pipeline in-process: scrape -> theme -> QA -> load -> publish.
+Each stage is the same code the individual scripts run, so running the pipeline
+is equivalent to running them by hand in order. An optional on_stage callback is
+told when each stage starts and finishes (with its duration and a short detail),
+which the dashboard's background refresh job uses to report progress. The final
+"publish" stage precomputes the dashboard aggregates into the shared store that all
+web workers read (dashboard/aggregate_store.py), from running aggregates that only
+take in the newly QA'd records (dashboard/running_aggregates.py).
+
+Every stage only processes the delta since its last successful run: the scraper stops
+at the first page of already-known actions, and theme/QA/load consume their input
+segment-store stream from a per-stage cursor. Actions the database already holds are
+dropped at the earliest stage that sees them, using the shared dedup index
+(scripts/dedup_index.py) the load stage keeps up to date. With a checkpoint file, the stages
+completed by an interrupted run are recorded, and the next run resumes after them.
+"""
+import os
+import sys
+import time
+import logging
+from datetime import datetime
+
+sys.path.append(os.path.abspath(os.path.join(os.path.dirname(__file__), '..')))
+from dashboard import json_codec
+
+logger = logging.getLogger(__name__)
+
+STAGES = ("scrape", "theme", "qa", "load", "publish")
+
+def stage_scrape(data_dir):
+    from scripts import scrape_presidential_actions as scraper
+    count = scraper.run(incremental=True, data_dir=data_dir)
+    return f"{count} actions scraped"
+
+def stage_theme(data_dir):
+    from scripts import add_themes
+    output_file, count = add_themes.run(data_dir)
+    return f"{count} records themed -> {os.path.basename(output_file)}"
+
+def stage_qa(data_dir):
+    from scripts import qa_data
+    output_file, count = qa_data.run(data_dir)
+    if output_file is None:
+        raise FileNotFoundError("QA stage found no themed data to check.")
+    return f"{count} records checked -> {os.path.basename(output_file)}"
+
+def stage_load(data_dir):
+    from dashboard import manifest
+    from scripts import etl
+    from scripts.segment_store import SegmentStore
+    qa_store = SegmentStore("qa", root=os.path.join(data_dir, "store"))
+    end_offset = None
+    if qa_store.head is not None:
+        # Only the QA'd records the loader has not committed yet.
+        actions, end_offset = qa_store.read_new("etl")
+    else:
+        qa_file = manifest.resolve_latest(data_dir, "qa")
+        if qa_file is None:
+            raise FileNotFoundError("Load stage found no QA output to load.")
+        actions = json_codec.load(qa_file)
+    session = etl.get_session()
+    try:
+        inserted = etl.load_actions(actions, session, etl.get_dedup_index(data_dir, session))
+    finally:
+        session.close()
+    if end_offset is not None:
+        qa_store.commit("etl", end_offset)
+    return f"{len(inserted)} new actions loaded"
+
+def stage_publish(data_dir):
+    from dashboard.app import publish_aggregates
+    from dashboard.aggregate_store import STORE_FILENAME
+    source_file = publish_aggregates(data_dir)
+    return f"aggregates for {os.path.basename(source_file)} -> {STORE_FILENAME}"
+
+STAGE_FUNCTIONS = {
+    "scrape": stage_scrape,
+    "theme": stage_theme,
+    "qa": stage_qa,
+    "load": stage_load,
+    "publish": stage_publish,
+}
+
+def load_checkpoint(path):
+    """Return the checkpoint dict ({'completed': [...], 'last_success': ...})."""
+    try:
+        return json_codec.load(path)
+    except (FileNotFoundError, json_codec.JSONDecodeError):
+        return {"completed": [], "last_success": None}
+
+def save_checkpoint(path, checkpoint):
+    """Atomically write the checkpoint file."""
+    tmp_path = f"{path}.tmp"
+    json_codec.dump(checkpoint, tmp_path)
+    os.replace(tmp_path, path)
+
+def run_pipeline(data_dir="data", on_stage=None, stages=STAGES, checkpoint_path=None):
+    """
+    Run the given stages in order, stopping at the first failure (which is re-raised).
+    on_stage(name, status, seconds, detail) is called with status "running" before
+    a stage and "succeeded"/"failed" after it (and "skipped" for stages a checkpointed,
+    interrupted run already completed).
+    Returns a list of (stage, seconds, detail) for the completed stages.
+    """
+    checkpoint = load_checkpoint(checkpoint_path) if checkpoint_path else None
+    results = []
+    for name in stages:
+        if checkpoint is not None and name in checkpoint["completed"]:
+            logger.info("Pipeline stage %s already completed by the interrupted run; skipping.", name)
+            if on_stage:
+                on_stage(name, "skipped", None, "completed by previous run")
+            continue
+        if on_stage:
+            on_stage(name, "running", None, None)
+        started = time.perf_counter()
+        try:
+            detail = STAGE_FUNCTIONS[name](data_dir)
+        except Exception as e:
+            elapsed = time.perf_counter() - started
+            logger.error("Pipeline stage %s failed after %.1fs: %s", name, elapsed, e)
+            if on_stage:
+                on_stage(name, "failed", elapsed, str(e))
+            raise
+        elapsed = time.perf_counter() - started
+        logger.info("Pipeline stage %s finished in %.1fs: %s", name, elapsed, detail)
+        if on_stage:
+            on_stage(name, "succeeded", elapsed, detail)
+        results.append((name, elapsed, detail))
+        if checkpoint is not None:
+            checkpoint["completed"].append(name)
+            save_checkpoint(checkpoint_path, checkpoint)
+
+    if checkpoint is not None:
+        # The run finished: the next one starts from the first stage again.
+        checkpoint.update(completed=[], last_success=datetime.now().isoformat(timespec="seconds"))
+        save_checkpoint(checkpoint_path, checkpoint)
+    return results
+
+if __name__ == "__main__":
+    logging.basicConfig(level=logging.INFO)
+    for name, elapsed, detail in run_pipeline():
+        print(f"{name:<7} {elapsed:7.1f}s  {detail}")
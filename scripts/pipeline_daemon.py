@@ -0,0 +1,92 @@
+# scripts/pipeline_daemon.py
+"""
+Long-running scheduler for the data pipeline.
+
+Runs scripts/pipeline.py (scrape -> theme -> QA -> load) every --interval seconds plus a
+random jitter of up to --jitter seconds, so several hosts do not hit the site in lockstep.
+An exclusive, non-blocking lock on data/pipeline.lock makes overlapping runs impossible,
+whether they come from this daemon, a second copy of it, or a manual `--once` run.
+Per-stage checkpoints in data/pipeline_checkpoint.json let a crashed run resume at the
+stage that did not finish; each stage itself only processes the delta since its last run.
+
+Usage:
+    python -m scripts.pipeline_daemon [--interval 3600] [--jitter 300] [--once]
+"""
+import os
+import sys
+import time
+import random
+import logging
+import argparse
+from contextlib import contextmanager
+
+sys.path.append(os.path.abspath(os.path.join(os.path.dirname(__file__), '..')))
+from scripts.pipeline import run_pipeline
+
+DATA_DIR = "data"
+LOCK_FILENAME = "pipeline.lock"
+LOCK_PATH = os.path.join(DATA_DIR, LOCK_FILENAME)
+CHECKPOINT_PATH = os.path.join(DATA_DIR, "pipeline_checkpoint.json")
+
+logger = logging.getLogger(__name__)
+
+@contextmanager
+def pipeline_lock(path=LOCK_PATH):
+    """
+    Try to take an exclusive lock on path without blocking.
+    Yields True if this process holds the lock, False if another run holds it.
+    The OS releases the lock if the process dies, so a crash never leaves it stuck.
+    """
+    os.makedirs(os.path.dirname(path) or ".", exist_ok=True)
+    f = open(path, "a+")
+    try:
+        try:
+            if os.name == "nt":
+                import msvcrt
+                f.seek(0)
+                msvcrt.locking(f.fileno(), msvcrt.LK_NBLCK, 1)
+            else:
+                import fcntl
+                fcntl.flock(f.fileno(), fcntl.LOCK_EX | fcntl.LOCK_NB)
+        except OSError:
+            yield False
+            return
+        f.seek(0)
+        f.truncate()
+        f.write(f"{os.getpid()}\n")
+        f.flush()
+        yield True
+    finally:
+        f.close()  # Closing the file releases the lock.
+
+def run_once(data_dir=DATA_DIR, lock_path=LOCK_PATH, checkpoint_path=CHECKPOINT_PATH, on_stage=None):
+    """Run the pipeline once if no other run holds the lock. Returns True if it ran."""
+    with pipeline_lock(lock_path) as acquired:
+        if not acquired:
+            logger.info("Another pipeline run holds %s; skipping this cycle.", lock_path)
+            return False
+        run_pipeline(data_dir, on_stage=on_stage, checkpoint_path=checkpoint_path)
+        return True
+
+def main(argv=None):
+    parser = argparse.ArgumentParser(description="Run the presidential actions pipeline on a schedule.")
+    parser.add_argument("--interval", type=float, default=3600, help="Seconds between runs (default: 3600).")
+    parser.add_argument("--jitter", type=float, default=300, help="Max random extra delay in seconds (default: 300).")
+    parser.add_argument("--once", action="store_true", help="Run a single cycle and exit.")
+    args = parser.parse_args(argv)
+
+    logging.basicConfig(level=logging.INFO, format="%(asctime)s [%(levelname)s] %(message)s")
+    while True:
+        try:
+            run_once()
+        except Exception:
+            # Completed stages are checkpointed; the next cycle resumes at the failed one.
+            logger.exception("Pipeline run failed")
+        if args.once:
+            break
+        delay = args.interval + random.uniform(0, args.jitter)
+        logger.info("Next pipeline run in %.0f seconds.", delay)
+        time.sleep(delay)
+
+if __name__ == "__main__":
+    main()
@@ -1,14 +1,13 @@
 import os
-import json
-from datetime import datetime
-from collections import Counter
-import plotly.graph_objects as go
-import plotly.io as pio
+import sys
+
+sys.path.append(os.path.abspath(os.path.join(os.path.dirname(__file__), '..')))
+from dashboard import json_codec, manifest
+from dashboard.aggregation import aggregate
 
 def load_data(filename):
     """Load presidential actions data from a JSON file."""
-    with open(filename, "r") as f:
-        return json.load(f)
+    return json_codec.load(filename)
 
 def aggregate_by_hour_of_day(actions):
     """
@@ -19,19 +18,7 @@ def aggregate_by_hour_of_day(actions):
     Returns a dictionary mapping hour (int) to count (int), ensuring every hour
     (0–23) is represented.
     """
-    hours = []
-    for action in actions:
-        dt_str = action.get("date")
-        if dt_str:
-            try:
-                dt = datetime.fromisoformat(dt_str)
-                hours.append(dt.hour)
-            except Exception as e:
-                print(f"Error parsing date '{dt_str}': {e}")
-    counts = Counter(hours)
-    # Ensure all 24 hours are included (even if count is 0)
-    hourly_counts = {hour: counts.get(hour, 0) for hour in range(24)}
-    return hourly_counts
+    return aggregate(actions).hour_of_day_counts()
 
 def generate_polar_chart(hourly_counts):
     """
@@ -40,6 +27,8 @@ def generate_polar_chart(hourly_counts):
     Each hour is mapped to an angle (hour * 15 degrees since 360°/24 = 15°),
     and the radial value is the number of actions in that hour.
     """
+    import plotly.graph_objects as go
+
     # Hours from 0 to 23
     hours = list(range(24))
     counts = [hourly_counts[h] for h in hours]
@@ -78,10 +67,10 @@ def generate_polar_chart(hourly_counts):
     return fig
 
 if __name__ == "__main__":
-    # Update this filename as needed; here we assume a specific enriched file.
-    filename = "data/presidential_actions_with_themes_20250209_222540.json"
-    if not os.path.exists(filename):
-        print(f"File {filename} not found!")
+    # The latest enriched file the pipeline published (QA'd if there is one).
+    filename = manifest.resolve_latest("data", "qa", "themed")
+    if filename is None:
+        print("No published enriched data file found!")
         exit(1)
     
     data = load_data(filename)
@@ -91,4 +80,4 @@ if __name__ == "__main__":
     fig = generate_polar_chart(hourly_counts)
     
     # Open the polar chart in your default browser
-    pio.show(fig)
+    fig.show()
@@ -1,12 +1,15 @@
 import os
-import json
+import sys
 from datetime import datetime
 from collections import defaultdict, Counter
 
+sys.path.append(os.path.abspath(os.path.join(os.path.dirname(__file__), '..')))
+from scripts.segment_store import SegmentStore, prune_snapshots, snapshot_files, SNAPSHOT_COMPACT
+from dashboard import manifest, json_codec
+
 def load_data(filename):
     """Load JSON data from a file."""
-    with open(filename, "r") as f:
-        return json.load(f)
+    return json_codec.load(filename)
 
 def validate_record(record, index):
     """Perform QA checks on one record.
@@ -100,15 +103,36 @@ def print_qa_summary(errors, duplicates, total_records):
     else:
         print("No duplicate records found.")
 
-def main():
-    # Update this filename as needed.
-    input_filename = "data/presidential_actions_with_themes_20250209_222540.json"
-    
-    if not os.path.exists(input_filename):
-        print(f"Error: File {input_filename} not found.")
-        return
+def latest_themed_file(data_dir):
+    """
+    The themed snapshot QA reads: the one the theme stage last published, else the newest
+    presidential_actions_with_themes_<timestamp>.json in data_dir. None if there is none.
+    """
+    published = manifest.resolve_latest(data_dir, "themed")
+    if published is not None:
+        return published
+    files = snapshot_files(data_dir, "presidential_actions_with_themes_")
+    return os.path.join(data_dir, files[-1]) if files else None
+
+def run(data_dir="data"):
+    """
+    Run QA on the themed data, fix what can be fixed and save a QA'd snapshot.
+    With a themed segment store, only records QA has not processed yet are checked.
+    Returns (output_filename, record_count), or (None, 0) if there is no input.
+    """
+    themed_store = SegmentStore("themed", root=os.path.join(data_dir, "store"))
+    if themed_store.head is not None:
+        # Incremental path: only check the themed records QA has not processed yet.
+        data, end_offset = themed_store.read_new("qa_data")
+        print(f"Loaded {len(data)} new records from the themed segment store.")
+    else:
+        input_filename = latest_themed_file(data_dir)
+        if input_filename is None:
+            print(f"Error: No themed snapshot found in {data_dir}.")
+            return None, 0
 
-    data = load_data(input_filename)
+        data = load_data(input_filename)
+        print(f"Loaded {len(data)} records from {input_filename}.")
     total_records = len(data)
     errors, duplicates, _ = validate_data(data)
     print_qa_summary(errors, duplicates, total_records)
@@ -120,12 +144,24 @@ def main():
     else:
         fixed_data = data  # No changes needed
 
+    if themed_store.head is not None:
+        qa_store = SegmentStore("qa", root=os.path.join(data_dir, "store"))
+        added = qa_store.append(fixed_data)
+        themed_store.commit("qa_data", end_offset)
+        print(f"Appended {added} records to the QA segment store.")
+        fixed_data = qa_store.read_all()
+
     # Save the fixed data to a new file for updating your database
-    output_filename = os.path.join("data", f"presidential_actions_with_themes_qa_fixed_{datetime.now().strftime('%Y%m%d_%H%M%S')}.json")
-    with open(output_filename, "w") as f:
-        json.dump(fixed_data, f, indent=2)
+    output_filename = os.path.join(data_dir, f"presidential_actions_with_themes_qa_fixed_{datetime.now().strftime('%Y%m%d_%H%M%S')}.json")
+    json_codec.dump(fixed_data, output_filename, compact=SNAPSHOT_COMPACT)
+    manifest.publish(data_dir, "qa", output_filename, len(fixed_data))
+    prune_snapshots(data_dir, "presidential_actions_with_themes_qa_fixed_")
     
     print(f"\nFixed data saved to {output_filename}")
+    return output_filename, len(fixed_data)
+
+def main():
+    run("data")
 
 if __name__ == "__main__":
     main()
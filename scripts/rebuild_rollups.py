@@ -0,0 +1,25 @@
+# scripts/rebuild_rollups.py
+"""
+This script recomputes the rollup tables (daily, hourly, theme, day x theme and
+day x hour x theme counts) from the presidential_actions table. Run it after init_db.py,
+after loading data by other means, or whenever the rollups are suspected to be out of sync.
+"""
+from sqlalchemy import create_engine
+from sqlalchemy.orm import sessionmaker
+from config.config import DB_URI
+from dashboard.models import Base, DailyCount
+from dashboard.rollups import rebuild_rollups
+
+def main():
+    engine = create_engine(DB_URI)
+    Base.metadata.create_all(engine)
+    Session = sessionmaker(bind=engine)
+    session = Session()
+    try:
+        rebuild_rollups(session)
+        print(f"Rollups rebuilt ({session.query(DailyCount).count()} days).")
+    finally:
+        session.close()
+
+if __name__ == "__main__":
+    main()
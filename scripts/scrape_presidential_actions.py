@@ -1,10 +1,13 @@
 import os
-import json
-import requests
-from bs4 import BeautifulSoup
+import sys
 from datetime import datetime
 import logging
 
+sys.path.append(os.path.abspath(os.path.join(os.path.dirname(__file__), '..')))
+from scripts.segment_store import SegmentStore, prune_snapshots, SNAPSHOT_COMPACT
+from scripts.dedup_index import open_index
+from dashboard import manifest, json_codec
+
 # --- Configuration ---
 # Base URL for scraping presidential actions.
 BASE_URL = "https://www.whitehouse.gov/presidential-actions/"
@@ -35,6 +38,10 @@ def scrape_presidential_actions_page(url):
             next_url (str or None): The URL for the next page (if available).
             actions (list): List of dictionaries with keys 'title' and 'date'.
     """
+    # Imported here so the pipeline and other callers of this module don't pay for them.
+    import requests
+    from bs4 import BeautifulSoup
+
     logging.info("Fetching page URL: %s", url)
     try:
         response = requests.get(url, timeout=10)
@@ -83,51 +90,108 @@ def scrape_presidential_actions_page(url):
     
     return next_url, actions
 
-def scrape_all_pages(start_url):
+def iter_pages(start_url, page_known=None):
     """
-    Iterates through all pages starting from start_url by following
-    the "Next" link, and aggregates the actions from all pages.
+    Yields the actions of each page, starting from start_url and following
+    the "Next" link, so callers can process a page while the next one loads.
     
     Args:
         start_url (str): The URL of the first page.
-    
-    Returns:
-        list: A combined list of all presidential actions scraped.
+        page_known (callable, optional): Predicate for a page (list of actions)
+            whose actions were all scraped before. The archive is newest first,
+            so once a whole page is known the remaining pages are too and
+            scraping stops there.
     """
-    all_actions = []
     current_url = start_url
     page_num = 1
     while current_url:
         logging.info("Scraping page %d: %s", page_num, current_url)
         next_url, actions = scrape_presidential_actions_page(current_url)
-        all_actions.extend(actions)
+        if page_known is not None and actions and page_known(actions):
+            logging.info("Page %d only contains known actions; stopping.", page_num)
+            break
+        if actions:
+            yield actions
         current_url = next_url
         page_num += 1
-    return all_actions
 
-def save_actions(actions):
+def scrape_all_pages(start_url, page_known=None):
     """
-    Saves the aggregated actions into a timestamped JSON file in the OUTPUT_DIR.
+    Iterates through all pages starting from start_url (see iter_pages)
+    and aggregates the actions from all pages.
+    
+    Returns:
+        list: A combined list of all presidential actions scraped.
+    """
+    return [action for actions in iter_pages(start_url, page_known) for action in actions]
+
+def known_action_check(incremental, data_dir=OUTPUT_DIR):
+    """
+    Page predicate for iter_pages: True if every action of the page was scraped before
+    (it is in data_dir's raw segment store or, per its dedup index, in the database).
+    None when there is nothing to check against. The index is asked once per page.
+    """
+    if not incremental:
+        return None
+    raw_store = SegmentStore("raw", root=os.path.join(data_dir, "store"))
+    if raw_store.head is None:
+        raw_store = None
+    index = open_index(data_dir)
+    if raw_store is None and index is None:
+        return None
+
+    def page_known(actions):
+        unknown = [a for a in actions if not raw_store.contains(a)] if raw_store is not None else list(actions)
+        if unknown and index is not None:
+            unknown, _ = index.drop_known(unknown)
+        return not unknown
+    return page_known
+
+def save_actions(actions, data_dir=OUTPUT_DIR):
+    """
+    Saves the aggregated actions into a timestamped JSON file in data_dir
+    and appends the ones not seen before to the "raw" segment store stream.
+    Older snapshots beyond the retention count are pruned.
     
     Args:
         actions (list): List of presidential action dictionaries.
+        data_dir (str): The data directory (default OUTPUT_DIR).
+    
+    Returns:
+        str: Path of the JSON snapshot.
     """
-    os.makedirs(OUTPUT_DIR, exist_ok=True)
+    os.makedirs(data_dir, exist_ok=True)
     timestamp = datetime.now().strftime("%Y%m%d_%H%M%S")
-    filename = os.path.join(OUTPUT_DIR, f"presidential_actions_{timestamp}.json")
+    filename = os.path.join(data_dir, f"presidential_actions_{timestamp}.json")
     
     try:
-        with open(filename, "w") as f:
-            json.dump(actions, f, indent=2)
+        json_codec.dump(actions, filename, compact=SNAPSHOT_COMPACT)
+        manifest.publish(data_dir, "raw", filename, len(actions))
         logging.info("Data successfully saved to %s", filename)
     except IOError as e:
         logging.error("Failed to write data to file: %s", e)
 
-if __name__ == "__main__":
+    added = SegmentStore("raw", root=os.path.join(data_dir, "store")).append(actions)
+    logging.info("Appended %d new actions to the raw segment store.", added)
+    prune_snapshots(data_dir, "presidential_actions_")
+    return filename
+
+def run(incremental=False, data_dir=OUTPUT_DIR):
+    """
+    Scrape every page (or, if incremental, only the pages with new actions) and save the
+    results in data_dir.
+    
+    Returns:
+        int: Number of actions scraped.
+    """
     logging.info("Starting multi-page presidential actions scraping.")
-    actions = scrape_all_pages(BASE_URL)
+    actions = scrape_all_pages(BASE_URL, known_action_check(incremental, data_dir))
     if actions:
-        save_actions(actions)
+        save_actions(actions, data_dir)
     else:
         logging.warning("No actions scraped from any pages.")
     logging.info("Scraping completed.")
+    return len(actions)
+
+if __name__ == "__main__":
+    run()
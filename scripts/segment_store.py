@@ -0,0 +1,319 @@
+# scripts/segment_store.py
+"""
+Append-only, compressed JSONL segment store for pipeline outputs.
+
+Each stream (e.g. "raw", "themed", "qa") lives in data/store/<stream>/ and consists of:
+  - seg-<seq>.jsonl.gz  gzip-compressed JSON Lines segments, never modified once written
+  - keys.txt            content hashes of every record ever appended (for dedup), one
+                        line per offset
+  - manifest.json       the segment list, the current head, and consumer cursors
+  - store.lock          held while the manifest is read-modified-written
+
+Records get a global offset in append order. Consumers read "everything after offset N"
+and store their cursor in the manifest, so each run only reads what is new. Appends only
+write records whose content hash has not been seen, compaction merges small adjacent
+segments without changing offsets, and retention drops the oldest segments by age
+(except in the "qa" stream, which is the dashboard's full record history).
+The manifest is replaced atomically (write to a temp file, then os.replace), so readers
+never see a half-written manifest. Writers take the store's lock and re-read the manifest
+first, so concurrent processes never overwrite each other's appends or cursors. An append
+writes the segment, then the manifest, then keys.txt: after a crash keys.txt can only lag
+behind the manifest, and the missing hashes are recomputed from the listed segments.
+"""
+import os
+import re
+import gzip
+import json
+import hashlib
+import logging
+from contextlib import contextmanager
+from datetime import datetime, timedelta
+
+from dashboard import json_codec, manifest
+
+STORE_DIR = os.path.join("data", "store")
+
+# Number of timestamped JSON snapshots kept per stage by prune_snapshots().
+SNAPSHOT_RETENTION = 3
+# The stage snapshots are read by the next stage and the dashboard, not by people, so
+# they are written without indentation; set to False for indented files.
+SNAPSHOT_COMPACT = True
+# Streams retention never drops: the QA snapshot and the publish rebuild read all of "qa".
+RETENTION_EXEMPT = ("qa",)
+
+logger = logging.getLogger(__name__)
+
+def record_hash(record):
+    """Stable content hash of a record (key order and whitespace do not matter)."""
+    canonical = json.dumps(record, sort_keys=True, separators=(",", ":"), ensure_ascii=False)
+    return hashlib.sha256(canonical.encode("utf-8")).hexdigest()[:32]
+
+def _write_atomic(path, write):
+    """Call write(f) on a temp file next to path, then atomically move it into place."""
+    tmp_path = f"{path}.tmp"
+    with open(tmp_path, "wb") as f:
+        write(f)
+        f.flush()
+        os.fsync(f.fileno())
+    os.replace(tmp_path, path)
+
+class SegmentStore:
+    """An append-only stream of JSON records stored as compressed segments."""
+
+    def __init__(self, stream, root=STORE_DIR):
+        self.stream = stream
+        self.path = os.path.join(root, stream)
+        os.makedirs(self.path, exist_ok=True)
+        self.manifest_path = os.path.join(self.path, "manifest.json")
+        self.keys_path = os.path.join(self.path, "keys.txt")
+        self.manifest = self._load_manifest()
+        self._keys = None
+        self._keys_offset = None
+
+    # --- Manifest ---
+
+    def _load_manifest(self):
+        if not os.path.exists(self.manifest_path):
+            return {"stream": self.stream, "head": None, "next_seq": 1,
+                    "next_offset": 0, "segments": [], "cursors": {}}
+        return json_codec.load(self.manifest_path)
+
+    def _save_manifest(self):
+        data = json_codec.dumps(self.manifest)
+        _write_atomic(self.manifest_path, lambda f: f.write(data))
+
+    @contextmanager
+    def _locked(self):
+        """Hold the store's lock (blocking) with the manifest freshly re-read from disk."""
+        with open(os.path.join(self.path, "store.lock"), "a+") as f:
+            if os.name == "nt":
+                import msvcrt
+                msvcrt.locking(f.fileno(), msvcrt.LK_LOCK, 1)
+            else:
+                import fcntl
+                fcntl.flock(f.fileno(), fcntl.LOCK_EX)
+            self.manifest = self._load_manifest()
+            yield  # Closing the file releases the lock.
+
+    @property
+    def head(self):
+        """Name of the most recently written segment (None for an empty store)."""
+        return self.manifest["head"]
+
+    @property
+    def end_offset(self):
+        """Offset one past the last record ever appended."""
+        return self.manifest["next_offset"]
+
+    # --- Dedup keys ---
+
+    def _load_keys(self):
+        """
+        The hashes in keys.txt, brought in line with the manifest: hashes of records the
+        manifest does not list (a crash before an older version saved it) are dropped,
+        missing ones (a crash before keys.txt was written) are recomputed.
+        """
+        end = self.manifest["next_offset"]
+        if self._keys is None or self._keys_offset != end:
+            keys = []
+            if os.path.exists(self.keys_path):
+                with open(self.keys_path, "r", encoding="utf-8") as f:
+                    keys = [line.strip() for line in f if line.strip()]
+            if len(keys) != end:
+                logger.warning("%s/keys.txt has %d hashes for %d records; repairing it.", self.stream, len(keys), end)
+                keys = keys[:end] + [record_hash(record) for _, record in self.iter_records(len(keys))]
+                data = "".join(f"{k}\n" for k in keys).encode("utf-8")
+                _write_atomic(self.keys_path, lambda f: f.write(data))
+            self._keys, self._keys_offset = set(keys), end
+        return self._keys
+
+    def contains(self, record):
+        """True if a record with the same content was ever appended to this stream."""
+        return record_hash(record) in self._load_keys()
+
+    # --- Segments ---
+
+    def _segment_file(self, name):
+        return os.path.join(self.path, name)
+
+    def _write_segment(self, records):
+        """Write records to a new segment file and return its name."""
+        name = f"seg-{self.manifest['next_seq']:06d}.jsonl.gz"
+        self.manifest["next_seq"] += 1
+
+        def write(f):
+            with gzip.GzipFile(fileobj=f, mode="wb") as gz:
+                for record in records:
+                    gz.write(json_codec.dumps(record, compact=True))
+                    gz.write(b"\n")
+
+        _write_atomic(self._segment_file(name), write)
+        return name
+
+    def _read_segment(self, name):
+        with gzip.open(self._segment_file(name), "rb") as gz:
+            for line in gz:
+                if line.strip():
+                    yield json_codec.loads(line)
+
+    def append(self, records):
+        """
+        Append the records not already in the store as a new segment.
+        Returns the number of records written (0 means nothing new, no segment created).
+        """
+        with self._locked():
+            keys = self._load_keys()
+            new_records, new_keys = [], []
+            for record in records:
+                key = record_hash(record)
+                if key in keys:
+                    continue
+                keys.add(key)
+                new_records.append(record)
+                new_keys.append(key)
+            if not new_records:
+                return 0
+
+            name = self._write_segment(new_records)
+            self.manifest["segments"].append({
+                "name": name,
+                "offset": self.manifest["next_offset"],
+                "count": len(new_records),
+                "created": datetime.now().isoformat(timespec="seconds"),
+            })
+            self.manifest["next_offset"] += len(new_records)
+            self.manifest["head"] = name
+            self._save_manifest()
+            with open(self.keys_path, "a", encoding="utf-8") as f:
+                f.write("".join(f"{k}\n" for k in new_keys))
+            self._keys_offset = self.manifest["next_offset"]
+        logger.info("Appended %d records to %s/%s", len(new_records), self.stream, name)
+        return len(new_records)
+
+    def iter_records(self, since=0):
+        """Yield (offset, record) for every stored record with offset >= since."""
+        for segment in self.manifest["segments"]:
+            start = segment["offset"]
+            if start + segment["count"] <= since:
+                continue
+            for i, record in enumerate(self._read_segment(segment["name"])):
+                if start + i >= since:
+                    yield start + i, record
+
+    def read_all(self):
+        """Return every stored record, in append order."""
+        return [record for _, record in self.iter_records()]
+
+    # --- Consumer cursors ---
+
+    def read_new(self, consumer):
+        """Return (records, end_offset) for records the consumer has not committed yet."""
+        since = self.manifest["cursors"].get(consumer, 0)
+        records = [record for _, record in self.iter_records(since)]
+        return records, self.end_offset
+
+    def commit(self, consumer, offset):
+        """Record that the consumer has processed everything before offset."""
+        with self._locked():  # Picks up appends made since this store was opened.
+            self.manifest["cursors"][consumer] = offset
+            self._save_manifest()
+
+    # --- Maintenance ---
+
+    def compact(self, target_records=10000):
+        """
+        Merge runs of adjacent segments into segments of up to target_records records.
+        Offsets are preserved, so consumer cursors stay valid. Returns segments removed.
+        """
+        with self._locked():
+            segments = self.manifest["segments"]
+            groups, current = [], []
+            for segment in segments:
+                if current and sum(s["count"] for s in current) + segment["count"] > target_records:
+                    groups.append(current)
+                    current = []
+                current.append(segment)
+            if current:
+                groups.append(current)
+
+            compacted, removed = [], []
+            for group in groups:
+                if len(group) == 1:
+                    compacted.append(group[0])
+                    continue
+                records = [r for s in group for r in self._read_segment(s["name"])]
+                name = self._write_segment(records)
+                compacted.append({
+                    "name": name,
+                    "offset": group[0]["offset"],
+                    "count": len(records),
+                    "created": group[-1]["created"],
+                })
+                removed.extend(s["name"] for s in group)
+
+            if removed:
+                self.manifest["segments"] = compacted
+                self.manifest["head"] = compacted[-1]["name"]
+                self._save_manifest()
+                # Only delete old files once the manifest no longer references them.
+                for name in removed:
+                    os.remove(self._segment_file(name))
+                logger.info("Compacted %d segments of %s into %d", len(removed), self.stream, len(compacted))
+            return len(removed)
+
+    def apply_retention(self, max_age_days, now=None):
+        """
+        Drop segments created more than max_age_days ago. Their content hashes are kept,
+        so expired records are not re-appended by later runs. Returns segments removed.
+        Streams in RETENTION_EXEMPT keep everything.
+        """
+        if self.stream in RETENTION_EXEMPT:
+            logger.info("Retention skipped for %s: it holds the full record history.", self.stream)
+            return 0
+        with self._locked():
+            cutoff = (now or datetime.now()) - timedelta(days=max_age_days)
+            keep = [s for s in self.manifest["segments"] if datetime.fromisoformat(s["created"]) >= cutoff]
+            expired = [s for s in self.manifest["segments"] if s not in keep]
+            if expired:
+                self.manifest["segments"] = keep
+                self.manifest["head"] = keep[-1]["name"] if keep else None
+                self._save_manifest()
+                for segment in expired:
+                    os.remove(self._segment_file(segment["name"]))
+                logger.info("Retention removed %d segments from %s", len(expired), self.stream)
+            return len(expired)
+
+def snapshot_files(data_dir, prefix):
+    """
+    Names of the timestamped snapshots <prefix>YYYYMMDD_HHMMSS.json in data_dir, oldest first.
+    The exact pattern means "presidential_actions_with_themes_" does not match the QA files.
+    """
+    pattern = re.compile(re.escape(prefix) + r"\d{8}_\d{6}\.json$")
+    return sorted(f for f in os.listdir(data_dir) if pattern.match(f))  # Timestamp order.
+
+def prune_snapshots(data_dir, prefix, keep=SNAPSHOT_RETENTION):
+    """
+    Delete all but the newest `keep` timestamped snapshots named <prefix>YYYYMMDD_HHMMSS.json
+    (see snapshot_files). A snapshot a stage manifest points at (e.g. one the stage cache
+    restored) is never deleted, since the next stage reads it. Returns the removed paths.
+    """
+    published = manifest.published_files(data_dir)
+    files = snapshot_files(data_dir, prefix)
+    removed = [os.path.join(data_dir, f) for f in files[:-keep] if f not in published] if keep > 0 else []
+    for path in removed:
+        os.remove(path)
+    return removed
+
+if __name__ == "__main__":
+    # Maintenance entry point: compact every stream and apply the retention policy.
+    import sys
+    logging.basicConfig(level=logging.INFO)
+    max_age_days = int(sys.argv[1]) if len(sys.argv) > 1 else 365
+    if not os.path.isdir(STORE_DIR):
+        print(f"No segment store found at {STORE_DIR}")
+        sys.exit(0)
+    for stream in sorted(os.listdir(STORE_DIR)):
+        store = SegmentStore(stream)
+        store.apply_retention(max_age_days)
+        store.compact()
+        print(f"{stream}: {len(store.manifest['segments'])} segments, head={store.head}")
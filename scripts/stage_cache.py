@@ -0,0 +1,267 @@
+# scripts/stage_cache.py
+"""
+Stage DAG runner with a content-addressed cache of stage outputs.
+
+Re-running the pipeline redoes every stage even when nothing changed. run_dag() runs
+scrape -> theme -> QA -> load (the stage functions of scripts/pipeline.py) as a DAG and
+gives each stage a cache key: the SHA-256 of
+  - the digests of its inputs (the outputs of the stages in DEPENDENCIES)
+  - its code version (the digest of its source files, CODE_FILES)
+  - its config (CONFIG; the scraper's includes the current --scrape-interval window,
+    since its input is the live site)
+A stage's outputs are recorded by content: the SHA-256 of the snapshot it publishes (from
+dashboard/manifest.py), or the database's row count / max id for the load stage. The
+snapshot files themselves are kept under data/stage_cache/objects/<sha256>.json.
+For each stage, in order:
+  - skip: the key is cached and the stage's current outputs are the cached ones
+  - restore: the key is cached but its output was replaced since (e.g. by a run with other
+    code); the cached snapshot is put back and published without recomputing it. Only in
+    snapshot mode: once the stage writes a segment store stream, the stream and the later
+    stages' cursors on it are its real output, which a snapshot cannot restore, so the
+    stage runs (incrementally) instead
+  - run: anything else; the new outputs are recorded under the key
+A stage that runs but produces the same output digests (e.g. a scrape that found nothing
+new) leaves its dependents' keys unchanged, so they are skipped too. dry_run=True only
+reports what would execute: it reads the database read-only and creates no files or
+directories. A real run holds the pipeline lock (scripts/pipeline_daemon.py), so it never
+overlaps a daemon or stream pipeline run on the same data directory.
+
+Usage (from the project root):
+    python -m scripts.stage_cache [--dry-run] [--force STAGE ...] [--scrape-interval SECONDS]
+"""
+import os
+import sys
+import json
+import time
+import shutil
+import hashlib
+import logging
+import argparse
+from datetime import datetime
+
+sys.path.append(os.path.abspath(os.path.join(os.path.dirname(__file__), '..')))
+from dashboard import manifest, json_codec
+
+logger = logging.getLogger(__name__)
+
+ROOT = os.path.abspath(os.path.join(os.path.dirname(__file__), '..'))
+CACHE_DIRNAME = "stage_cache"
+CACHE_RETENTION = 5  # Cache entries kept per stage (with their snapshot objects).
+SCRAPE_INTERVAL = 3600  # Seconds a scrape stays fresh.
+
+DAG_STAGES = ("scrape", "theme", "qa", "load")
+DEPENDENCIES = {"scrape": (), "theme": ("scrape",), "qa": ("theme",), "load": ("qa",)}
+CODE_FILES = {
+    "scrape": ["scripts/scrape_presidential_actions.py", "scripts/segment_store.py"],
+    "theme": ["scripts/add_themes.py", "scripts/segment_store.py"],
+    "qa": ["scripts/qa_data.py", "scripts/segment_store.py"],
+    "load": ["scripts/etl.py", "dashboard/models.py", "dashboard/rollups.py"],
+}
+# Manifest stage (dashboard/manifest.py) holding each stage's published snapshot.
+SNAPSHOT_STAGES = {"scrape": "raw", "theme": "themed", "qa": "qa"}
+
+def file_digest(paths):
+    """SHA-256 over the given files' contents (missing files count as empty)."""
+    digest = hashlib.sha256()
+    for path in paths:
+        digest.update(path.encode("utf-8") + b"\0")
+        try:
+            with open(os.path.join(ROOT, path), "rb") as f:
+                digest.update(f.read())
+        except FileNotFoundError:
+            pass
+    return digest.hexdigest()
+
+def stage_config(stage, scrape_interval=SCRAPE_INTERVAL, now=None):
+    """The config part of a stage's cache key."""
+    if stage == "scrape":
+        return {"incremental": True, "window": int((now or time.time()) // scrape_interval)}
+    return {}
+
+def stage_key(stage, inputs, config):
+    """Cache key of a stage: inputs digests, code version and config."""
+    payload = {"stage": stage, "inputs": inputs, "code": file_digest(CODE_FILES[stage]), "config": config}
+    return hashlib.sha256(json.dumps(payload, sort_keys=True).encode("utf-8")).hexdigest()[:32]
+
+def current_outputs(data_dir, stage, read_only=False):
+    """
+    The stage's output digests as they are on disk now ({} if it has none yet).
+    read_only (dry runs) reads the database without creating or migrating it; a missing
+    database or table then counts as no outputs.
+    """
+    if stage in SNAPSHOT_STAGES:
+        entry = manifest.read_manifest(data_dir, SNAPSHOT_STAGES[stage])
+        if entry is None or not os.path.exists(os.path.join(data_dir, entry["file"])):
+            return {}
+        return {"snapshot": entry["sha256"]}
+    from sqlalchemy.exc import OperationalError
+    from scripts import etl
+    from scripts.dedup_index import db_fingerprint
+    session = etl.get_read_only_session() if read_only else etl.get_session()
+    if session is None:
+        return {}
+    try:
+        return {"database": db_fingerprint(session)}
+    except OperationalError:
+        if not read_only:
+            raise
+        return {}  # No presidential_actions table yet.
+    finally:
+        session.close()
+
+class StageCache:
+    """Cache entries (data/stage_cache/<stage>/<key>.json) and snapshot objects."""
+
+    def __init__(self, data_dir):
+        self.data_dir = data_dir
+        self.path = os.path.join(data_dir, CACHE_DIRNAME)
+        self.objects = os.path.join(self.path, "objects")  # Created by the first put().
+
+    def _entry_path(self, stage, key):
+        return os.path.join(self.path, stage, f"{key}.json")
+
+    def get(self, stage, key):
+        try:
+            return json_codec.load(self._entry_path(stage, key))
+        except (FileNotFoundError, json_codec.JSONDecodeError):
+            return None
+
+    def put(self, stage, key, outputs, detail):
+        """Record the stage's outputs under key, keeping a copy of its snapshot."""
+        entry = {"stage": stage, "key": key, "outputs": outputs, "detail": detail,
+                 "created": datetime.now().isoformat(timespec="microseconds")}
+        os.makedirs(self.objects, exist_ok=True)
+        if "snapshot" in outputs:
+            snapshot = manifest.read_manifest(self.data_dir, SNAPSHOT_STAGES[stage])
+            entry.update(file=snapshot["file"], records=snapshot["records"])
+            self._store_object(os.path.join(self.data_dir, snapshot["file"]), outputs["snapshot"])
+        path = self._entry_path(stage, key)
+        os.makedirs(os.path.dirname(path), exist_ok=True)
+        tmp_path = f"{path}.tmp"
+        json_codec.dump(entry, tmp_path)
+        os.replace(tmp_path, path)
+        self._prune(stage)
+        return entry
+
+    def _object_path(self, digest):
+        return os.path.join(self.objects, f"{digest}.json")
+
+    def _store_object(self, path, digest):
+        target = self._object_path(digest)
+        if os.path.exists(target):
+            return
+        try:
+            os.link(path, target)  # Snapshots are never modified in place, so a hard link is a copy.
+        except OSError:
+            shutil.copyfile(path, target)
+
+    def can_restore(self, entry):
+        """True if the entry's snapshot is cached and the stage has no segment store stream."""
+        from scripts.segment_store import SegmentStore
+        if "snapshot" not in entry["outputs"] or not os.path.exists(self._object_path(entry["outputs"]["snapshot"])):
+            return False
+        root = os.path.join(self.data_dir, "store")
+        if not os.path.isdir(os.path.join(root, SNAPSHOT_STAGES[entry["stage"]])):
+            return True  # Checked without SegmentStore(), which creates the stream directory.
+        return SegmentStore(SNAPSHOT_STAGES[entry["stage"]], root=root).head is None
+
+    def restore(self, entry):
+        """Put a cached snapshot back in the data directory and publish it; returns its path."""
+        path = os.path.join(self.data_dir, entry["file"])
+        if not os.path.exists(path):
+            shutil.copyfile(self._object_path(entry["outputs"]["snapshot"]), path)
+        manifest.publish(self.data_dir, SNAPSHOT_STAGES[entry["stage"]], path, entry["records"])
+        return path
+
+    def _prune(self, stage):
+        """Keep the newest CACHE_RETENTION entries of the stage; drop unreferenced objects."""
+        directory = os.path.join(self.path, stage)
+        entries = sorted(os.listdir(directory), key=lambda name: os.path.getmtime(os.path.join(directory, name)))
+        for name in entries[:-CACHE_RETENTION]:
+            os.remove(os.path.join(directory, name))
+        referenced = set()
+        for name in DAG_STAGES:
+            stage_dir = os.path.join(self.path, name)
+            for entry_name in os.listdir(stage_dir) if os.path.isdir(stage_dir) else []:
+                referenced.add(json_codec.load(os.path.join(stage_dir, entry_name))["outputs"].get("snapshot"))
+        for name in os.listdir(self.objects):
+            if name[:-len(".json")] not in referenced:
+                os.remove(os.path.join(self.objects, name))
+
+def run_dag(data_dir="data", stages=DAG_STAGES, force=(), dry_run=False, scrape_interval=SCRAPE_INTERVAL,
+            stage_functions=None):
+    """
+    Run the stages through the cache (see module docstring). force lists stages to run
+    regardless of the cache. Returns [(stage, action, detail)] with action "run", "skip" or
+    "restore"; with dry_run nothing executes and stages whose inputs are only known after
+    an upstream stage runs are reported as "run?". A real run returns [] without running
+    anything if another pipeline run holds the lock.
+    """
+    if dry_run:
+        return _run_dag(data_dir, stages, force, dry_run, scrape_interval, stage_functions)
+    from scripts.pipeline_daemon import pipeline_lock, LOCK_FILENAME
+    lock_path = os.path.join(data_dir, LOCK_FILENAME)
+    with pipeline_lock(lock_path) as acquired:
+        if not acquired:
+            logger.info("Another pipeline run holds %s; skipping this run.", lock_path)
+            return []
+        return _run_dag(data_dir, stages, force, dry_run, scrape_interval, stage_functions)
+
+def _run_dag(data_dir, stages, force, dry_run, scrape_interval, stage_functions):
+    """run_dag() (under the pipeline lock unless dry_run)."""
+    if stage_functions is None:
+        from scripts.pipeline import STAGE_FUNCTIONS as stage_functions
+    cache = StageCache(data_dir)
+    outputs, pending, plan = {}, set(), []
+    for stage in stages:
+        deps = [d for d in DEPENDENCIES[stage] if d in stages]
+        if any(d in pending for d in deps):
+            # Dry run: the upstream stage would run first, so this key is not known yet.
+            pending.add(stage)
+            plan.append((stage, "run?", f"after {', '.join(d for d in deps if d in pending)}"))
+            continue
+        inputs = {d: outputs[d] if d in outputs else current_outputs(data_dir, d, dry_run)
+                  for d in DEPENDENCIES[stage]}
+        key = stage_key(stage, inputs, stage_config(stage, scrape_interval))
+        entry = None if stage in force else cache.get(stage, key)
+        now = current_outputs(data_dir, stage, dry_run)
+        if entry is not None and entry["outputs"] == now:
+            action, detail = "skip", f"cached {key[:12]}: {entry['detail']}"
+        elif entry is not None and cache.can_restore(entry):
+            action, detail = "restore", f"cached {key[:12]}: {entry['file']}"
+            if not dry_run:
+                cache.restore(entry)
+        else:
+            action = "run"
+            reason = "forced" if stage in force else ("code, config or inputs changed" if entry is None
+                                                      else "outputs changed")
+            detail = f"{key[:12]}: {reason}"
+            if dry_run:
+                pending.add(stage)
+            else:
+                logger.info("Stage %s: running (%s).", stage, reason)
+                detail = stage_functions[stage](data_dir)
+                cache.put(stage, key, current_outputs(data_dir, stage), detail)
+        if not dry_run:
+            outputs[stage] = current_outputs(data_dir, stage) if action != "skip" else entry["outputs"]
+        elif entry is not None:
+            outputs[stage] = entry["outputs"]
+        logger.info("Stage %s: %s (%s)", stage, action, detail)
+        plan.append((stage, action, detail))
+    return plan
+
+def main(argv=None):
+    parser = argparse.ArgumentParser(description="Run the pipeline stages through the stage cache.")
+    parser.add_argument("--data-dir", default="data")
+    parser.add_argument("--dry-run", action="store_true", help="show what would run without running it")
+    parser.add_argument("--force", nargs="*", default=[], choices=DAG_STAGES, help="stages to rerun regardless of the cache")
+    parser.add_argument("--scrape-interval", type=int, default=SCRAPE_INTERVAL,
+                        help="seconds a scrape stays cached (default %(default)s)")
+    args = parser.parse_args(argv)
+    for stage, action, detail in run_dag(args.data_dir, force=args.force, dry_run=args.dry_run,
+                                         scrape_interval=args.scrape_interval):
+        print(f"{stage:<7} {action:<8} {detail}")
+
+if __name__ == "__main__":
+    logging.basicConfig(level=logging.INFO)
+    main()
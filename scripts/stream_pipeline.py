@@ -0,0 +1,225 @@
+# scripts/stream_pipeline.py
+"""
+Fused scrape -> theme -> QA -> load pipeline: one process, no intermediate files.
+
+The stage scripts hand records to each other through files: the scraper writes a raw
+snapshot, add_themes re-reads it and writes a full themed snapshot, qa_data re-reads that
+and writes a full QA snapshot, and the loader reads it once more, each in its own process.
+run_fused() instead streams batches of records through the same stage functions
+(add_themes_to_data, validate_data/fix_data, etl.load_actions), each stage in its own
+thread, connected by bounded queues:
+  - a full queue blocks the stage feeding it, so a slow stage (usually the database load)
+    throttles the scraper instead of letting batches pile up in memory
+  - a batch is only held by the stage working on it and the queues between stages, so
+    memory stays flat however many records pass through
+  - page fetches and database commits (which release the GIL) overlap with theming and QA
+QA'd records are appended to the "qa" segment stream, which is what the publish stage
+reads, and the loader's cursor on it is advanced past them. The full QA snapshot file the
+stage scripts write is an optional side output (snapshots=True).
+run() and run_fused() hold the pipeline lock (scripts/pipeline_daemon.py), so they never
+overlap a daemon or stage-script run on the same data directory.
+Every batch flows through to the qa stream; the loader's dedup index
+(scripts/dedup_index.py) only spares the database lookups of actions it already holds.
+"""
+import os
+import sys
+import time
+import queue
+import itertools
+import logging
+import threading
+from contextlib import contextmanager
+from datetime import datetime
+
+sys.path.append(os.path.abspath(os.path.join(os.path.dirname(__file__), '..')))
+
+logger = logging.getLogger(__name__)
+
+# Records per batch. Each batch is one database transaction, so batches much smaller than
+# this spend most of the load stage on commits.
+BATCH_SIZE = 2000
+QUEUE_SIZE = 4  # Batches buffered between two stages.
+
+_DONE = object()  # End-of-stream marker passed down the queues.
+
+class StageStats:
+    """Records in/out and time spent working (not waiting on queues) for one stage."""
+
+    def __init__(self, name):
+        self.name = name
+        self.records_in = 0
+        self.records_out = 0
+        self.busy = 0.0
+
+    def __repr__(self):
+        return f"{self.name}: {self.records_in} in, {self.records_out} out, {self.busy:.2f}s busy"
+
+def iter_batches(records, size=BATCH_SIZE):
+    """Split an iterable of records into lists of up to size records."""
+    batch = []
+    for record in records:
+        batch.append(record)
+        if len(batch) == size:
+            yield batch
+            batch = []
+    if batch:
+        yield batch
+
+def _run_stage(func, stats, inbox, outbox, errors):
+    """Worker loop: apply func to every batch from inbox and pass non-empty results on."""
+    while True:
+        batch = inbox.get()
+        if batch is _DONE:
+            break
+        if errors:
+            continue  # A stage failed: keep draining so upstream stages never block.
+        started = time.perf_counter()
+        try:
+            result = func(batch)
+        except Exception as e:
+            logger.error("Stream stage %s failed: %s", stats.name, e)
+            errors.append(e)
+            continue
+        finally:
+            stats.busy += time.perf_counter() - started
+        stats.records_in += len(batch)
+        stats.records_out += len(result)
+        if result and outbox is not None:
+            outbox.put(result)
+    if outbox is not None:
+        outbox.put(_DONE)
+
+def run_stages(batches, stages, queue_size=QUEUE_SIZE):
+    """
+    Stream batches through stages, a list of (name, func(batch) -> batch), one thread
+    per stage, with queues of queue_size batches between them. The source is consumed on
+    the calling thread. Returns the StageStats of each stage; the first stage error is
+    re-raised once every thread has stopped.
+    """
+    queues = [queue.Queue(maxsize=queue_size) for _ in stages]
+    errors, stats, threads = [], [], []
+    for i, (name, func) in enumerate(stages):
+        stats.append(StageStats(name))
+        outbox = queues[i + 1] if i + 1 < len(stages) else None
+        thread = threading.Thread(target=_run_stage, args=(func, stats[-1], queues[i], outbox, errors),
+                                  name=f"stream-{name}", daemon=True)
+        thread.start()
+        threads.append(thread)
+    try:
+        for batch in batches:
+            if errors:
+                break
+            queues[0].put(batch)
+    finally:
+        queues[0].put(_DONE)
+        for thread in threads:
+            thread.join()
+    if errors:
+        raise errors[0]
+    return stats
+
+class LoadStage:
+    """Loads QA'd batches into the database and appends them to the "qa" stream."""
+
+    def __init__(self, data_dir):
+        from scripts.segment_store import SegmentStore
+        self.data_dir = data_dir
+        self.qa_store = SegmentStore("qa", root=os.path.join(data_dir, "store"))
+        self.session = None
+        self.index = None
+        self.inserted = 0
+
+    def __call__(self, batch):
+        from scripts import etl
+        if self.session is None:
+            # Opened on the loader's own thread: SQLite connections stay on one thread.
+            self.session = etl.get_session()
+            self.index = etl.get_dedup_index(self.data_dir, self.session)
+        self.inserted += len(etl.load_actions(batch, self.session, self.index))
+        self.qa_store.append(batch)
+        return batch
+
+    def close(self):
+        if self.session is not None:
+            self.session.close()
+
+def qa_batch(batch):
+    """The QA stage for one batch: report errors and apply fixes, as qa_data.run() does."""
+    from scripts import qa_data
+    errors, _, _ = qa_data.validate_data(batch)
+    for idx, record, rec_errors in errors:
+        logger.warning("QA: record %r: %s", record.get("title"), "; ".join(rec_errors))
+    return qa_data.fix_data(batch) if errors else batch
+
+@contextmanager
+def _locked(data_dir):
+    """Hold data_dir's pipeline lock; yields False (after logging) if another run holds it."""
+    from scripts.pipeline_daemon import pipeline_lock, LOCK_FILENAME
+    lock_path = os.path.join(data_dir, LOCK_FILENAME)
+    with pipeline_lock(lock_path) as acquired:
+        if not acquired:
+            logger.info("Another pipeline run holds %s; skipping this run.", lock_path)
+        yield acquired
+
+def run_fused(batches, data_dir="data", queue_size=QUEUE_SIZE, snapshots=False, batch_size=BATCH_SIZE):
+    """
+    Theme, QA and load batches of raw actions (e.g. scraped pages) in one process (see
+    module docstring); they are regrouped into batches of batch_size records.
+    With snapshots, the full QA snapshot file is written and published afterwards, as
+    qa_data.run() does. Returns (stats of each stage, records inserted), or ([], 0)
+    without running if another pipeline run holds the lock.
+    """
+    with _locked(data_dir) as acquired:
+        if not acquired:
+            return [], 0
+        return _run_fused(batches, data_dir, queue_size, snapshots, batch_size)
+
+def _run_fused(batches, data_dir, queue_size, snapshots, batch_size):
+    """run_fused() under the pipeline lock."""
+    from scripts import add_themes
+    from scripts.segment_store import SegmentStore
+    qa_store = SegmentStore("qa", root=os.path.join(data_dir, "store"))
+    loader_caught_up = qa_store.manifest["cursors"].get("etl", 0) == qa_store.end_offset
+
+    load = LoadStage(data_dir)
+    stages = [("theme", add_themes.add_themes_to_data), ("qa", qa_batch), ("load", load)]
+    try:
+        stats = run_stages(iter_batches(itertools.chain.from_iterable(batches), batch_size), stages, queue_size)
+    finally:
+        load.close()
+
+    qa_store = SegmentStore("qa", root=os.path.join(data_dir, "store"))
+    if loader_caught_up:
+        qa_store.commit("etl", qa_store.end_offset)  # The records appended here are loaded.
+    if snapshots:
+        write_qa_snapshot(data_dir, qa_store.read_all())
+    return stats, load.inserted
+
+def write_qa_snapshot(data_dir, records):
+    """Write and publish a full QA snapshot, as qa_data.run() does; returns its path."""
+    from dashboard import manifest, json_codec
+    from scripts.segment_store import prune_snapshots, SNAPSHOT_COMPACT
+    path = os.path.join(data_dir, f"presidential_actions_with_themes_qa_fixed_{datetime.now().strftime('%Y%m%d_%H%M%S')}.json")
+    json_codec.dump(records, path, compact=SNAPSHOT_COMPACT)
+    manifest.publish(data_dir, "qa", path, len(records))
+    prune_snapshots(data_dir, "presidential_actions_with_themes_qa_fixed_")
+    return path
+
+def run(data_dir="data", incremental=True, snapshots=False, queue_size=QUEUE_SIZE):
+    """Scrape the archive (only new pages if incremental) and stream it straight into the database."""
+    from scripts import scrape_presidential_actions as scraper
+    with _locked(data_dir) as acquired:
+        if not acquired:
+            return [], 0
+        pages = scraper.iter_pages(scraper.BASE_URL, scraper.known_action_check(incremental, data_dir))
+        started = time.perf_counter()
+        stats, inserted = _run_fused(pages, data_dir, queue_size, snapshots, BATCH_SIZE)
+        elapsed = time.perf_counter() - started
+    for stage in stats:
+        logger.info("%r", stage)
+    logger.info("Streamed %d actions in %.1fs; %d inserted.", stats[0].records_in, elapsed, inserted)
+    return stats, inserted
+
+if __name__ == "__main__":
+    logging.basicConfig(level=logging.INFO)
+    run("data", snapshots="--snapshots" in sys.argv)
@@ -0,0 +1,48 @@
+# scripts/tests/test_action_store.py
+
+from dashboard.action_store import ActionStore
+from dashboard.aggregation import aggregate, aggregate_rows, count_days, count_themes
+
+RECORDS = [
+    {"title": "One", "date": "2025-02-09T17:08:57-05:00", "themes": ["Economic", "Celebratory"]},
+    {"title": "Twö", "date": "2025-02-07T19:04:14+05:30", "themes": ["Economic"]},
+    {"title": "One", "date": "2025-02-09T17:08:57-05:00", "themes": ["Economic", "Celebratory"]},
+    {"title": "Naive", "date": "2025-01-20T23:59:00", "themes": []},
+    {"title": "Zulu", "date": "2025-01-21T00:00:00-00:00", "themes": ["Economic"], "source_url": "https://x"},
+    {"title": "", "date": "not a date", "themes": ["Economic", "Economic"]},
+    {"title": "No date", "themes": None},
+    {"date": "", "themes": "Economic"},
+]
+
+def test_records_round_trip():
+    store = ActionStore.from_records(RECORDS)
+    assert len(store) == len(RECORDS)
+    assert store.to_records() == RECORDS
+    assert store.themes(0) == ["Economic", "Celebratory"]
+    assert store.theme_counts() == {"Economic": 6, "Celebratory": 2}
+    assert store.nbytes < 400
+
+def test_aggregate_matches_records():
+    records = RECORDS[:6]  # aggregate_rows() needs a themes list.
+    expected, counts = aggregate_rows(records), aggregate(ActionStore.from_records(records))
+    for name in ("total", "days", "hours_of_day", "hours_of_week", "hourly", "hourly_offset", "themes"):
+        assert getattr(counts, name) == getattr(expected, name), name
+    assert list(counts.failed) == expected.failed
+
+def test_filter_and_take():
+    store = ActionStore.from_records(RECORDS)
+    february = store.filter(start="2025-02-01", end="2025-02-28")
+    assert [r["title"] for r in february] == ["One", "Twö", "One"]
+    assert [r["title"] for r in store.filter(theme="Celebratory")] == ["One", "One"]
+    assert store.take([4, 0]).to_records() == [RECORDS[4], RECORDS[0]]
+
+def test_filters_and_counts_match_dict_versions():
+    from dashboard.app import matches_filters
+    store = ActionStore.from_records(RECORDS)
+    for start, end, theme in [("2025-01-21", None, None), (None, "2025-02-07", "Economic"),
+                              (None, None, "Celebratory"), (None, None, "Economic")]:
+        expected = [r for r in RECORDS if matches_filters(r, start, end, theme)]
+        assert store.filter(start, end, theme).to_records() == expected
+    records = RECORDS[:6]
+    assert count_days(ActionStore.from_records(records)) == count_days(records)
+    assert count_themes(ActionStore.from_records(records)) == count_themes(records)
@@ -0,0 +1,71 @@
+# scripts/tests/test_aggregation.py
+
+from datetime import datetime
+
+import pytest
+
+from dashboard.aggregation import aggregate, count_days, count_themes
+
+ACTIONS = [
+    {"date": "2025-02-09T17:08:57-05:00", "themes": ["Celebratory"]},
+    {"date": "2025-02-07T19:04:14-05:00", "themes": ["Cultural & Traditional Values", "Economic"]},
+    {"date": "2025-02-07T19:40:00-05:00", "themes": ["Economic"]},
+    {"date": "2025-02-07Tnot-a-time", "themes": []},
+    {"title": "undated", "themes": ["Economic"]},
+]
+
+def test_single_pass_fills_every_bucket():
+    counts = aggregate(ACTIONS)
+    assert counts.total == 5
+    assert counts.daily() == [("2025-02-07", 3), ("2025-02-09", 1)]
+    assert counts.hour_of_day_counts()[19] == 2 and sum(counts.hour_of_day_counts().values()) == 3
+    # 2025-02-09 is a Sunday (weekday 6).
+    assert counts.hour_of_week_counts()[6 * 24 + 17] == 1
+    assert counts.theme_counts()[0] == ("Economic", 3)
+    assert [e[0] for e in counts.errors] == ["2025-02-07Tnot-a-time"]
+
+def test_day_and_theme_counts_match_aggregate(monkeypatch):
+    counts = aggregate(ACTIONS)
+    monkeypatch.setattr("dashboard.aggregation.datetime", None)  # No date is parsed.
+    assert count_days(ACTIONS) == counts.daily()
+    assert count_themes(ACTIONS) == counts.theme_counts()
+
+def test_hourly_timeline_is_sparse_with_dense_view():
+    timeline = aggregate(ACTIONS).hourly_timeline()
+    assert timeline.items() == [
+        (datetime.fromisoformat("2025-02-07T19:00:00-05:00"), 2),
+        (datetime.fromisoformat("2025-02-09T17:00:00-05:00"), 1),
+    ]
+    assert str(timeline.items()[0][0]) == "2025-02-07 19:00:00-05:00"
+    first, counts = timeline.dense()
+    assert first == datetime.fromisoformat("2025-02-07T19:00:00-05:00")
+    assert len(counts) == 47 and counts[0] == 2 and counts[-1] == 1 and sum(counts) == 3
+    # A window: from 2025-02-09 16:30 (snapped down to the hour) to the end.
+    first, counts = timeline.dense(datetime.fromisoformat("2025-02-09T16:30:00-05:00"))
+    assert first.hour == 16 and list(counts) == [0, 1]
+
+def test_dense_view_is_bounded():
+    timeline = aggregate(ACTIONS + [{"date": "1990-01-01T00:00:00-05:00"}]).hourly_timeline()
+    assert len(timeline) == 3
+    with pytest.raises(ValueError):
+        timeline.dense(max_hours=24 * 365)
+    _, counts = timeline.dense(datetime(2025, 2, 7), max_hours=24 * 365)
+    assert sum(counts) == 3
+
+def test_columnar_matches_per_record_path():
+    from dashboard.aggregation import aggregate_rows
+    from dashboard.timestamps import aggregate_columnar
+    actions = ACTIONS + [
+        {"date": "2025-02-30T10:00:00-05:00"},         # Impossible day: fails in both paths.
+        {"date": "2025-02-09T17:08:57.123456-05:00"},  # Not canonical: reference parser.
+        {"date": "2025-02-09 23:30:00+05:30"},          # Space separator, half-hour offset.
+        {"date": "2025-02-08T23:59:59+05:30"},
+        {"date": "2025-02-08T00:30:00-01:00", "themes": ["Economic"]},
+    ]
+    rows, columnar = aggregate_rows(actions), aggregate_columnar(actions)
+    for name in ("days", "hours_of_day", "hours_of_week", "hourly", "themes"):
+        assert getattr(columnar, name) == getattr(rows, name), name
+    assert columnar.hourly_offset == rows.hourly_offset == -5 * 3600
+    assert columnar.hourly_timeline().items() == rows.hourly_timeline().items()
+    assert list(columnar.failed) == rows.failed
+    assert [e[0] for e in columnar.errors] == ["2025-02-07Tnot-a-time", "2025-02-30T10:00:00-05:00"]
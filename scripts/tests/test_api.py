@@ -0,0 +1,85 @@
+# scripts/tests/test_api.py
+
+import gzip
+import json
+import pytest
+
+import dashboard.app as dashboard_app
+
+ACTIONS = [
+    {"title": "Gulf of America Day, 2025", "date": "2025-02-09T17:08:57-05:00", "themes": ["Celebratory"]},
+    {"title": "Protecting Second Amendment Rights", "date": "2025-02-07T19:04:14-05:00",
+     "themes": ["Cultural & Traditional Values"]},
+    {"title": "Establishment of The White House Faith Office", "date": "2025-02-07T18:40:00-05:00",
+     "themes": ["Cultural & Traditional Values"]},
+    {"title": "Initial Rescissions", "date": "2025-01-20T23:59:00-05:00", "themes": ["America First"]},
+]
+
+@pytest.fixture
+def client(tmp_path, monkeypatch):
+    (tmp_path / "presidential_actions_with_themes_20250209_222540.json").write_text(json.dumps(ACTIONS))
+    monkeypatch.setattr(dashboard_app, "DATA_DIR", str(tmp_path))
+    return dashboard_app.create_app().test_client()
+
+def test_daily_with_filters(client):
+    response = client.get("/api/daily?start=2025-02-01&theme=Cultural%20%26%20Traditional%20Values")
+    assert response.status_code == 200
+    assert response.get_json() == [{"date": "2025-02-07", "count": 2}]
+
+def test_bad_filter_is_rejected(client):
+    assert client.get("/api/hourly?start=yesterday").status_code == 400
+
+def test_etag_revalidation(client):
+    first = client.get("/api/themes")
+    etag = first.headers["ETag"]
+    assert etag.startswith('"')
+    second = client.get("/api/themes", headers={"If-None-Match": etag})
+    assert second.status_code == 304
+    assert second.data == b""
+    assert client.get("/api/themes?end=2025-01-31", headers={"If-None-Match": etag}).status_code == 200
+
+def test_gzip_when_accepted(client, monkeypatch):
+    monkeypatch.setattr("dashboard.http_cache.MIN_COMPRESS_SIZE", 0)
+    response = client.get("/api/actions", headers={"Accept-Encoding": "gzip"})
+    assert response.headers["Content-Encoding"] == "gzip"
+    assert response.headers["Vary"] == "Accept-Encoding"
+    assert len(json.loads(gzip.decompress(response.data))["actions"]) == 4
+
+def test_actions_cursor_pagination(client):
+    titles, cursor = [], None
+    while True:
+        url = "/api/actions?limit=3" + (f"&cursor={cursor}" if cursor else "")
+        page = client.get(url).get_json()
+        titles.extend(a["title"] for a in page["actions"])
+        cursor = page["next_cursor"]
+        if cursor is None:
+            break
+    assert titles == [a["title"] for a in ACTIONS]
+
+def test_cursor_pagination_keeps_duplicates(tmp_path, monkeypatch):
+    duplicates = [dict(ACTIONS[1]) for _ in range(3)] + [ACTIONS[0]]  # QA reports duplicates but keeps them.
+    (tmp_path / "presidential_actions_with_themes_20250209_222540.json").write_text(json.dumps(duplicates))
+    monkeypatch.setattr(dashboard_app, "DATA_DIR", str(tmp_path))
+    client = dashboard_app.create_app().test_client()
+    first = client.get("/api/actions?limit=2").get_json()
+    second = client.get(f"/api/actions?limit=2&cursor={first['next_cursor']}").get_json()
+    assert [a["title"] for a in first["actions"] + second["actions"]] == [a["title"] for a in duplicates[::-1]]
+    assert client.get("/api/actions?cursor=WzEsIngiXQ==").status_code == 400  # [1,"x"]: no position.
+
+def test_daily_resolution(client):
+    response = client.get("/api/daily?resolution=month")
+    assert response.headers["X-Resolution"] == "month"
+    assert response.get_json() == [{"date": "2025-01", "count": 1}, {"date": "2025-02", "count": 3}]
+    assert client.get("/api/daily").headers["X-Resolution"] == "day"
+    assert client.get("/api/daily?resolution=year").get_json() == [{"date": "2025", "count": 4}]
+    assert client.get("/api/daily?resolution=decade").status_code == 400
+
+def test_served_from_published_store(client, tmp_path, monkeypatch):
+    source_file = dashboard_app.publish_aggregates(str(tmp_path))
+    assert (tmp_path / "aggregates.db").exists()
+    expected = client.get("/api/themes").data
+    dashboard_app.api_payload.cache_clear()
+    monkeypatch.setattr(dashboard_app, "build_api_payload", None)  # Any recompute would fail.
+    assert client.get("/api/themes").data == expected
+    assert client.get("/api/daily").headers["X-Resolution"] == "day"
+    assert dashboard_app.aggregate_store.get(str(tmp_path), source_file, "charts") is not None
@@ -0,0 +1,59 @@
+# scripts/tests/test_charts.py
+"""Snapshot parity: the chart-spec builder must emit the same JSON as the go.Figure code it replaced."""
+
+import json
+import plotly.graph_objs as go
+import plotly.io as pio
+
+from dashboard import charts
+
+DAILY = [("2025-01-20", 12), ("2025-01-21", 3), ("2025-02-07", 5)]
+HOURLY = {h: (h * 7) % 5 for h in range(24)}
+THEMES = [("National Security & Border Enforcement", 9), ("America First", 4), ("Foreign Policy Realignment", 1)]
+
+def reference_daily(aggregated_data):
+    dates, counts = zip(*aggregated_data)
+    fig = go.Figure(data=[go.Bar(x=dates, y=counts, marker_color='#00704A')])
+    fig.update_layout(title="Number of Presidential Actions per Day", xaxis_title="Date",
+                      yaxis_title="Number of Actions", template="plotly_dark")
+    return pio.to_json(fig)
+
+def reference_polar(hourly_counts):
+    hours = list(range(24))
+    counts = [hourly_counts[h] for h in hours]
+    theta = [h * 15 for h in hours]
+    fig = go.Figure(go.Barpolar(r=counts, theta=theta, width=[15]*24, marker_color=counts,
+                                marker_colorscale='Portland', marker_line_color="white",
+                                marker_line_width=1, opacity=0.8))
+    fig.update_layout(
+        title="Aggregated Presidential Actions per Hour of Day",
+        polar=dict(
+            angularaxis=dict(direction="clockwise", tickmode="array", tickvals=theta,
+                             ticktext=[f"{h}:00" for h in hours], period=360, color='white'),
+            radialaxis=dict(ticksuffix=" PA", dtick=1, color='white')
+        ),
+        showlegend=False,
+        template="plotly_dark"
+    )
+    return pio.to_json(fig)
+
+def reference_theme(aggregated_theme_data):
+    themes, counts = zip(*aggregated_theme_data)
+    fig = go.Figure(data=[go.Bar(x=list(counts)[::-1], y=list(themes)[::-1], orientation='h',
+                                 marker_color='#FF9900')])
+    fig.update_layout(title="Presidential Actions by Theme", xaxis_title="Count of Actions",
+                      yaxis_title="Theme", template="plotly_dark")
+    return pio.to_json(fig)
+
+def test_daily_chart_parity():
+    assert json.loads(charts.daily_chart_json(DAILY)) == json.loads(reference_daily(DAILY))
+
+def test_polar_chart_parity():
+    assert json.loads(charts.polar_chart_json(HOURLY)) == json.loads(reference_polar(HOURLY))
+
+def test_theme_chart_parity():
+    assert json.loads(charts.theme_chart_json(THEMES)) == json.loads(reference_theme(THEMES))
+
+def test_empty_inputs():
+    assert charts.daily_chart_json([]) is None
+    assert charts.theme_chart_json([]) is None
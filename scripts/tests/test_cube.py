@@ -0,0 +1,76 @@
+# scripts/tests/test_cube.py
+
+import json
+from datetime import datetime
+
+import pytest
+from sqlalchemy import create_engine
+from sqlalchemy.orm import sessionmaker
+
+import dashboard.app as dashboard_app
+from dashboard.cube import CountCube, NO_THEME
+from dashboard.models import Base, PresidentialAction
+from dashboard.rollups import apply_rollups, rebuild_rollups
+
+ACTIONS = [
+    {"date": "2025-02-09T17:08:57-05:00", "themes": ["Celebratory"]},  # Sunday
+    {"date": "2025-02-07T19:04:14-05:00", "themes": ["Cultural & Traditional Values", "Economic"]},  # Friday
+    {"date": "2025-02-07T19:40:00-05:00", "themes": ["Economic"]},
+    {"date": "2025-01-20T23:59:00-05:00", "themes": []},  # Monday
+    {"date": "not a date", "themes": ["Economic"]},
+]
+
+def test_rollup_slice_and_drill_down():
+    cube = CountCube.from_actions(ACTIONS)
+    assert cube.days == ["2025-01-20", "2025-02-07", "2025-02-09"]
+    assert cube.total == 5  # Unparseable dates are not in the cube.
+    assert cube.cells("theme") == {NO_THEME: 1, "Celebratory": 1, "Cultural & Traditional Values": 1, "Economic": 2}
+    # A theme's hourly profile in a date range.
+    assert cube.slice("2025-02-01", "2025-02-28", themes=["Economic"]).cells("hour") == {19: 2}
+    assert cube.cells("weekday", "hour") == {(0, 23): 1, (4, 19): 3, (6, 17): 1}
+    assert cube.cells("month") == {"2025-01": 1, "2025-02": 4}
+    axes, counts = cube.drill_down("month", "2025-02", "day")
+    assert axes == [["2025-02-07", "2025-02-09"]] and counts.tolist() == [3, 1]
+    assert cube.rollup("hour", "theme")[1].shape == (24, 4)
+    with pytest.raises(ValueError):
+        cube.rollup("week", "month")
+
+def test_serialized_cube_round_trips():
+    cube = CountCube.from_actions(ACTIONS)
+    restored = CountCube.from_bytes(cube.to_bytes())
+    assert restored.days == cube.days and restored.themes == cube.themes
+    assert (restored.counts == cube.counts).all()
+    assert CountCube.from_actions([]).cells("hour") == {}
+
+def test_rollup_table_matches_rebuild(tmp_path):
+    engine = create_engine(f"sqlite:///{tmp_path / 'cube.db'}")
+    Base.metadata.create_all(engine)
+    session = sessionmaker(bind=engine)()
+    actions = [
+        PresidentialAction("One", datetime(2025, 2, 8, 9, 30), theme="Economy"),
+        PresidentialAction("Two", datetime(2025, 2, 8, 9, 5), theme="Economy"),
+        PresidentialAction("Three", datetime(2025, 2, 9, 23, 59)),
+    ]
+    session.add_all(actions)
+    apply_rollups(session, actions)
+    session.commit()
+    incremental = CountCube.from_session(session).cells("day", "hour", "theme")
+    assert incremental == {("2025-02-08", 9, "Economy"): 2, ("2025-02-09", 23, NO_THEME): 1}
+    rebuild_rollups(session)
+    assert CountCube.from_session(session).cells("day", "hour", "theme") == incremental
+    session.close()
+
+@pytest.fixture
+def client(tmp_path, monkeypatch):
+    (tmp_path / "presidential_actions_with_themes_20250209_222540.json").write_text(json.dumps(ACTIONS))
+    monkeypatch.setattr(dashboard_app, "DATA_DIR", str(tmp_path))
+    dashboard_app.cube_cache.clear()
+    return dashboard_app.create_app().test_client()
+
+def test_cube_api_and_heatmaps(client):
+    body = client.get("/api/cube?by=weekday,hour&theme=Economic").get_json()
+    assert body["by"] == ["weekday", "hour"] and body["axes"][0] == list(range(7))
+    assert body["counts"][4][19] == 2
+    assert client.get("/api/cube?by=day,month").status_code == 400
+    page = client.get("/heatmaps?start=2025-02-01")
+    assert page.status_code == 200 and b"weekday-heatmap" in page.data
@@ -0,0 +1,41 @@
+# scripts/tests/test_dashboard_cache.py
+
+import threading
+import time
+
+from dashboard.cache import FileKeyedCache
+
+def test_cache_rebuilds_only_when_file_changes(tmp_path):
+    data_file = tmp_path / "data.json"
+    data_file.write_text("[]")
+    builds = []
+    cache = FileKeyedCache()
+    build = lambda path: builds.append(path) or len(builds)
+
+    assert cache.get(str(data_file), build) == 1
+    assert cache.get(str(data_file), build) == 1
+
+    data_file.write_text("[1]")  # Size changes even if the mtime resolution is coarse.
+    assert cache.get(str(data_file), build) == 2
+    assert len(builds) == 2
+
+def test_concurrent_misses_build_once(tmp_path):
+    data_file = tmp_path / "data.json"
+    data_file.write_text("[]")
+    builds = []
+    cache = FileKeyedCache()
+
+    def slow_build(path):
+        builds.append(path)
+        time.sleep(0.05)
+        return "charts"
+
+    results = []
+    threads = [threading.Thread(target=lambda: results.append(cache.get(str(data_file), slow_build)))
+               for _ in range(8)]
+    for t in threads:
+        t.start()
+    for t in threads:
+        t.join()
+    assert results == ["charts"] * 8
+    assert len(builds) == 1
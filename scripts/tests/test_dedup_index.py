@@ -0,0 +1,74 @@
+# scripts/tests/test_dedup_index.py
+
+import random
+
+from sqlalchemy import create_engine
+from sqlalchemy.orm import sessionmaker
+
+from dashboard.models import Base
+from scripts import etl, add_themes, qa_data
+from scripts import scrape_presidential_actions as scraper
+from scripts.dedup_index import BloomFilter, DedupIndex, open_index, record_keys
+from scripts.segment_store import SegmentStore
+
+ACTIONS = [
+    {"title": "Protecting American Energy", "date": "2025-02-09T17:08:57-05:00", "themes": ["Economic"]},
+    {"title": "National Day of Remembrance", "date": "2025-02-07T19:04:14-05:00", "themes": []},
+]
+
+def make_session(tmp_path):
+    engine = create_engine(f"sqlite:///{tmp_path / 'actions.db'}")
+    Base.metadata.create_all(engine)
+    return sessionmaker(bind=engine)()
+
+def test_bloom_filter_has_no_false_negatives():
+    random.seed(0)
+    keys = [random.getrandbits(64) - 2 ** 63 for _ in range(20000)]
+    bloom = BloomFilter(10000, 0.01)
+    bloom.add(keys[:10000])
+    assert bloom.might_contain(keys[:10000]).all()
+    assert bloom.might_contain(keys[10000:]).mean() < 0.03
+    restored = BloomFilter(10000, 0.01, bloom.to_bytes())
+    assert (restored.might_contain(keys) == bloom.might_contain(keys)).all()
+
+def test_index_matches_the_etl_keys_and_grows(tmp_path):
+    index = DedupIndex(str(tmp_path / "dedup.db"), capacity=100)
+    assert index.drop_known(ACTIONS) == (ACTIONS, 0)
+    assert index.exact_lookups == 0  # Nothing indexed: the bloom filter answers alone.
+    session = make_session(tmp_path)
+    keys = [action.hash_key for action in etl.insert_batch(session, etl.rows_from_actions(ACTIONS[:1]))]
+    assert keys == record_keys(ACTIONS[:1])
+    assert index.add(keys + keys) == 1
+    # Identity, not content: a re-themed copy of a loaded action is still known.
+    assert index.drop_known([dict(ACTIONS[0], themes=["Other"]), ACTIONS[1]]) == ([ACTIONS[1]], 1)
+    index.add(range(500))  # Past capacity: the bloom filter is resized, keys survive.
+    reopened = DedupIndex(str(tmp_path / "dedup.db"))
+    assert len(reopened) == 501 and reopened.bloom.capacity > 500
+    assert reopened.known(keys + [499, 1000]) == set(keys + [499])
+
+def test_load_keeps_index_in_sync_with_database(tmp_path):
+    session = make_session(tmp_path)
+    etl.load_actions(ACTIONS[:1], session)  # Loaded without the index.
+    index = etl.get_dedup_index(str(tmp_path), session)  # Stale: rebuilt from the database.
+    assert index.known(record_keys(ACTIONS)) == set(record_keys(ACTIONS[:1]))
+    inserted = etl.load_actions(ACTIONS, session, index)
+    assert [a.action_title for a in inserted] == [ACTIONS[1]["title"]]
+    assert index.known(record_keys(ACTIONS)) == set(record_keys(ACTIONS))
+    assert not index.sync(session)  # The ETL recorded the database state with its keys.
+    assert open_index(str(tmp_path)).drop_known(ACTIONS) == ([], 2)
+
+def test_known_actions_still_reach_the_qa_stream(tmp_path, monkeypatch):
+    session = make_session(tmp_path)
+    etl.load_actions(ACTIONS, session, etl.get_dedup_index(str(tmp_path), session))  # Loaded another way.
+    SegmentStore("raw", root=str(tmp_path / "store")).append(ACTIONS)
+    add_themes.run(str(tmp_path))
+    qa_data.run(str(tmp_path))
+    assert len(SegmentStore("qa", root=str(tmp_path / "store")).read_all()) == 2
+
+    calls = []
+    drop_known = DedupIndex.drop_known
+    monkeypatch.setattr(DedupIndex, "drop_known", lambda self, records: calls.append(len(records)) or drop_known(self, records))
+    page_known = scraper.known_action_check(True, str(tmp_path))
+    rethemed = [dict(a, themes=["Other"]) for a in ACTIONS]  # Not in the raw stream; known to the index.
+    assert page_known(rethemed) and calls == [2]  # One index lookup per page.
+    assert not page_known(rethemed + [dict(ACTIONS[0], title="New")])
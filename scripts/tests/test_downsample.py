@@ -0,0 +1,42 @@
+# scripts/tests/test_downsample.py
+
+from datetime import date, timedelta
+
+from dashboard.downsample import DailyLevels, bucket_counts, choose_resolution, lttb
+
+def daily_series(start, days):
+    first = date.fromisoformat(start)
+    return [((first + timedelta(days=i)).isoformat(), 1) for i in range(days)]
+
+def test_resolution_follows_span_and_budget():
+    assert choose_resolution("2025-01-01", "2025-03-31", max_points=100) == "day"
+    assert choose_resolution("2024-01-01", "2025-12-31", max_points=200) == "week"
+    assert choose_resolution("2015-01-01", "2025-12-31", max_points=200) == "month"
+    # Below the number of months the budget is met with yearly buckets.
+    assert choose_resolution("2017-01-20", "2025-02-09", max_points=20) == "year"
+    assert DailyLevels(daily_series("2017-01-20", 2940)).series(max_points=20) == (
+        "year", [("2017", 346), ("2018", 365), ("2019", 365), ("2020", 366), ("2021", 365),
+                 ("2022", 365), ("2023", 365), ("2024", 366), ("2025", 37)])
+
+def test_buckets_preserve_totals():
+    series = daily_series("2025-01-01", 90)
+    weeks = bucket_counts(series, "week")
+    assert weeks[0] == ("2024-12-30", 5)  # 2025-01-01 is a Wednesday.
+    assert sum(c for _, c in weeks) == 90
+    assert bucket_counts(series, "month") == [("2025-01", 31), ("2025-02", 28), ("2025-03", 31)]
+
+def test_levels_slice_by_range():
+    levels = DailyLevels(daily_series("2020-01-01", 2000))
+    resolution, series = levels.series(max_points=100)
+    assert resolution == "month" and len(series) <= 100
+    resolution, series = levels.series("2021-03-01", "2021-03-10", max_points=100)
+    assert resolution == "day" and series[0] == ("2021-03-01", 1) and len(series) == 10
+    assert levels.series("2021-03-01", "2021-03-31", resolution="month")[1] == [("2021-03", 31)]
+
+def test_lttb_keeps_ends_and_spike():
+    points = [(i, 0) for i in range(1000)]
+    points[500] = (500, 50)
+    sampled = lttb(points, 20)
+    assert len(sampled) == 20
+    assert sampled[0] == points[0] and sampled[-1] == points[-1]
+    assert (500, 50) in sampled
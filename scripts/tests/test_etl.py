@@ -162,3 +162,45 @@ def test_retry_mechanism(monkeypatch, tmp_path, test_db):
     # Verify the record has been inserted.
     inserted = test_db.query(PresidentialAction).filter_by(action_title="Flaky Action").first()
     assert inserted is not None
+
+# ------------------------------------------------------------------------------
+# Test: Migration of a database built from the original schema
+# ------------------------------------------------------------------------------
+
+# presidential_actions as created by the models before hash_key existed.
+BASELINE_SCHEMA = """
+CREATE TABLE presidential_actions (
+    id INTEGER NOT NULL PRIMARY KEY,
+    action_title VARCHAR NOT NULL,
+    action_timestamp DATETIME NOT NULL,
+    source_url VARCHAR,
+    theme VARCHAR,
+    hash_value VARCHAR NOT NULL,
+    CONSTRAINT _hash_uc UNIQUE (hash_value),
+    UNIQUE (hash_value)
+)
+"""
+
+def test_get_session_migrates_baseline_schema(tmp_path, monkeypatch):
+    import sqlite3
+    from dashboard.models import DailyCount, compute_hash_value
+    db_file = tmp_path / "legacy.db"
+    with sqlite3.connect(db_file) as conn:
+        conn.execute(BASELINE_SCHEMA)
+        conn.execute("INSERT INTO presidential_actions (action_title, action_timestamp, hash_value) VALUES (?, ?, ?)",
+                     ("Old Action", "2020-01-01 00:00:00.000000",
+                      compute_hash_value("Old Action", datetime(2020, 1, 1), None)))
+    monkeypatch.setattr(etl, "DB_URI", f"sqlite:///{db_file}")
+
+    session = etl.get_session()
+    try:
+        assert session.query(PresidentialAction).one().hash_key is not None  # Backfilled.
+        assert session.query(DailyCount).one().count == 1  # Rollups built for the old row.
+        actions = [{"title": "Old Action", "date": "2020-01-01T00:00:00"},
+                   {"title": "New Action", "date": "2020-01-02T00:00:00"}]
+        inserted = etl.load_actions(actions, session)
+        assert [a.action_title for a in inserted] == ["New Action"]
+        assert inserted[0].hash_value == compute_hash_value("New Action", datetime(2020, 1, 2), None)
+    finally:
+        session.close()
+    etl.get_session().close()  # Migrating again is a no-op.
@@ -0,0 +1,54 @@
+# scripts/tests/test_events.py
+
+import json
+from datetime import datetime
+
+from dashboard.events import EventBroker, deltas_from_actions, stream_events
+from dashboard.models import PresidentialAction
+
+def test_deltas_from_actions():
+    actions = [
+        PresidentialAction("One", datetime(2025, 2, 8, 9, 30), theme="Economy"),
+        PresidentialAction("Two", datetime(2025, 2, 8, 17, 5)),
+        # Counted once per theme, as the theme chart counts it.
+        PresidentialAction("Three", datetime(2025, 2, 9, 9, 0), theme="Economy", themes=["Economy", "Security"]),
+    ]
+    assert deltas_from_actions(actions) == {
+        "total": 3,
+        "daily": {"2025-02-08": 2, "2025-02-09": 1},
+        "daily_rollups": {"week": {"2025-02-03": 3}, "month": {"2025-02": 3}, "year": {"2025": 3}},
+        "hourly": {"9": 2, "17": 1},
+        "themes": {"Economy": 2, "Security": 1},
+    }
+
+def test_stream_delivers_published_events():
+    broker = EventBroker()
+    stream = stream_events(broker, heartbeat=0.01)
+    assert next(stream).startswith("retry:")
+    broker.publish("delta", {"total": 1})
+    assert next(stream) == 'event: delta\ndata: {"total":1}\n\n'
+    stream.close()
+    assert broker.subscriber_count == 0
+
+def test_stream_signals_refresh_when_version_changes():
+    versions = iter([1, 1, 2])
+    stream = stream_events(EventBroker(), data_version=lambda: next(versions), heartbeat=0.01)
+    next(stream)
+    assert next(stream) == ": keep-alive\n\n"
+    event = next(stream)
+    assert event.startswith("event: refresh")
+    assert json.loads(event.split("data: ")[1]) == {"version": "2"}
+
+def test_slow_subscriber_is_dropped():
+    broker = EventBroker(queue_size=1)
+    broker.subscribe()
+    broker.publish("delta", {})
+    broker.publish("delta", {})
+    assert broker.subscriber_count == 0
+
+def test_broker_limits_open_streams():
+    broker = EventBroker(max_subscribers=1)
+    first = broker.subscribe()
+    assert broker.subscribe() is None
+    broker.unsubscribe(first)
+    assert broker.subscribe() is not None
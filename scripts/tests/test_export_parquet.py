@@ -0,0 +1,27 @@
+# scripts/tests/test_export_parquet.py
+
+from dashboard.app import aggregate_by_day, aggregate_by_hour_of_day, aggregate_by_theme
+from scripts.export_parquet import export_parquet, load_parquet, load_parquet_actions
+
+ACTIONS = [
+    {"title": "Gulf of America Day, 2025", "date": "2025-02-09T17:08:57-05:00", "themes": ["Celebratory"]},
+    {"title": "Protecting Second Amendment Rights", "date": "2025-02-07T19:04:14-05:00",
+     "themes": ["Cultural & Traditional Values", "National Security"]},
+    {"title": "Initial Rescissions", "date": "2025-01-20T23:59:00-05:00", "themes": ["America First"]},
+]
+
+def test_export_partitions_by_month(tmp_path):
+    assert export_parquet(ACTIONS, str(tmp_path)) == 3
+    partitions = sorted(p.name for p in tmp_path.iterdir())
+    assert partitions == ["month=2025-01", "month=2025-02"]
+
+    df = load_parquet(str(tmp_path), columns=["title"], months=["2025-01"])
+    assert list(df.columns) == ["title"]
+    assert df["title"].tolist() == ["Initial Rescissions"]
+
+def test_loaded_actions_aggregate_like_json(tmp_path):
+    export_parquet(ACTIONS, str(tmp_path))
+    loaded = load_parquet_actions(str(tmp_path))
+    assert aggregate_by_day(loaded) == aggregate_by_day(ACTIONS)
+    assert aggregate_by_hour_of_day(loaded) == aggregate_by_hour_of_day(ACTIONS)
+    assert sorted(aggregate_by_theme(loaded)) == sorted(aggregate_by_theme(ACTIONS))
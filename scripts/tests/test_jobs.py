@@ -0,0 +1,44 @@
+# scripts/tests/test_jobs.py
+
+import threading
+
+from dashboard.jobs import RefreshJob
+
+def test_single_flight_and_status():
+    release = threading.Event()
+    runs = []
+
+    def pipeline(on_stage):
+        runs.append(1)
+        on_stage("scrape", "running", None, None)
+        release.wait(5)
+        on_stage("scrape", "succeeded", 0.25, "3 actions scraped")
+
+    job = RefreshJob(pipeline, ["scrape"])
+    started, status = job.start()
+    assert started and status["state"] == "running"
+    joined, status = job.start()
+    assert not joined and status["run"] == 1
+
+    release.set()
+    job.wait(5)
+    status = job.status()
+    assert runs == [1]
+    assert status["state"] == "succeeded"
+    assert status["stages"] == [{"name": "scrape", "status": "succeeded", "seconds": 0.25,
+                                 "detail": "3 actions scraped"}]
+
+def test_failure_is_reported_and_job_can_restart():
+    def pipeline(on_stage):
+        on_stage("load", "failed", 0.1, "database is locked")
+        raise RuntimeError("database is locked")
+
+    job = RefreshJob(pipeline, ["load"])
+    job.start()
+    job.wait(5)
+    assert job.status()["state"] == "failed"
+    assert job.status()["error"] == "database is locked"
+
+    started, status = job.start()
+    assert started and status["run"] == 2
+    job.wait(5)
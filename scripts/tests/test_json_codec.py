@@ -0,0 +1,47 @@
+# scripts/tests/test_json_codec.py
+
+import json
+import hashlib
+
+import numpy as np
+import pytest
+
+from dashboard import json_codec, manifest
+
+RECORDS = [
+    {"title": "Protecting American Energy", "date": "2025-02-09T17:08:57-05:00", "themes": ["Economic"]},
+    {"title": "Día de la Hispanidad \"2025\"", "date": "2025-10-12T09:00:00-04:00", "themes": [], "extra": {}},
+]
+
+@pytest.fixture(params=["orjson", "json"])
+def backend(request, monkeypatch):
+    if request.param == "json":
+        monkeypatch.setattr(json_codec, "orjson", None)
+    elif json_codec.orjson is None:
+        pytest.skip("orjson is not installed")
+    return request.param
+
+def test_round_trip_matches_the_json_module(backend):
+    assert json_codec.loads(json_codec.dumps(RECORDS)) == RECORDS
+    assert json_codec.dumps(RECORDS) == json.dumps(RECORDS, indent=2, ensure_ascii=False).encode("utf-8")
+    assert json_codec.dumps(RECORDS, compact=True) == json.dumps(
+        RECORDS, separators=(",", ":"), ensure_ascii=False).encode("utf-8")
+    assert json_codec.dumps({1: np.arange(3), "n": np.int64(4)}, compact=True) == b'{"1":[0,1,2],"n":4}'
+    with pytest.raises(json_codec.JSONDecodeError):
+        json_codec.loads(b'[{"title": ')
+
+def test_files_are_written_as_bytes(backend, tmp_path):
+    path = tmp_path / "snapshot.json"
+    json_codec.dump(RECORDS, str(path), compact=True)
+    assert b"\n" not in path.read_bytes()
+    assert json_codec.load(str(path)) == RECORDS
+    with open(path, "r", encoding="utf-8") as f:
+        assert json.load(f) == RECORDS
+
+def test_snapshot_digests_do_not_depend_on_the_backend(backend, tmp_path):
+    path = tmp_path / "snapshot.json"
+    json_codec.dump(RECORDS, str(path))
+    assert manifest.file_checksum(str(path)) == hashlib.sha256(
+        json.dumps(RECORDS, indent=2, ensure_ascii=False).encode("utf-8")).hexdigest()
+    floats = [1e-05, 1e20, 0.1, 1.2345678901234568e17]
+    assert json_codec.loads(json_codec.dumps(floats)) == floats  # Notation differs, values do not.
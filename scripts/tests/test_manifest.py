@@ -0,0 +1,39 @@
+# scripts/tests/test_manifest.py
+
+import json
+
+from dashboard import manifest
+from scripts.add_themes import load_latest_json, save_updated_data
+
+def test_publish_and_resolve(tmp_path):
+    data_file = tmp_path / "presidential_actions_20250209_165414.json"
+    data_file.write_text(json.dumps([{"title": "A"}]))
+    entry = manifest.publish(str(tmp_path), "raw", str(data_file), 1)
+
+    assert entry["records"] == 1
+    assert manifest.resolve_latest(str(tmp_path), "raw") == str(data_file)
+    assert manifest.verify(str(tmp_path), "raw")
+    data_file.write_text("[]")
+    assert not manifest.verify(str(tmp_path), "raw")
+
+def test_resolve_latest_picks_newest_stage_and_skips_missing_files(tmp_path):
+    themed = tmp_path / "themed.json"
+    qa = tmp_path / "qa.json"
+    themed.write_text("[]")
+    qa.write_text("[]")
+    manifest.publish(str(tmp_path), "themed", str(themed), 0)
+    manifest.publish(str(tmp_path), "qa", str(qa), 0)
+
+    assert manifest.resolve_latest(str(tmp_path), "qa", "themed") == str(qa)
+    qa.unlink()
+    assert manifest.resolve_latest(str(tmp_path), "qa", "themed") == str(themed)
+    assert manifest.resolve_latest(str(tmp_path), "raw") is None
+
+def test_stage_output_is_found_through_manifest(tmp_path):
+    # A decoy file that the directory scan would pick (same prefix) but the manifest does not name.
+    output = save_updated_data([{"title": "A", "date": None, "themes": []}], str(tmp_path))
+    (tmp_path / "presidential_actions_with_themes_99999999_999999.json").write_text("[]")
+
+    data, latest = load_latest_json(str(tmp_path), prefix="presidential_actions_with_themes_", stage="themed")
+    assert latest == output
+    assert data[0]["title"] == "A"
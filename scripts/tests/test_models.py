@@ -0,0 +1,21 @@
+# scripts/tests/test_models.py
+
+import hashlib
+from datetime import datetime
+
+from dashboard.models import PresidentialAction, compute_hash_key, compute_hash_keys, hash_key_from_hex
+
+def test_hash_key_matches_legacy_hex():
+    ts = datetime(2025, 2, 9, 17, 8, 57)
+    legacy_hex = hashlib.sha256(f"Gulf of America Day{ts}None".encode("utf-8")).hexdigest()
+    assert compute_hash_key("Gulf of America Day", ts) == hash_key_from_hex(legacy_hex)
+
+def test_batch_keys_match_model_keys():
+    rows = [
+        ("Action One", "2025-02-08T09:00:00", "http://example.com/one"),
+        ("Action Two", datetime(2025, 2, 9, 12, 0), None),
+    ]
+    keys = compute_hash_keys(rows)
+    assert keys == [PresidentialAction(*row).hash_key for row in rows]
+    assert all(-2**63 <= key < 2**63 for key in keys)
+    assert keys[0] != keys[1]
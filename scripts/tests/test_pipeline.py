@@ -0,0 +1,75 @@
+# scripts/tests/test_pipeline.py
+
+import json
+import pytest
+
+from dashboard import manifest
+from scripts import pipeline, add_themes, qa_data
+from scripts.pipeline_daemon import pipeline_lock, run_once
+
+@pytest.fixture
+def fake_stages(monkeypatch):
+    """Replace the real stages with recorders; 'qa' fails on its first call."""
+    calls = []
+    failures = {"qa": 1}
+
+    def make(name):
+        def stage(data_dir):
+            calls.append(name)
+            if failures.get(name):
+                failures[name] -= 1
+                raise RuntimeError(f"{name} crashed")
+            return f"{name} done"
+        return stage
+
+    monkeypatch.setattr(pipeline, "STAGE_FUNCTIONS", {name: make(name) for name in pipeline.STAGES})
+    return calls
+
+def test_checkpoint_resumes_after_crash(tmp_path, fake_stages):
+    checkpoint = tmp_path / "checkpoint.json"
+    with pytest.raises(RuntimeError):
+        pipeline.run_pipeline(str(tmp_path), checkpoint_path=str(checkpoint))
+    assert json.loads(checkpoint.read_text())["completed"] == ["scrape", "theme"]
+
+    statuses = []
+    pipeline.run_pipeline(str(tmp_path), checkpoint_path=str(checkpoint),
+                          on_stage=lambda name, status, *_: statuses.append((name, status)))
+    assert fake_stages == ["scrape", "theme", "qa", "qa", "load", "publish"]
+    assert ("scrape", "skipped") in statuses
+    saved = json.loads(checkpoint.read_text())
+    assert saved["completed"] == [] and saved["last_success"]
+
+def test_lock_prevents_overlapping_runs(tmp_path, fake_stages):
+    lock_path = str(tmp_path / "pipeline.lock")
+    with pipeline_lock(lock_path) as held:
+        assert held
+        with pipeline_lock(lock_path) as second:
+            assert not second
+        assert not run_once(str(tmp_path), lock_path=lock_path, checkpoint_path=str(tmp_path / "cp.json"))
+    assert fake_stages == []
+
+def test_scrape_stage_writes_to_its_data_dir(tmp_path, monkeypatch):
+    from dashboard import manifest
+    from scripts import scrape_presidential_actions as scraper
+    actions = [{"title": "Protecting American Energy", "date": "2025-02-09T17:08:57-05:00"}]
+    monkeypatch.setattr(scraper, "scrape_all_pages", lambda url, page_known=None: actions)
+    monkeypatch.chdir(tmp_path)  # Nothing may land in the default ./data.
+    data_dir = tmp_path / "elsewhere"
+    assert pipeline.stage_scrape(str(data_dir)) == "1 actions scraped"
+    assert json.loads(open(manifest.resolve_latest(str(data_dir), "raw")).read()) == actions
+    assert (data_dir / "store" / "raw" / "manifest.json").exists()
+    assert not (tmp_path / "data").exists()
+
+def test_qa_reads_the_published_themed_snapshot(tmp_path):
+    raw = tmp_path / "presidential_actions_20250301_000000.json"
+    raw.write_text(json.dumps([{"title": "Securing the Border", "date": "2025-03-01T10:00:00-05:00"}]))
+    manifest.publish(str(tmp_path), "raw", str(raw), 1)
+    for stamp in ("20250209_222540", "20250210_000000", "20250211_000000"):  # Older themed snapshots.
+        (tmp_path / f"presidential_actions_with_themes_{stamp}.json").write_text("[]")
+
+    themed_file, _ = add_themes.run(str(tmp_path))
+    assert not (tmp_path / "presidential_actions_with_themes_20250209_222540.json").exists()  # Pruned.
+    assert qa_data.latest_themed_file(str(tmp_path)) == themed_file
+    qa_file, count = qa_data.run(str(tmp_path))
+    assert count == 1
+    assert json.loads(open(qa_file).read())[0]["themes"] == ["National Security & Border Enforcement"]
@@ -0,0 +1,96 @@
+# scripts/tests/test_rollups.py
+
+import json
+from datetime import datetime
+import pytest
+
+from sqlalchemy import create_engine
+from sqlalchemy.orm import sessionmaker
+
+from scripts import etl
+from scripts.etl import process_json_file
+from dashboard.models import Base, PresidentialAction, DailyCount, HourlyCount, ThemeCount, DayThemeCount
+from dashboard.rollups import apply_rollups, rebuild_rollups
+from dashboard.cube import CountCube
+
+@pytest.fixture
+def session(tmp_path):
+    engine = create_engine(f"sqlite:///{tmp_path / 'rollups.db'}")
+    Base.metadata.create_all(engine)
+    Session = sessionmaker(bind=engine)
+    session = Session()
+    yield session
+    session.close()
+
+def snapshot(session):
+    """Return the contents of every rollup table as plain dicts."""
+    return {
+        "daily": {r.day: r.count for r in session.query(DailyCount)},
+        "hourly": {r.hour: r.count for r in session.query(HourlyCount)},
+        "theme": {r.theme: r.count for r in session.query(ThemeCount)},
+        "day_theme": {(r.day, r.theme): r.count for r in session.query(DayThemeCount)},
+    }
+
+def test_etl_updates_rollups_incrementally(session, tmp_path):
+    first = [
+        {"action_title": "A", "action_date": "2020-01-01"},
+        {"action_title": "B", "action_date": "2020-01-01"},
+    ]
+    second = [
+        {"action_title": "B", "action_date": "2020-01-01"},  # Duplicate, must not be counted twice.
+        {"action_title": "C", "action_date": "2020-01-02"},
+    ]
+    for name, data in (("first.json", first), ("second.json", second)):
+        path = tmp_path / name
+        path.write_text(json.dumps(data))
+        process_json_file(str(path), session)
+
+    rollups = snapshot(session)
+    assert rollups["daily"] == {"2020-01-01": 2, "2020-01-02": 1}
+    assert rollups["hourly"] == {0: 3}
+
+def test_rebuild_matches_incremental(session):
+    actions = [
+        PresidentialAction("One", datetime(2025, 2, 8, 9, 30), theme="Economy"),
+        PresidentialAction("Two", datetime(2025, 2, 8, 17, 5), theme="Security"),
+        PresidentialAction("Three", datetime(2025, 2, 9, 9, 0), theme="Economy"),
+        PresidentialAction("Four", datetime(2025, 2, 9, 23, 59)),
+    ]
+    session.add_all(actions)
+    apply_rollups(session, actions)
+    session.commit()
+    incremental = snapshot(session)
+
+    rebuild_rollups(session)
+    assert snapshot(session) == incremental
+    assert incremental["theme"] == {"Economy": 2, "Security": 1}
+    assert incremental["day_theme"][("2025-02-08", "Economy")] == 1
+    assert incremental["hourly"] == {9: 2, 17: 1, 23: 1}
+
+def test_db_cube_counts_every_theme_like_file_cube(session):
+    records = [
+        {"title": "One", "date": "2025-02-08T09:30:00", "themes": ["Economy", "Security"]},
+        {"title": "Two", "date": "2025-02-08T09:45:00", "themes": ["Security"]},
+        {"title": "Three", "date": "2025-02-09T10:00:00", "themes": []},
+    ]
+    etl.load_actions(records, session)
+    file_cube = CountCube.from_actions(records)
+    assert CountCube.from_session(session).cells("theme") == file_cube.cells("theme")
+    assert snapshot(session)["theme"] == {"Economy": 1, "Security": 2}
+
+    incremental = snapshot(session)
+    rebuild_rollups(session)
+    assert snapshot(session) == incremental
+    assert CountCube.from_session(session).cells("day", "hour", "theme") == file_cube.cells("day", "hour", "theme")
+
+def test_get_session_builds_missing_rollups(session, tmp_path, monkeypatch):
+    # Rows loaded without the rollups (e.g. a database that predates them).
+    session.add_all([PresidentialAction("One", datetime(2025, 2, 8, 9, 30), theme="Economy"),
+                     PresidentialAction("Two", datetime(2025, 2, 9, 17, 5))])
+    session.commit()
+    assert snapshot(session)["daily"] == {}
+    monkeypatch.setattr(etl, "DB_URI", f"sqlite:///{tmp_path / 'rollups.db'}")
+    etl.get_session().close()
+    session.expire_all()
+    assert snapshot(session)["daily"] == {"2025-02-08": 1, "2025-02-09": 1}
+    assert snapshot(session)["theme"] == {"Economy": 1}
@@ -0,0 +1,91 @@
+# scripts/tests/test_running_aggregates.py
+
+import json
+import sqlite3
+
+import dashboard.app as dashboard_app
+from dashboard.aggregation import aggregate
+from dashboard.cube import CountCube
+from dashboard.aggregate_store import read_store
+from dashboard.running_aggregates import RunningAggregates
+from scripts.segment_store import SegmentStore
+
+def action(i, theme="Economic"):
+    return {"title": f"Action {i}", "date": f"2025-02-{1 + i % 9:02d}T{i % 24:02d}:15:00-05:00", "themes": [theme]}
+
+def test_add_retract_and_versioned_snapshots(tmp_path):
+    state = RunningAggregates(str(tmp_path / "state.db"))
+    records = [action(i) for i in range(6)] + [{"title": "Undated", "themes": ["Celebratory"]}]
+    assert state.apply(records) == (7, 0)
+    assert state.apply(records[:3] + [action(6, "Celebratory")]) == (1, 0)  # Already counted ones are skipped.
+    assert state.apply(retracted=[records[0], action(99)]) == (0, 1)  # Unknown records are ignored.
+
+    snapshot = RunningAggregates(str(tmp_path / "state.db")).snapshot()  # Reopened from disk.
+    expected = aggregate(records[1:] + [action(6, "Celebratory")])
+    assert snapshot.version == 3 and snapshot.total == expected.total == 7
+    for name in ("days", "hours_of_day", "hours_of_week", "hourly", "themes"):
+        assert getattr(snapshot.counts, name) == getattr(expected, name), name
+    assert snapshot.counts.hourly_offset == -5 * 3600
+    assert snapshot.cube().cells("theme") == {"Economic": 5, "Celebratory": 1}
+
+def qa_store(tmp_path):
+    # Opened afresh for every append, like each QA run does, so publish cursors are kept.
+    return SegmentStore("qa", root=str(tmp_path / "store"))
+
+def publish(tmp_path):
+    """Write the QA snapshot file like qa_data.run() and publish it."""
+    (tmp_path / "presidential_actions_with_themes_20250101_000000.json").write_text(json.dumps(qa_store(tmp_path).read_all()))
+    source_file = dashboard_app.publish_aggregates(str(tmp_path))
+    _, entries = read_store(str(tmp_path / "aggregates.db"))
+    return source_file, entries
+
+def test_publish_applies_only_new_records(tmp_path, monkeypatch):
+    qa_store(tmp_path).append([action(i) for i in range(20)])
+    publish(tmp_path)
+
+    qa_store(tmp_path).append([action(i, "Celebratory") for i in range(20, 25)])
+    monkeypatch.setattr(RunningAggregates, "rebuild", None)  # A full recount would fail.
+    counted = []
+    original_apply = RunningAggregates.apply
+
+    def counting_apply(self, added=(), *args, **kwargs):
+        counted.append(len(added))
+        return original_apply(self, added, *args, **kwargs)
+
+    monkeypatch.setattr(RunningAggregates, "apply", counting_apply)
+    source_file, entries = publish(tmp_path)
+    assert counted == [5]
+    assert entries.pop("state:version") == b"2"
+    expected = dashboard_app.precompute_aggregates(source_file)
+    assert entries == {key: value.encode("utf-8") if isinstance(value, str) else value
+                       for key, value in expected.items()}
+
+def test_publish_recounts_when_records_disappear(tmp_path):
+    qa_store(tmp_path).append([action(i) for i in range(10)])
+    publish(tmp_path)
+    qa_store(tmp_path).append([action(i) for i in range(10, 12)])
+    store = qa_store(tmp_path)  # Every segment is lost (the qa stream is exempt from retention).
+    store.manifest.update(segments=[], head=None)
+    store._save_manifest()
+    qa_store(tmp_path).append([action(i) for i in range(12, 15)])
+    _, entries = publish(tmp_path)
+    assert [row["count"] for row in json.loads(entries["api:themes"])] == [3]
+
+def test_cube_cells_are_updated_in_place(tmp_path):
+    state = RunningAggregates(str(tmp_path / "state.db"))
+    state.apply([action(i) for i in range(3)])
+    state.apply([action(3, "Celebratory")], retracted=[action(0)])
+    snapshot = state.snapshot()
+    assert snapshot.cube_cells == {("2025-02-02", 1, "Economic"): 1, ("2025-02-03", 2, "Economic"): 1,
+                                   ("2025-02-04", 3, "Celebratory"): 1}
+    assert snapshot.cube().cells("theme") == {"Economic": 2, "Celebratory": 1}
+
+def test_cube_blob_of_older_state_is_migrated(tmp_path):
+    path = str(tmp_path / "state.db")
+    RunningAggregates(path)
+    records = [action(i) for i in range(4)]
+    with sqlite3.connect(path) as conn:
+        conn.execute("INSERT INTO blobs (name, value) VALUES ('cube', ?)", (CountCube.from_actions(records).to_bytes(),))
+    conn.close()
+    assert RunningAggregates(path).snapshot().cube().cells("day", "hour", "theme") == \
+        CountCube.from_actions(records).cells("day", "hour", "theme")
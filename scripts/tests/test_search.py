@@ -0,0 +1,52 @@
+# scripts/tests/test_search.py
+
+from datetime import datetime
+import pytest
+
+from sqlalchemy import create_engine
+from sqlalchemy.orm import sessionmaker
+
+from dashboard.models import Base, PresidentialAction
+from dashboard.search import ensure_search_index, build_match_query, search_actions
+
+@pytest.fixture
+def session(tmp_path):
+    engine = create_engine(f"sqlite:///{tmp_path / 'search.db'}")
+    Base.metadata.create_all(engine)
+    Session = sessionmaker(bind=engine)
+    session = Session()
+    # One row inserted before the index exists, to exercise the back-fill.
+    session.add(PresidentialAction("Securing Our Borders", datetime(2025, 1, 20, 18, 0)))
+    session.commit()
+    assert ensure_search_index(engine)
+    assert not ensure_search_index(engine)
+    yield session
+    session.close()
+
+def test_build_match_query_quotes_input():
+    assert build_match_query('border "OR" sec') == '"border" "OR" "sec"*'
+    assert build_match_query("  ") is None
+
+def test_search_ranks_and_highlights(session):
+    session.add_all([
+        PresidentialAction("Protecting the American People Against Invasion", datetime(2025, 1, 20, 19, 0)),
+        PresidentialAction("Border <Security> and Border Enforcement", datetime(2025, 1, 21, 9, 0)),
+    ])
+    session.commit()
+
+    response = search_actions("border", session=session)
+    titles = [r["title"] for r in response["results"]]
+    assert titles == ["Border <Security> and Border Enforcement", "Securing Our Borders"]
+    assert "<mark>Border</mark> &lt;Security&gt;" in response["results"][0]["snippet"]
+    assert not response["has_next"]
+
+def test_search_paginates(session):
+    session.add_all([
+        PresidentialAction(f"Trade Policy Update {i}", datetime(2025, 2, 1, i, 0)) for i in range(5)
+    ])
+    session.commit()
+
+    first = search_actions("trade", page=1, per_page=2, session=session)
+    last = search_actions("trade", page=3, per_page=2, session=session)
+    assert len(first["results"]) == 2 and first["has_next"]
+    assert len(last["results"]) == 1 and not last["has_next"]
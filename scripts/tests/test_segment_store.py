@@ -0,0 +1,107 @@
+# scripts/tests/test_segment_store.py
+
+from datetime import datetime, timedelta
+
+from dashboard import manifest
+from scripts.segment_store import SegmentStore, prune_snapshots, record_hash
+
+def records(*titles):
+    return [{"title": t, "date": "2025-02-09T17:08:57-05:00"} for t in titles]
+
+def test_append_dedups_by_content(tmp_path):
+    store = SegmentStore("raw", root=str(tmp_path))
+    assert store.append(records("A", "B")) == 2
+    # Same content with a different key order is still a duplicate.
+    assert store.append([{"date": "2025-02-09T17:08:57-05:00", "title": "A"}]) == 0
+    assert store.append(records("B", "C")) == 1
+
+    reopened = SegmentStore("raw", root=str(tmp_path))
+    assert [r["title"] for r in reopened.read_all()] == ["A", "B", "C"]
+    assert reopened.head == "seg-000002.jsonl.gz"
+    assert reopened.append(records("C")) == 0
+
+def test_consumer_reads_only_new_records(tmp_path):
+    store = SegmentStore("raw", root=str(tmp_path))
+    store.append(records("A", "B"))
+    new, end = store.read_new("add_themes")
+    assert len(new) == 2
+    store.commit("add_themes", end)
+
+    store.append(records("C"))
+    new, end = store.read_new("add_themes")
+    assert [r["title"] for r in new] == ["C"]
+
+def test_compaction_keeps_offsets_and_cursors(tmp_path):
+    store = SegmentStore("raw", root=str(tmp_path))
+    for title in "ABCDE":
+        store.append(records(title))
+    store.commit("qa", 3)
+
+    assert store.compact(target_records=10) == 5
+    assert len(store.manifest["segments"]) == 1
+    assert len(list((tmp_path / "raw").glob("seg-*.jsonl.gz"))) == 1
+    new, _ = store.read_new("qa")
+    assert [r["title"] for r in new] == ["D", "E"]
+
+def test_retention_drops_old_segments_but_keeps_keys(tmp_path):
+    store = SegmentStore("raw", root=str(tmp_path))
+    store.append(records("old"))
+    store.manifest["segments"][0]["created"] = (datetime.now() - timedelta(days=40)).isoformat()
+    store._save_manifest()
+    store.append(records("new"))
+
+    assert store.apply_retention(max_age_days=30) == 1
+    assert [r["title"] for r in store.read_all()] == ["new"]
+    assert store.append(records("old")) == 0
+
+def test_qa_stream_is_exempt_from_retention(tmp_path):
+    store = SegmentStore("qa", root=str(tmp_path))
+    store.append(records("old"))
+    assert store.apply_retention(max_age_days=0, now=datetime.now() + timedelta(days=1)) == 0
+    assert [r["title"] for r in store.read_all()] == ["old"]
+
+def test_writers_reload_the_manifest(tmp_path):
+    first = SegmentStore("raw", root=str(tmp_path))
+    first.append(records("A"))
+    second = SegmentStore("raw", root=str(tmp_path))
+    second.append(records("B"))
+    # first's manifest predates B: compaction and cursor commits must not drop it.
+    first.append(records("C"))
+    first.compact(target_records=10)
+    first.commit("qa", 1)
+    reopened = SegmentStore("raw", root=str(tmp_path))
+    assert [r["title"] for r in reopened.read_all()] == ["A", "B", "C"]
+    assert reopened.append(records("B")) == 0
+
+def test_keys_are_repaired_after_a_crash(tmp_path):
+    store = SegmentStore("raw", root=str(tmp_path))
+    store.append(records("A", "B"))
+    keys_path = tmp_path / "raw" / "keys.txt"
+    # Crash after the manifest, before keys.txt: B's hash is missing.
+    keys_path.write_text(keys_path.read_text().splitlines()[0] + "\n")
+    assert SegmentStore("raw", root=str(tmp_path)).append(records("B")) == 0
+    # Crash after keys.txt, before the manifest (older versions): C was never stored.
+    keys_path.write_text(keys_path.read_text() + record_hash(records("C")[0]) + "\n")
+    reopened = SegmentStore("raw", root=str(tmp_path))
+    assert reopened.append(records("C")) == 1
+    assert [r["title"] for r in reopened.read_all()] == ["A", "B", "C"]
+    assert len(keys_path.read_text().splitlines()) == 3
+
+def test_prune_snapshots_keeps_newest(tmp_path):
+    for stamp in ("20250101_000000", "20250102_000000", "20250103_000000"):
+        (tmp_path / f"presidential_actions_with_themes_{stamp}.json").write_text("[]")
+    (tmp_path / "presidential_actions_with_themes_qa_fixed_20250101_000000.json").write_text("[]")
+
+    removed = prune_snapshots(str(tmp_path), "presidential_actions_with_themes_", keep=2)
+    assert [p.split("_")[-2] for p in removed] == ["20250101"]
+    assert len(list(tmp_path.iterdir())) == 3
+
+def test_prune_snapshots_keeps_published_files(tmp_path):
+    for stamp in ("20250101_000000", "20250102_000000", "20250103_000000"):
+        (tmp_path / f"presidential_actions_with_themes_{stamp}.json").write_text("[]")
+    oldest = tmp_path / "presidential_actions_with_themes_20250101_000000.json"
+    manifest.publish(str(tmp_path), "themed", str(oldest), 0)  # E.g. restored from the stage cache.
+
+    assert prune_snapshots(str(tmp_path), "presidential_actions_with_themes_", keep=1) == [
+        str(tmp_path / "presidential_actions_with_themes_20250102_000000.json")]
+    assert oldest.exists()
@@ -0,0 +1,94 @@
+# scripts/tests/test_stage_cache.py
+
+import json
+
+import pytest
+
+from dashboard import manifest
+from scripts import etl, stage_cache
+from scripts.pipeline_daemon import pipeline_lock
+from scripts.segment_store import SegmentStore
+from scripts.stage_cache import run_dag
+
+@pytest.fixture
+def fake_stages(tmp_path, monkeypatch):
+    """Stages that publish a snapshot whose content is set per stage in `content`."""
+    monkeypatch.setattr(etl, "DB_URI", f"sqlite:///{tmp_path / 'actions.db'}")
+    qa_code = tmp_path / "qa_code.py"
+    qa_code.write_text("v1")
+    monkeypatch.setitem(stage_cache.CODE_FILES, "qa", [str(qa_code)])
+    calls, content = [], {"scrape": "raw", "theme": "themed", "qa": "qa-v1"}
+
+    def make(stage):
+        def run(data_dir):
+            calls.append(stage)
+            if stage in stage_cache.SNAPSHOT_STAGES:
+                path = tmp_path / f"{stage}_{len(calls)}.json"
+                path.write_text(json.dumps([content[stage]]))
+                manifest.publish(str(tmp_path), stage_cache.SNAPSHOT_STAGES[stage], str(path), 1)
+            return f"{stage} done"
+        return run
+
+    functions = {stage: make(stage) for stage in stage_cache.DAG_STAGES}
+    return calls, content, qa_code, lambda **kw: run_dag(str(tmp_path), stage_functions=functions, **kw)
+
+def actions(plan):
+    return [action for _, action, _ in plan]
+
+def test_unchanged_stages_are_skipped(fake_stages):
+    calls, content, qa_code, run = fake_stages
+    assert actions(run()) == ["run", "run", "run", "run"]
+    assert actions(run()) == ["skip", "skip", "skip", "skip"]
+    assert calls == ["scrape", "theme", "qa", "load"]
+    # A forced scrape with the same result leaves everything downstream cached.
+    assert actions(run(force=["scrape"])) == ["run", "skip", "skip", "skip"]
+
+def test_code_change_reruns_dependents_only_and_revert_restores(fake_stages, tmp_path):
+    calls, content, qa_code, run = fake_stages
+    run()
+    qa_code.write_text("v2")
+    assert actions(run(dry_run=True)) == ["skip", "skip", "run", "run?"]
+    assert len(calls) == 4  # The dry run executed nothing.
+
+    content["qa"] = "qa-v2"
+    assert actions(run()) == ["skip", "skip", "run", "run"]
+    assert calls[-2:] == ["qa", "load"]
+
+    # Back to the old code: the old QA snapshot is restored, not recomputed.
+    qa_code.write_text("v1")
+    plan = run()
+    assert actions(plan)[:3] == ["skip", "skip", "restore"]
+    assert calls.count("qa") == 2
+    restored = manifest.resolve_latest(str(tmp_path), "qa")
+    assert json.loads(open(restored).read()) == ["qa-v1"]
+
+def test_stream_mode_stages_rerun_instead_of_restoring(fake_stages, tmp_path):
+    calls, content, qa_code, run = fake_stages
+    run()
+    qa_code.write_text("v2")
+    content["qa"] = "qa-v2"
+    run()
+    SegmentStore("qa", root=str(tmp_path / "store")).append([{"title": "A", "date": "2025-02-09"}])
+    qa_code.write_text("v1")
+    assert actions(run())[:3] == ["skip", "skip", "run"]  # The qa stream cannot be restored from a snapshot.
+    assert calls.count("qa") == 3
+
+def test_run_skips_while_the_pipeline_lock_is_held(fake_stages, tmp_path):
+    calls, content, qa_code, run = fake_stages
+    with pipeline_lock(str(tmp_path / "pipeline.lock")) as held:
+        assert held
+        assert run() == []
+        assert actions(run(dry_run=True)) == ["run", "run?", "run?", "run?"]
+    assert calls == []
+
+def test_dry_run_leaves_database_and_data_dir_untouched(fake_stages, tmp_path):
+    calls, content, qa_code, run = fake_stages
+    assert actions(run(dry_run=True)) == ["run", "run?", "run?", "run?"]
+    assert list(tmp_path.iterdir()) == [qa_code]  # No database, cache or store directories.
+
+    run()
+    files = sorted(tmp_path.rglob("*"))
+    db_bytes = (tmp_path / "actions.db").read_bytes()
+    assert actions(run(stages=("load",), dry_run=True)) == ["skip"]
+    assert sorted(tmp_path.rglob("*")) == files
+    assert (tmp_path / "actions.db").read_bytes() == db_bytes
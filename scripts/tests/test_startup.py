@@ -0,0 +1,15 @@
+# scripts/tests/test_startup.py
+
+import subprocess
+import sys
+
+import pytest
+
+HEAVY = ("plotly", "pandas", "sqlalchemy", "jsonschema", "bs4")
+
+@pytest.mark.parametrize("module", ["dashboard.app", "scripts.pipeline", "scripts.aggregate_hourly",
+                                    "scripts.polar_hourly_chart", "scripts.scrape_presidential_actions"])
+def test_import_does_not_load_heavy_modules(module):
+    code = f"import sys, {module}; print(','.join(m for m in {HEAVY!r} if m in sys.modules))"
+    result = subprocess.run([sys.executable, "-c", code], capture_output=True, text=True, check=True)
+    assert result.stdout.strip() == ""